@@ -5,8 +5,13 @@ Analyze extracted images and show product associations
 
 import os
 import re
+import sys
 from pathlib import Path
 
+# Add extractors to path
+sys.path.append('extractors')
+from image_store import LocalImageStore, MANIFEST_NAME
+
 
 def analyze_extracted_images():
     """Analyze the extracted images and show what we know about them"""
@@ -20,6 +25,11 @@ def analyze_extracted_images():
         print("❌ No extracted_images directory found")
         return
 
+    # The image store manifest keeps the metadata found during extraction
+    if (images_dir / MANIFEST_NAME).exists():
+        analyze_image_store(LocalImageStore(str(images_dir)))
+        return
+
     # Get all image files
     image_files = list(images_dir.glob("*.png"))
     if not image_files:
@@ -82,6 +92,38 @@ def analyze_extracted_images():
     print("   3. The web interface will show product associations")
 
 
+def analyze_image_store(store: LocalImageStore):
+    """Show what the store manifest records about the extracted images"""
+    stats = store.stats()
+    print(f"📁 Found {stats['images']} images in the image store "
+          f"({stats['total_bytes'] / (1024 * 1024):.1f} MB)")
+    print()
+
+    page_numbers = set()
+    product_codes = {}
+    component_types = {}
+    for entry in store.entries():
+        for placement in entry.get('placements') or [entry]:
+            if placement.get('page_number') is not None:
+                page_numbers.add(placement['page_number'])
+            if placement.get('product_code'):
+                product_codes[placement['product_code']] = product_codes.get(placement['product_code'], 0) + 1
+            if placement.get('component_type'):
+                component_types[placement['component_type']] = component_types.get(placement['component_type'], 0) + 1
+
+    print(f"📊 Images span {len(page_numbers)} pages ({stats['placements']} placements)")
+    print()
+
+    print(f"   ✅ {len(product_codes)} Product Codes Found:")
+    for i, (code, count) in enumerate(sorted(product_codes.items(), key=lambda item: -item[1]), 1):
+        print(f"      {i:2d}. {code} ({count} placements)")
+
+    print()
+    print(f"   ✅ {len(component_types)} Component Types Found:")
+    for i, (component, count) in enumerate(sorted(component_types.items(), key=lambda item: -item[1]), 1):
+        print(f"      {i:2d}. {component} ({count} placements)")
+
+
 def show_extraction_summary():
     """Show summary of what was extracted"""
 
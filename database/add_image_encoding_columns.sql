@@ -0,0 +1,40 @@
+-- Image Encoding Columns
+-- Run this in your Supabase SQL Editor to record how kept images were encoded
+
+-- Add size columns (image_format already records png/webp/jpeg)
+ALTER TABLE product_images
+ADD COLUMN IF NOT EXISTS original_size_bytes INTEGER,
+ADD COLUMN IF NOT EXISTS encoded_size_bytes INTEGER;
+
+-- Backfill the encoded size of rows uploaded before these columns existed
+-- (image_data is base64: 4 characters per 3 bytes, minus padding)
+UPDATE product_images
+SET encoded_size_bytes = (LENGTH(image_data) * 3) / 4 - (LENGTH(image_data) - LENGTH(RTRIM(image_data, '=')))
+WHERE encoded_size_bytes IS NULL AND image_data IS NOT NULL;
+
+-- Create a function to report storage savings per format
+CREATE OR REPLACE FUNCTION get_image_encoding_stats()
+RETURNS TABLE (
+    image_format VARCHAR,
+    images BIGINT,
+    original_mb NUMERIC,
+    encoded_mb NUMERIC,
+    compression_ratio NUMERIC
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        pi.image_format,
+        COUNT(*) as images,
+        ROUND(SUM(pi.original_size_bytes) / 1048576.0, 2) as original_mb,
+        ROUND(SUM(pi.encoded_size_bytes) / 1048576.0, 2) as encoded_mb,
+        ROUND(SUM(pi.original_size_bytes)::NUMERIC / NULLIF(SUM(pi.encoded_size_bytes), 0), 2) as compression_ratio
+    FROM product_images pi
+    GROUP BY pi.image_format
+    ORDER BY images DESC;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add comments for documentation
+COMMENT ON COLUMN product_images.original_size_bytes IS 'Bytes of the decoded pixmap before encoding';
+COMMENT ON COLUMN product_images.encoded_size_bytes IS 'Bytes of the stored image in image_format';
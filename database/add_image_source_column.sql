@@ -0,0 +1,17 @@
+-- Image Source Column
+-- Run this in your Supabase SQL Editor to tell embedded images from rendered vector drawings
+
+-- Add source column (existing rows were all embedded raster images)
+ALTER TABLE product_images
+ADD COLUMN IF NOT EXISTS image_source VARCHAR(10) DEFAULT 'raster';
+
+UPDATE product_images
+SET image_source = 'raster'
+WHERE image_source IS NULL;
+
+-- Create indexes for better performance
+CREATE INDEX IF NOT EXISTS idx_product_images_image_source
+ON product_images(image_source);
+
+-- Add comments for documentation
+COMMENT ON COLUMN product_images.image_source IS 'raster (embedded image) or vector (drawing region rendered from page paths)';
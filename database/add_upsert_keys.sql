@@ -0,0 +1,72 @@
+-- Upsert Keys
+-- Run this in your Supabase SQL Editor after create_table_simple.sql and the image table scripts
+-- Uploads POST with on_conflict=<natural key> and Prefer: resolution=merge-duplicates, so
+-- re-running an extraction updates existing rows instead of failing on duplicates.
+-- The image tables already have their keys: product_images(image_hash),
+-- product_image_placements(image_hash, page_number, x_coord, y_coord) and
+-- product_image_thumbnails(image_hash, size) are UNIQUE.
+
+-- Components are keyed by system and part number, or name when there is no part number;
+-- on_conflict only takes plain columns, so the key is a generated column
+ALTER TABLE component_specifications
+ADD COLUMN IF NOT EXISTS component_key TEXT
+GENERATED ALWAYS AS (COALESCE(NULLIF(part_number, ''), name)) STORED;
+
+-- Remove duplicates left by earlier inserts, keeping the newest row of each component
+DELETE FROM component_specifications a
+USING component_specifications b
+WHERE a.system_code = b.system_code
+  AND a.component_key = b.component_key
+  AND a.id < b.id;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'component_specifications_natural_key') THEN
+        ALTER TABLE component_specifications
+        ADD CONSTRAINT component_specifications_natural_key UNIQUE (system_code, component_key);
+    END IF;
+END;
+$$;
+
+-- Skip updates that change nothing, so re-uploading unchanged rows writes no new row
+-- versions (and leaves updated_at alone). Named to run before the updated_at triggers.
+-- Trigger arguments name generated columns to leave out: a BEFORE trigger sees them
+-- before they are computed, so NEW would never equal OLD. They only repeat other columns.
+CREATE OR REPLACE FUNCTION skip_unchanged_update()
+RETURNS TRIGGER AS $$
+DECLARE
+    ignored TEXT[] := ARRAY['updated_at'] || COALESCE(TG_ARGV, '{}'::TEXT[]);
+BEGIN
+    IF (to_jsonb(NEW) - ignored) IS NOT DISTINCT FROM (to_jsonb(OLD) - ignored) THEN
+        RETURN NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS skip_unchanged_product_images ON product_images;
+CREATE TRIGGER skip_unchanged_product_images
+    BEFORE UPDATE ON product_images
+    FOR EACH ROW
+    EXECUTE FUNCTION skip_unchanged_update();
+
+DROP TRIGGER IF EXISTS skip_unchanged_product_image_placements ON product_image_placements;
+CREATE TRIGGER skip_unchanged_product_image_placements
+    BEFORE UPDATE ON product_image_placements
+    FOR EACH ROW
+    EXECUTE FUNCTION skip_unchanged_update();
+
+DROP TRIGGER IF EXISTS skip_unchanged_product_image_thumbnails ON product_image_thumbnails;
+CREATE TRIGGER skip_unchanged_product_image_thumbnails
+    BEFORE UPDATE ON product_image_thumbnails
+    FOR EACH ROW
+    EXECUTE FUNCTION skip_unchanged_update();
+
+DROP TRIGGER IF EXISTS skip_unchanged_component_specifications ON component_specifications;
+CREATE TRIGGER skip_unchanged_component_specifications
+    BEFORE UPDATE ON component_specifications
+    FOR EACH ROW
+    EXECUTE FUNCTION skip_unchanged_update('component_key');
+
+COMMENT ON COLUMN component_specifications.component_key IS 'Upsert key within a system: part_number, or name without one';
+COMMENT ON FUNCTION skip_unchanged_update() IS 'Drops row updates that would only touch updated_at (and the generated columns given as trigger arguments)';
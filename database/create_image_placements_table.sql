@@ -0,0 +1,72 @@
+-- FlexLink Image Placements Schema
+-- Run this in your Supabase SQL editor after create_images_table.sql
+-- Each image is stored once in product_images; every page/bbox it is drawn at is a placement
+
+-- Create product_image_placements table (one image -> many placements)
+CREATE TABLE IF NOT EXISTS product_image_placements (
+    id SERIAL PRIMARY KEY,
+    image_hash VARCHAR(64) NOT NULL REFERENCES product_images(image_hash) ON DELETE CASCADE,
+    page_number INTEGER NOT NULL,
+    x_coord DECIMAL(10,2),
+    y_coord DECIMAL(10,2),
+    width DECIMAL(10,2),
+    height DECIMAL(10,2),
+    associated_text TEXT,
+    product_code VARCHAR(50),
+    component_type VARCHAR(50),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (image_hash, page_number, x_coord, y_coord)
+);
+
+-- Create indexes for better performance
+CREATE INDEX IF NOT EXISTS idx_product_image_placements_hash
+ON product_image_placements(image_hash);
+
+CREATE INDEX IF NOT EXISTS idx_product_image_placements_page_number
+ON product_image_placements(page_number);
+
+CREATE INDEX IF NOT EXISTS idx_product_image_placements_product_code
+ON product_image_placements(product_code);
+
+-- Backfill: images uploaded before placements existed are drawn at their own page/bbox
+INSERT INTO product_image_placements (
+    image_hash, page_number, x_coord, y_coord, width, height,
+    associated_text, product_code, component_type
+)
+SELECT
+    image_hash, page_number, x_coord, y_coord, width, height,
+    associated_text, product_code, component_type
+FROM product_images
+ON CONFLICT (image_hash, page_number, x_coord, y_coord) DO NOTHING;
+
+-- Create a function to list every page an image appears on
+CREATE OR REPLACE FUNCTION get_image_placements(p_image_hash VARCHAR)
+RETURNS TABLE (
+    page_number INTEGER,
+    x_coord DECIMAL,
+    y_coord DECIMAL,
+    width DECIMAL,
+    height DECIMAL,
+    product_code VARCHAR,
+    component_type VARCHAR
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        pl.page_number,
+        pl.x_coord,
+        pl.y_coord,
+        pl.width,
+        pl.height,
+        pl.product_code,
+        pl.component_type
+    FROM product_image_placements pl
+    WHERE pl.image_hash = p_image_hash
+    ORDER BY pl.page_number, pl.y_coord, pl.x_coord;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add comments for documentation
+COMMENT ON TABLE product_image_placements IS 'Every page and bounding box a product image is drawn at';
+COMMENT ON COLUMN product_image_placements.image_hash IS 'Image drawn at this placement (product_images.image_hash)';
+COMMENT ON COLUMN product_image_placements.associated_text IS 'Text around the image at this placement';
@@ -0,0 +1,54 @@
+-- FlexLink Image Thumbnails Schema
+-- Run this in your Supabase SQL editor after create_images_table.sql
+-- Listing views fetch a small thumbnail instead of the full image; thumbnail files live in the
+-- product-images Storage bucket (see move_image_data_to_storage.sql), rows only keep their key
+
+-- Create product_image_thumbnails table (one row per image and size)
+CREATE TABLE IF NOT EXISTS product_image_thumbnails (
+    id SERIAL PRIMARY KEY,
+    image_hash VARCHAR(64) NOT NULL REFERENCES product_images(image_hash) ON DELETE CASCADE,
+    size INTEGER NOT NULL, -- Longest side the thumbnail was fitted into (128, 256, 512)
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    image_format VARCHAR(10) DEFAULT 'webp',
+    storage_key TEXT, -- Object key of the thumbnail file (thumbs/<image_hash>/<size>.<format>)
+    image_data TEXT, -- Base64 encoded thumbnail of rows not moved to storage yet
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (image_hash, size)
+);
+
+-- Create indexes for better performance
+CREATE INDEX IF NOT EXISTS idx_product_image_thumbnails_hash_size
+ON product_image_thumbnails(image_hash, size);
+
+-- Create a function to get the thumbnails of a page of images in one call
+CREATE OR REPLACE FUNCTION get_image_thumbnails(p_image_hashes VARCHAR[], p_size INTEGER DEFAULT 256)
+RETURNS TABLE (
+    image_hash VARCHAR,
+    size INTEGER,
+    width INTEGER,
+    height INTEGER,
+    image_format VARCHAR,
+    storage_key TEXT
+) AS $$
+BEGIN
+    -- Smallest thumbnail at least p_size, else the largest there is
+    RETURN QUERY
+    SELECT DISTINCT ON (t.image_hash)
+        t.image_hash,
+        t.size,
+        t.width,
+        t.height,
+        t.image_format,
+        t.storage_key
+    FROM product_image_thumbnails t
+    WHERE t.image_hash = ANY(p_image_hashes) AND t.storage_key IS NOT NULL
+    ORDER BY t.image_hash, (t.size < p_size), CASE WHEN t.size >= p_size THEN t.size ELSE -t.size END;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add comments for documentation
+COMMENT ON TABLE product_image_thumbnails IS 'Thumbnail pyramid of product images for listing views';
+COMMENT ON COLUMN product_image_thumbnails.size IS 'Longest side in pixels the thumbnail was fitted into';
+COMMENT ON COLUMN product_image_thumbnails.storage_key IS 'Object key of the thumbnail file in the product-images bucket (lossy WebP by default)';
+COMMENT ON COLUMN product_image_thumbnails.image_data IS 'Base64 encoded thumbnail of rows not moved to storage yet (NULL afterwards)';
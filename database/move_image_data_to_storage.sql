@@ -0,0 +1,193 @@
+-- Image Object Storage
+-- Run this in your Supabase SQL Editor, then move_image_data_to_storage.py to backfill existing rows
+-- Image and thumbnail files live in the product-images Storage bucket; rows only keep the object key
+
+-- Create the bucket (public, so viewers load files from /storage/v1/object/public/product-images/<key>)
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('product-images', 'product-images', true)
+ON CONFLICT (id) DO NOTHING;
+
+-- Let the API key upload, read and delete objects of the bucket
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_policies WHERE schemaname = 'storage' AND policyname = 'product_images_insert') THEN
+        CREATE POLICY product_images_insert ON storage.objects
+        FOR INSERT TO anon, authenticated WITH CHECK (bucket_id = 'product-images');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_policies WHERE schemaname = 'storage' AND policyname = 'product_images_select') THEN
+        CREATE POLICY product_images_select ON storage.objects
+        FOR SELECT TO anon, authenticated USING (bucket_id = 'product-images');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_policies WHERE schemaname = 'storage' AND policyname = 'product_images_delete') THEN
+        CREATE POLICY product_images_delete ON storage.objects
+        FOR DELETE TO anon, authenticated USING (bucket_id = 'product-images');
+    END IF;
+END;
+$$;
+
+-- Add object columns (encoded_size_bytes from add_image_encoding_columns.sql is the file size)
+ALTER TABLE product_images
+ADD COLUMN IF NOT EXISTS storage_key TEXT,
+ADD COLUMN IF NOT EXISTS pixel_width INTEGER,
+ADD COLUMN IF NOT EXISTS pixel_height INTEGER,
+ADD COLUMN IF NOT EXISTS content_sha256 CHAR(64);
+
+-- New rows carry no image_data; existing rows keep it until the backfill moves it
+ALTER TABLE product_images
+ALTER COLUMN image_data DROP NOT NULL;
+
+ALTER TABLE product_images
+ADD COLUMN IF NOT EXISTS encoded_size_bytes INTEGER;
+
+UPDATE product_images
+SET encoded_size_bytes = (LENGTH(image_data) * 3) / 4 - (LENGTH(image_data) - LENGTH(RTRIM(image_data, '=')))
+WHERE encoded_size_bytes IS NULL AND image_data IS NOT NULL;
+
+-- Thumbnails too (thumbs/<image_hash>/<size>.<format>), if create_image_thumbnails_table.sql was run
+ALTER TABLE IF EXISTS product_image_thumbnails
+ADD COLUMN IF NOT EXISTS storage_key TEXT;
+
+ALTER TABLE IF EXISTS product_image_thumbnails
+ALTER COLUMN image_data DROP NOT NULL;
+
+-- Create indexes for better performance (the backfill looks for rows without a key)
+CREATE INDEX IF NOT EXISTS idx_product_images_unmoved
+ON product_images(id) WHERE storage_key IS NULL;
+
+DO $$
+BEGIN
+    IF to_regclass('product_image_thumbnails') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_product_image_thumbnails_unmoved
+        ON product_image_thumbnails(id) WHERE storage_key IS NULL;
+    END IF;
+END;
+$$;
+
+-- Sizes come from encoded_size_bytes instead of the base64 text
+CREATE OR REPLACE VIEW product_images_view AS
+SELECT 
+    id,
+    image_hash,
+    page_number,
+    x_coord,
+    y_coord,
+    width,
+    height,
+    image_format,
+    associated_text,
+    product_code,
+    component_type,
+    is_blueprint,
+    image_quality_score,
+    extraction_date,
+    created_at,
+    updated_at,
+    encoded_size_bytes / 1024 as image_size_kb,
+    storage_key,
+    pixel_width,
+    pixel_height
+FROM product_images;
+
+CREATE OR REPLACE FUNCTION get_image_stats()
+RETURNS TABLE (
+    total_images BIGINT,
+    blueprint_images BIGINT,
+    products_with_images BIGINT,
+    component_types_with_images BIGINT,
+    avg_image_size_kb DECIMAL,
+    avg_quality_score DECIMAL
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        COUNT(*) as total_images,
+        COUNT(*) FILTER (WHERE is_blueprint = true) as blueprint_images,
+        COUNT(DISTINCT product_code) FILTER (WHERE product_code IS NOT NULL) as products_with_images,
+        COUNT(DISTINCT component_type) FILTER (WHERE component_type IS NOT NULL) as component_types_with_images,
+        AVG(encoded_size_bytes / 1024.0) as avg_image_size_kb,
+        AVG(image_quality_score) as avg_quality_score
+    FROM product_images;
+END;
+$$ LANGUAGE plpgsql;
+
+-- get_product_images returns the storage_key instead of the image data
+DROP FUNCTION IF EXISTS get_product_images(VARCHAR);
+
+CREATE OR REPLACE FUNCTION get_product_images(p_product_code VARCHAR)
+RETURNS TABLE (
+    id INTEGER,
+    image_hash VARCHAR,
+    page_number INTEGER,
+    component_type VARCHAR,
+    is_blueprint BOOLEAN,
+    image_quality_score DECIMAL,
+    associated_text TEXT,
+    image_format VARCHAR,
+    width DECIMAL,
+    height DECIMAL,
+    storage_key TEXT
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        pi.id,
+        pi.image_hash,
+        pi.page_number,
+        pi.component_type,
+        pi.is_blueprint,
+        pi.image_quality_score,
+        pi.associated_text,
+        pi.image_format,
+        pi.width,
+        pi.height,
+        pi.storage_key
+    FROM product_images pi
+    WHERE pi.product_code = p_product_code
+    ORDER BY pi.page_number, pi.is_blueprint DESC, pi.image_quality_score DESC;
+END;
+$$ LANGUAGE plpgsql;
+
+-- get_image_thumbnails returns the storage_key instead of the thumbnail data
+-- (thumbnails not moved yet are left out, so viewers load the full image)
+DROP FUNCTION IF EXISTS get_image_thumbnails(VARCHAR[], INTEGER);
+
+CREATE OR REPLACE FUNCTION get_image_thumbnails(p_image_hashes VARCHAR[], p_size INTEGER DEFAULT 256)
+RETURNS TABLE (
+    image_hash VARCHAR,
+    size INTEGER,
+    width INTEGER,
+    height INTEGER,
+    image_format VARCHAR,
+    storage_key TEXT
+) AS $$
+BEGIN
+    -- Smallest thumbnail at least p_size, else the largest there is
+    RETURN QUERY
+    SELECT DISTINCT ON (t.image_hash)
+        t.image_hash,
+        t.size,
+        t.width,
+        t.height,
+        t.image_format,
+        t.storage_key
+    FROM product_image_thumbnails t
+    WHERE t.image_hash = ANY(p_image_hashes) AND t.storage_key IS NOT NULL
+    ORDER BY t.image_hash, (t.size < p_size), CASE WHEN t.size >= p_size THEN t.size ELSE -t.size END;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add comments for documentation
+COMMENT ON COLUMN product_images.image_data IS 'Base64 encoded image data of rows not moved to storage yet (NULL afterwards)';
+COMMENT ON COLUMN product_images.storage_key IS 'Object key of the image file in the product-images bucket';
+COMMENT ON COLUMN product_images.pixel_width IS 'Width of the stored image in pixels';
+COMMENT ON COLUMN product_images.pixel_height IS 'Height of the stored image in pixels';
+COMMENT ON COLUMN product_images.content_sha256 IS 'SHA-256 of the stored image file';
+
+DO $$
+BEGIN
+    IF to_regclass('product_image_thumbnails') IS NOT NULL THEN
+        COMMENT ON COLUMN product_image_thumbnails.storage_key IS 'Object key of the thumbnail file in the product-images bucket';
+        COMMENT ON COLUMN product_image_thumbnails.image_data IS 'Base64 encoded thumbnail of rows not moved to storage yet (NULL afterwards)';
+    END IF;
+END;
+$$;
@@ -0,0 +1,24 @@
+-- Image Hash Re-keying
+-- Run this in your Supabase SQL Editor, then extractors/rekey_image_hashes.py for each catalog.
+-- image_hash used to be the MD5 of the uploaded file; it is now the MD5 of the source image
+-- (its raw PDF stream, or the rendered pixels of a vector drawing), so it no longer changes
+-- with the storage encoding. The script renames existing rows to their new hash; placements
+-- and thumbnails follow through ON UPDATE CASCADE. Stored files keep their storage_key.
+
+ALTER TABLE product_image_placements
+DROP CONSTRAINT IF EXISTS product_image_placements_image_hash_fkey;
+
+ALTER TABLE product_image_placements
+ADD CONSTRAINT product_image_placements_image_hash_fkey
+FOREIGN KEY (image_hash) REFERENCES product_images(image_hash)
+ON DELETE CASCADE ON UPDATE CASCADE;
+
+ALTER TABLE product_image_thumbnails
+DROP CONSTRAINT IF EXISTS product_image_thumbnails_image_hash_fkey;
+
+ALTER TABLE product_image_thumbnails
+ADD CONSTRAINT product_image_thumbnails_image_hash_fkey
+FOREIGN KEY (image_hash) REFERENCES product_images(image_hash)
+ON DELETE CASCADE ON UPDATE CASCADE;
+
+COMMENT ON COLUMN product_images.image_hash IS 'MD5 of the source image (raw PDF stream, or rendered pixels of a vector drawing)';
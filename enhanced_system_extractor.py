@@ -6,15 +6,20 @@ Focuses on main FlexLink systems and extracts detailed information
 
 import os
 import re
+import sys
 import json
 import csv
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
-import fitz  # PyMuPDF
-import pdfplumber
 from datetime import datetime
 
+# Add extractors to path
+sys.path.append('extractors')
+
+# Shared page text (one parse per catalog per process)
+from page_text_provider import get_page_texts
+
 
 @dataclass
 class FlexLinkSystem:
@@ -107,29 +112,7 @@ class EnhancedSystemExtractor:
 
     def _extract_text_from_pdf(self, pdf_path: str) -> Dict[int, str]:
         """Extract text from PDF pages"""
-        text_by_page = {}
-
-        try:
-            doc = fitz.open(pdf_path)
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text = page.get_text()
-                if text.strip():
-                    text_by_page[page_num + 1] = text
-            doc.close()
-        except Exception as e:
-            print(f"⚠️  PyMuPDF failed, trying pdfplumber: {e}")
-            try:
-                with pdfplumber.open(pdf_path) as pdf:
-                    for page_num, page in enumerate(pdf.pages):
-                        text = page.extract_text()
-                        if text and text.strip():
-                            text_by_page[page_num + 1] = text
-            except Exception as e2:
-                print(f"❌ Failed to extract text: {e2}")
-                return {}
-
-        return text_by_page
+        return get_page_texts(pdf_path)
 
     def _extract_system_info(self, text: str, page_num: int) -> List[FlexLinkSystem]:
         """Extract system information from text"""
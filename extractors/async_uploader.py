@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+FlexLink Concurrent Batch Uploader
+Runs batch uploads on an asyncio loop: a bounded number of batches in flight, a
+token-bucket rate limit, and retry with backoff per batch
+"""
+
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+DEFAULT_MAX_IN_FLIGHT = 4  # Batches being sent at the same time
+DEFAULT_MAX_RETRIES = 3  # Attempts per batch
+DEFAULT_BACKOFF_SECONDS = 2.0  # First retry delay, doubled on every further attempt
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Allow rate acquisitions per second on average, and bursts of up to burst
+        (by default one second's worth) after idle time
+        """
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class FlexLinkAsyncUploader:
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 requests_per_second: Optional[float] = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_seconds: float = DEFAULT_BACKOFF_SECONDS):
+        """
+        Initialize the uploader
+
+        Args:
+            max_in_flight: Batches sent at the same time
+            requests_per_second: Batch attempts started per second (None for no limit)
+            max_retries: Attempts per batch before it counts as failed
+            backoff_seconds: Delay before the first retry of a batch, doubled for each
+                further retry; only that batch waits, the others keep going
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.requests_per_second = requests_per_second
+        self.max_retries = max(1, max_retries)
+        self.backoff_seconds = backoff_seconds
+
+    def upload_batches(self, batches: Iterable[Any], upload: Callable[[Any], bool],
+                       on_result: Callable[[int, Any, bool], None]) -> Dict[str, Any]:
+        """
+        Upload batches concurrently
+
+        upload(batch) runs on a worker thread and returns True once the batch is stored;
+        False or an exception retries it. on_result(batch_number, batch, success) runs on
+        the calling thread, one batch at a time in completion order, so it can update
+        progress and results without locking. batches is consumed lazily, at most
+        max_in_flight batches ahead of the ones that finished (batches waiting to retry
+        don't count).
+        """
+        stats = {'batches': 0, 'successful_batches': 0, 'failed_batches': 0, 'retries': 0}
+        start_time = time.time()
+        asyncio.run(self._run(batches, upload, on_result, stats))
+        stats['upload_time'] = time.time() - start_time
+        return stats
+
+    async def _run(self, batches: Iterable[Any], upload: Callable[[Any], bool],
+                   on_result: Callable[[int, Any, bool], None], stats: Dict[str, Any]):
+        """Start a task per batch whenever a slot is free and wait for all of them"""
+        slots = asyncio.Semaphore(self.max_in_flight)
+        bucket = TokenBucket(self.requests_per_second) if self.requests_per_second else None
+        tasks = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            try:
+                for batch_number, batch in enumerate(batches, 1):
+                    await slots.acquire()
+                    task = asyncio.create_task(self._upload_batch(
+                        batch_number, batch, upload, on_result, stats, slots, bucket, executor))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    stats['batches'] += 1
+            finally:
+                if tasks:
+                    await asyncio.gather(*tasks)
+
+    async def _upload_batch(self, batch_number: int, batch: Any, upload: Callable[[Any], bool],
+                            on_result: Callable[[int, Any, bool], None], stats: Dict[str, Any],
+                            slots: asyncio.Semaphore, bucket: Optional[TokenBucket],
+                            executor: ThreadPoolExecutor):
+        """Send one batch, backing off between attempts; holds a slot except while waiting"""
+        loop = asyncio.get_running_loop()
+        success = False
+        try:
+            for attempt in range(1, self.max_retries + 1):
+                if bucket:
+                    await bucket.acquire()
+                try:
+                    success = bool(await loop.run_in_executor(executor, upload, batch))
+                    error = "Upload failed"
+                except Exception as e:
+                    error = str(e)
+
+                if success:
+                    break
+
+                print(f"❌ Batch {batch_number} failed (attempt {attempt}/{self.max_retries}): {error}")
+                if attempt == self.max_retries:
+                    print(f"❌ Batch {batch_number} failed after {self.max_retries} attempts")
+                    break
+
+                wait_time = self.backoff_seconds * 2 ** (attempt - 1)  # Exponential backoff
+                print(f"⏳ Retrying batch {batch_number} in {wait_time:.0f} seconds...")
+                stats['retries'] += 1
+                slots.release()
+                try:
+                    await asyncio.sleep(wait_time)
+                finally:
+                    await slots.acquire()
+        finally:
+            slots.release()
+
+        stats['successful_batches' if success else 'failed_batches'] += 1
+        on_result(batch_number, batch, success)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+FlexLink Extraction Micro-benchmark
+Times the per-page text parsing of the component, enhanced-component and image extractors,
+optionally against the per-pattern path they used before the shared regex registry
+"""
+
+import re
+import time
+import argparse
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List
+
+from page_text_provider import get_page_texts
+from component_extractor import ComponentSpecificationExtractor, ComponentSpecification
+from enhanced_component_extractor import EnhancedComponentExtractor
+from image_extractor import FlexLinkImageExtractor
+from extraction_patterns import (
+    SYSTEM_PATTERNS, PART_NUMBER_PATTERNS, DIMENSION_PATTERNS, MATERIAL_KEYWORDS, WEIGHT_PATTERNS,
+    PRICE_PATTERNS, SYSTEM_SPEC_PATTERNS, PRODUCT_CODE_PATTERNS, IMAGE_COMPONENT_PATTERNS)
+
+
+class BaselineParser:
+    """
+    The per-pattern path the extractors used before the shared registry, line index and
+    keyword matcher: every pattern goes through re.search(source, text, flags) on the
+    joined text of its line window, and keywords are checked one at a time. Patterns come
+    from the registry, so both paths look for the same things.
+    """
+
+    def __init__(self, component_extractor: ComponentSpecificationExtractor):
+        self.component_patterns = component_extractor.component_patterns
+
+    @staticmethod
+    def _search(pattern, text: str):
+        """Module-level re.search with the source and flags of a registry pattern"""
+        return re.search(pattern.pattern, text, pattern.flags)
+
+    def components(self, text: str, page_num: int) -> List[ComponentSpecification]:
+        """ComponentSpecificationExtractor._extract_components_from_text, old path"""
+        components = []
+        lines = text.split('\n')
+
+        for i, line in enumerate(lines):
+            line_lower = line.lower()
+            component_type = next((comp_type for comp_type, patterns in self.component_patterns.items()
+                                   if any(keyword in line_lower for keyword in patterns['keywords'])), None)
+            if not component_type:
+                continue
+
+            system_code = next((match.group(0) for match in (
+                self._search(pattern, line) for pattern in SYSTEM_PATTERNS.values()) if match), None)
+            if not system_code:
+                continue
+
+            components.append(self._component_details(lines, i, component_type, system_code, page_num))
+
+        return components
+
+    def _component_details(self, lines: List[str], start_idx: int, component_type: str,
+                           system_code: str, page_num: int) -> ComponentSpecification:
+        """Details of one component, each window joined and searched per pattern"""
+        spec_block = ' '.join(lines[max(0, start_idx - 5):start_idx + 10])
+        specs = {}
+        for spec_name, pattern in self.component_patterns[component_type]['spec_patterns'].items():
+            match = self._search(pattern, spec_block)
+            if match:
+                value = match.group(1)
+                specs[spec_name] = float(value) if '.' in value else int(value) if value.isdigit() else value
+
+        part_number = None
+        for line in lines[start_idx:start_idx + 5]:
+            match = next((match for match in (
+                self._search(pattern, line) for pattern in PART_NUMBER_PATTERNS) if match), None)
+            if match:
+                part_number = match.group(1)
+                break
+
+        text_block = ' '.join(lines[start_idx:start_idx + 10])
+        dimensions = {}
+        for dim_name, pattern in DIMENSION_PATTERNS.items():
+            match = self._search(pattern, text_block)
+            if match:
+                dimensions[dim_name] = f"{match.group(1)}mm"
+
+        materials = list({material for material, keywords in MATERIAL_KEYWORDS.items()
+                          if any(re.search(re.escape(keyword), text_block, re.IGNORECASE) for keyword in keywords)})
+        compatibility = list({system_name.upper() for system_name, pattern in SYSTEM_PATTERNS.items()
+                              if self._search(pattern, text_block)})
+
+        weight_kg = None
+        for pattern in WEIGHT_PATTERNS:
+            match = self._search(pattern, text_block)
+            if match:
+                weight_kg = float(match.group(1))
+                if 'g' in pattern.pattern and weight_kg < 1000:
+                    weight_kg = weight_kg / 1000
+                break
+
+        price_euro = None
+        for pattern in PRICE_PATTERNS:
+            match = self._search(pattern, text_block)
+            if match:
+                price_euro = float(match.group(1))
+                break
+
+        return ComponentSpecification(
+            system_code=system_code,
+            component_type=component_type,
+            component_name=lines[start_idx].strip(),
+            part_number=part_number,
+            specifications=specs,
+            dimensions=dimensions,
+            materials=materials,
+            compatibility=compatibility,
+            weight_kg=weight_kg,
+            price_euro=price_euro,
+            page_reference=page_num
+        )
+
+    def system_specifications(self, text: str, page_num: int) -> Dict[str, float]:
+        """EnhancedComponentExtractor._extract_system_specifications, old path"""
+        specs = {}
+        for spec_name, pattern in SYSTEM_SPEC_PATTERNS.items():
+            match = self._search(pattern, text)
+            if match:
+                specs[spec_name] = float(match.group(1))
+        return specs
+
+    def product_codes(self, text: str, page_num: int) -> List[str]:
+        """FlexLinkImageExtractor._extract_product_code of every line, old path"""
+        codes = []
+        for line in text.split('\n'):
+            matches = next((matches for matches in (
+                re.findall(pattern.pattern, line.upper(), pattern.flags) for pattern in PRODUCT_CODE_PATTERNS)
+                if matches), None)
+            codes.append(matches[0] if matches else "")
+        return codes
+
+    def component_types(self, text: str, page_num: int) -> List[str]:
+        """FlexLinkImageExtractor._extract_component_type of every line, old path"""
+        types = []
+        for line in text.split('\n'):
+            line_lower = line.lower()
+            match = next((match for match in (
+                self._search(pattern, line_lower) for pattern in IMAGE_COMPONENT_PATTERNS) if match), None)
+            types.append(match.group() if match else "")
+        return types
+
+
+def time_per_page(func: Callable[[str, int], object], pages: Dict[int, str], repeat: int) -> float:
+    """Best-of-repeat time of running func over every page, in milliseconds per page"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page_num, text in pages.items():
+            func(text, page_num)
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000 / max(len(pages), 1)
+
+
+def _comparable(result: Any) -> Any:
+    """Stage output with component materials/compatibility in a fixed order"""
+    if isinstance(result, list) and result and isinstance(result[0], ComponentSpecification):
+        return [{**asdict(component), 'materials': sorted(component.materials),
+                 'compatibility': sorted(component.compatibility)} for component in result]
+    return result
+
+
+def run_benchmark(pdf_path: str, repeat: int = 5, baseline: bool = False) -> List[Dict[str, Any]]:
+    """
+    Benchmark the text-parsing stages on an already extracted catalog
+
+    With baseline, each stage is also timed on the old per-pattern path (BaselineParser)
+    and both paths are checked to give the same results on every page.
+    """
+    # Text extraction is excluded; pages come from the shared provider/cache
+    pages = get_page_texts(pdf_path, strip=True)
+
+    component_extractor = ComponentSpecificationExtractor()
+    enhanced_extractor = EnhancedComponentExtractor()
+    image_extractor = FlexLinkImageExtractor()
+    old_path = BaselineParser(component_extractor)
+
+    stages = {
+        'components': (component_extractor._extract_components_from_text, old_path.components),
+        'system specifications': (
+            lambda text, page_num: enhanced_extractor._extract_system_specifications(text, ''),
+            old_path.system_specifications),
+        'image product codes': (lambda text, page_num: [
+            image_extractor._extract_product_code(line) for line in text.split('\n')],
+            old_path.product_codes),
+        'image component types': (lambda text, page_num: [
+            image_extractor._extract_component_type(line) for line in text.split('\n')],
+            old_path.component_types),
+    }
+
+    results = []
+    for name, (func, baseline_func) in stages.items():
+        result: Dict[str, Any] = {'stage': name, 'ms_per_page': time_per_page(func, pages, repeat)}
+        if baseline:
+            result['baseline_ms_per_page'] = time_per_page(baseline_func, pages, repeat)
+            result['same_results'] = all(
+                _comparable(func(text, page_num)) == _comparable(baseline_func(text, page_num))
+                for page_num, text in pages.items())
+        results.append(result)
+
+    return results
+
+
+def main():
+    """Command-line interface for the benchmark"""
+    parser = argparse.ArgumentParser(
+        description="Time per-page text parsing of the extractors")
+    parser.add_argument("pdf_file", help="Path to the PDF catalog file")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs per stage; the best run is reported (default: 5)")
+    parser.add_argument("--baseline", action="store_true",
+                        help="Also time the old per-pattern re.search path and compare results")
+
+    args = parser.parse_args()
+
+    results = run_benchmark(args.pdf_file, args.repeat, args.baseline)
+
+    print(f"\n⏱️  Per-page cost (best of {args.repeat}):")
+    for result in results:
+        if 'baseline_ms_per_page' not in result:
+            print(f"   {result['stage']:<24} {result['ms_per_page']:.3f} ms/page")
+            continue
+
+        speedup = result['baseline_ms_per_page'] / max(result['ms_per_page'], 1e-9)
+        same = "same results" if result['same_results'] else "❌ results differ"
+        print(f"   {result['stage']:<24} {result['baseline_ms_per_page']:.3f} -> "
+              f"{result['ms_per_page']:.3f} ms/page ({speedup:.1f}x, {same})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+FlexLink Catalog Page Manifest
+Page fingerprints for incremental re-extraction across catalog editions
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from typing import Dict, List, Any, Set
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from page_text_provider import get_pages
+
+# Under the repository root, wherever the tools are run from
+DEFAULT_MANIFEST_PATH = str(Path(__file__).resolve().parent.parent / "data" / "large_catalog_extraction"
+                            / "page_manifest.json")
+
+
+@dataclass
+class PageDelta:
+    """Pages of a new catalog edition compared with the manifest"""
+    added: List[int] = field(default_factory=list)
+    changed: List[int] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    unchanged: List[int] = field(default_factory=list)
+    # Unchanged content at a new page number: new page number -> previous page number
+    moved: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def reprocess(self) -> List[int]:
+        """Pages that need to be extracted again"""
+        return sorted(self.added + self.changed)
+
+    @property
+    def replaced(self) -> List[int]:
+        """Previous pages whose records may no longer be valid (by previous page number)"""
+        return sorted(self.changed + self.removed + list(self.moved.values()))
+
+
+def normalise_page_text(text: str) -> str:
+    """Collapse whitespace so layout-only differences don't count as changes"""
+    return ' '.join(text.split())
+
+
+def _rounded(value: Any) -> Any:
+    """Coordinates and colours rounded to 0.1, so float noise between editions is ignored"""
+    if isinstance(value, float):
+        return round(value, 1) + 0.0  # No -0.0
+    if isinstance(value, (tuple, list)):
+        return tuple(_rounded(item) for item in value)
+    return value
+
+
+def drawings_digest(paths: List[Dict[str, Any]]) -> str:
+    """Digest of a page's get_cdrawings() paths (geometry, colours and line widths), in drawing order"""
+    digest = hashlib.md5()
+    for path in paths:
+        digest.update(repr(tuple(_rounded(path.get(key)) for key in
+                                 ('type', 'items', 'color', 'fill', 'width'))).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def compute_page_fingerprints(pdf_path: str) -> Dict[int, str]:
+    """
+    Fingerprint every page from its normalised text, embedded image digests and a digest
+    of its vector paths (vector drawings are captured as images too)
+    """
+    fingerprints = {}
+    image_digests: Dict[int, str] = {}
+
+    doc = fitz.open(pdf_path)
+    try:
+        for page in get_pages(pdf_path):
+            digest = hashlib.sha256(normalise_page_text(page.text).encode('utf-8'))
+            fitz_page = doc.load_page(page.page_number - 1)
+
+            # Digest the raw image streams; xref numbers change between editions
+            page_digests = []
+            for img in fitz_page.get_images():
+                xref = img[0]
+                if xref not in image_digests:
+                    image_digests[xref] = hashlib.md5(doc.xref_stream_raw(xref) or b'').hexdigest()
+                page_digests.append(image_digests[xref])
+
+            for image_digest in sorted(page_digests):
+                digest.update(image_digest.encode('ascii'))
+
+            # Pages without paths keep the fingerprint they had before paths were digested
+            paths = fitz_page.get_cdrawings()
+            if paths:
+                digest.update(drawings_digest(paths).encode('ascii'))
+
+            fingerprints[page.page_number] = digest.hexdigest()
+    finally:
+        doc.close()
+
+    return fingerprints
+
+
+class CatalogManifest:
+    def __init__(self, manifest_path: str = DEFAULT_MANIFEST_PATH, section: str = 'components',
+                 record_version: int = 1):
+        """
+        Load one section of the page manifest
+
+        Args:
+            manifest_path: JSON manifest file, shared by all sections
+            section: 'components' or 'images'; each tracks its own fingerprints
+            record_version: Format of the section's records; a section written with
+                another format is ignored, so the next run is a full one
+        """
+        self.manifest_path = Path(manifest_path)
+        self.section = section
+        self.record_version = record_version
+
+        self.data = {}
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    self.data = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Could not read page manifest, doing a full run: {e}")
+
+        section_data = self.data.get(section, {})
+        if section_data and section_data.get('record_version', 1) != record_version:
+            print(f"⚠️  Page manifest ({section}) has records in an older format, doing a full run")
+            section_data = {}
+        # JSON object keys are strings; pages are tracked by 1-based page number
+        self.pages: Dict[int, Dict[str, Any]] = {
+            int(page_num): entry for page_num, entry in section_data.get('pages', {}).items()}
+
+    def diff(self, fingerprints: Dict[int, str]) -> PageDelta:
+        """
+        Compare new page fingerprints with the manifest
+
+        Pages are matched by fingerprint first, so pages inserted or removed early in the
+        catalog make the pages after them moved rather than changed. Pages left over are
+        compared by page number.
+        """
+        delta = PageDelta()
+        matched = set()  # Previous page numbers accounted for
+
+        for page_num, fingerprint in sorted(fingerprints.items()):
+            previous = self.pages.get(page_num)
+            if previous is not None and previous['fingerprint'] == fingerprint:
+                delta.unchanged.append(page_num)
+                matched.add(page_num)
+
+        # Previous pages not matched yet, by fingerprint, in page order
+        free: Dict[str, List[int]] = {}
+        for page_num in sorted(set(self.pages) - matched):
+            free.setdefault(self.pages[page_num]['fingerprint'], []).append(page_num)
+
+        leftover = []
+        for page_num, fingerprint in sorted(fingerprints.items()):
+            if page_num in delta.unchanged:
+                continue
+            if free.get(fingerprint):
+                delta.moved[page_num] = free[fingerprint].pop(0)
+                matched.add(delta.moved[page_num])
+            else:
+                leftover.append(page_num)
+
+        for page_num in leftover:
+            if page_num in self.pages and page_num not in matched:
+                delta.changed.append(page_num)
+                matched.add(page_num)
+            else:
+                delta.added.append(page_num)
+
+        delta.removed = sorted(set(self.pages) - matched)
+        return delta
+
+    def moved_records(self, delta: PageDelta) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Copies of the records of moved pages, by their new page number, for callers to
+        adjust (page numbers in keys, ...) and pass to build_delta() and update()
+        """
+        return {page_num: [dict(record) for record in self.pages[previous]['records']]
+                for page_num, previous in delta.moved.items()}
+
+    def known_keys(self, field: str = 'key') -> Set[str]:
+        """Values of one field (the record key by default) across every record in the manifest"""
+        return {record[field] for entry in self.pages.values() for record in entry['records']}
+
+    def build_delta(self, delta: PageDelta,
+                    new_records: Dict[int, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Work out which records to upsert and delete after reprocessing pages
+
+        Args:
+            delta: Page comparison from diff()
+            new_records: Identity records (with a 'key') extracted from reprocessed pages,
+                plus those of moved pages (see moved_records())
+
+        Returns:
+            {'upsert': new records, 'delete': previous records that disappeared}
+        """
+        kept = {record['key'] for page_num in delta.unchanged
+                for record in self.pages[page_num]['records']}
+
+        upsert = {}
+        for page_num in sorted(new_records):
+            for record in new_records[page_num]:
+                if record['key'] not in kept:
+                    upsert.setdefault(record['key'], record)
+
+        delete = {}
+        for page_num in delta.replaced:
+            for record in self.pages[page_num]['records']:
+                if record['key'] not in kept and record['key'] not in upsert:
+                    delete.setdefault(record['key'], record)
+
+        return {'upsert': list(upsert.values()), 'delete': list(delete.values())}
+
+    def update(self, pdf_sha256: str, fingerprints: Dict[int, str], delta: PageDelta,
+               new_records: Dict[int, List[Dict[str, Any]]]):
+        """
+        Record the new edition: fresh records for reprocessed pages, the given (or else
+        the previous) records for moved pages, and the previous ones for the rest
+        """
+        reprocessed = set(delta.reprocess)
+        self.pages = {
+            page_num: {
+                'fingerprint': fingerprint,
+                'records': new_records.get(page_num, []) if page_num in reprocessed
+                else new_records.get(page_num, self.pages[delta.moved[page_num]]['records'])
+                if page_num in delta.moved
+                else self.pages[page_num]['records']
+            } for page_num, fingerprint in fingerprints.items()
+        }
+
+        self.data[self.section] = {
+            'record_version': self.record_version,
+            'pdf_sha256': pdf_sha256,
+            'updated_at': time.time(),
+            'pages': {str(page_num): entry for page_num, entry in sorted(self.pages.items())}
+        }
+
+    def save(self):
+        """Write the manifest to disk"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so an interrupted save never leaves a truncated manifest behind
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.manifest_path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def print_summary(self, delta: PageDelta):
+        """Print the page comparison"""
+        if not self.pages:
+            print("📋 No previous manifest, processing every page")
+            return
+
+        print(f"📋 Page manifest ({self.section}): {len(delta.unchanged)} unchanged, "
+              f"{len(delta.moved)} moved, {len(delta.changed)} changed, {len(delta.added)} added, "
+              f"{len(delta.removed)} removed")
@@ -5,23 +5,20 @@ Extracts detailed component specifications from PDFs and formats them for databa
 """
 
 import os
-import re
 import json
 import csv
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Set
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import requests
 from dotenv import load_dotenv
 
-# PDF processing libraries
-try:
-    import fitz  # PyMuPDF
-    import pdfplumber
-    PDF_LIBRARIES_AVAILABLE = True
-except ImportError:
-    PDF_LIBRARIES_AVAILABLE = False
-    print("⚠️  PDF libraries not installed. Run: pip install PyMuPDF pdfplumber")
+# PDF processing libraries (shared page text, one parse per catalog)
+from page_text_provider import PDF_LIBRARIES_AVAILABLE, get_page_texts, iter_page_texts
+from line_index import LineIndex, LineWindow
+from extraction_patterns import (
+    SYSTEM_PATTERNS, SYSTEM_KEYWORDS, COMPONENT_SPEC_PATTERNS, PART_NUMBER_PATTERNS,
+    DIMENSION_PATTERNS, MATERIAL_KEYWORDS, WEIGHT_PATTERNS, PRICE_PATTERNS, KeywordMatcher)
 
 # Database connection
 try:
@@ -30,6 +27,9 @@ try:
 except ImportError:
     SUPABASE_AVAILABLE = False
 
+# Unique key component rows are upserted on (component_key is part_number, or name without one)
+COMPONENT_UPSERT_KEY = 'system_code,component_key'
+
 
 @dataclass
 class ComponentSpecification:
@@ -83,83 +83,47 @@ class ComponentSpecificationExtractor:
             print(
                 "⚠️  Supabase not configured. Set SUPABASE_URL and SUPABASE_ANON_KEY environment variables")
 
-        # Component type patterns
+        # Component type patterns (spec patterns come precompiled from the registry)
         self.component_patterns = {
             'chain': {
                 'keywords': ['chain', 'conveyor chain', 'flexible chain'],
-                'spec_patterns': {
-                    'pitch': r'(\d+\.?\d*)\s*mm\s*pitch',
-                    'width': r'(\d+\.?\d*)\s*mm\s*width',
-                    'max_load': r'(\d+\.?\d*)\s*kg.*(?:per\s*link|maximum)',
-                    'material': r'(steel|stainless steel|plastic|nylon)',
-                    'type': r'(plain|cleated|steel top|side flexing)'
-                }
+                'spec_patterns': COMPONENT_SPEC_PATTERNS['chain']
             },
             'sprocket': {
                 'keywords': ['sprocket', 'drive sprocket', 'idler sprocket'],
-                'spec_patterns': {
-                    'teeth': r'(\d+)\s*teeth',
-                    'bore': r'(\d+\.?\d*)\s*mm\s*bore',
-                    'pitch': r'(\d+\.?\d*)\s*mm\s*pitch',
-                    'material': r'(steel|stainless steel|plastic)',
-                    'type': r'(drive|idler|tension)'
-                }
+                'spec_patterns': COMPONENT_SPEC_PATTERNS['sprocket']
             },
             'bearing': {
                 'keywords': ['bearing', 'roller bearing', 'chain bearing'],
-                'spec_patterns': {
-                    'load_rating': r'(\d+\.?\d*)\s*kg.*load',
-                    'bore': r'(\d+\.?\d*)\s*mm\s*bore',
-                    'material': r'(steel|stainless steel|ceramic)',
-                    'seals': r'(single|double|open)\s*(lip|contact)',
-                    'type': r'(roller|ball|needle)'
-                }
+                'spec_patterns': COMPONENT_SPEC_PATTERNS['bearing']
             },
             'track': {
                 'keywords': ['track', 'guide rail', 'aluminum track'],
-                'spec_patterns': {
-                    'width': r'(\d+\.?\d*)\s*mm\s*width',
-                    'height': r'(\d+\.?\d*)\s*mm\s*height',
-                    'material': r'(aluminum|steel|stainless steel)',
-                    'profile': r'(standard|low profile|high profile)',
-                    'length': r'(\d+\.?\d*)\s*m\s*length'
-                }
+                'spec_patterns': COMPONENT_SPEC_PATTERNS['track']
             },
             'drive_unit': {
                 'keywords': ['drive unit', 'motor', 'actuator'],
-                'spec_patterns': {
-                    'power': r'(\d+\.?\d*)\s*kW',
-                    'voltage': r'(\d+\.?\d*)\s*V',
-                    'speed': r'(\d+\.?\d*)\s*rpm',
-                    'torque': r'(\d+\.?\d*)\s*Nm',
-                    'type': r'(end|intermediate|center)'
-                }
+                'spec_patterns': COMPONENT_SPEC_PATTERNS['drive_unit']
             },
             'bend': {
                 'keywords': ['bend', 'curve', 'turn', 'radius'],
-                'spec_patterns': {
-                    'radius': r'(\d+\.?\d*)\s*mm\s*radius',
-                    'angle': r'(\d+\.?\d*)\s*degrees?',
-                    'type': r'(horizontal|vertical|spiral)',
-                    'direction': r'(left|right|up|down)'
-                }
+                'spec_patterns': COMPONENT_SPEC_PATTERNS['bend']
             }
         }
 
         # System code patterns
-        self.system_patterns = {
-            'x45': r'X45|X-45',
-            'xs': r'XS|X-S',
-            'x65': r'X65|X-65',
-            'x85': r'X85|X-85',
-            'xh': r'XH|X-H',
-            'xk': r'XK|X-K',
-            'x180': r'X180|X-180',
-            'x300': r'X300|X-300'
-        }
-
-    def extract_from_pdf(self, pdf_path: str) -> List[ComponentSpecification]:
-        """Extract component specifications from a PDF file"""
+        self.system_patterns = SYSTEM_PATTERNS
+
+        # One scan answers component type, materials and system compatibility
+        self.keyword_matcher = KeywordMatcher({
+            'type': {comp_type: patterns['keywords'] for comp_type, patterns in self.component_patterns.items()},
+            'material': MATERIAL_KEYWORDS,
+            'system': SYSTEM_KEYWORDS
+        })
+
+    def extract_from_pdf(self, pdf_path: str, workers: int = 1,
+                         pages: Optional[Set[int]] = None) -> List[ComponentSpecification]:
+        """Extract component specifications from a PDF file (optionally only the given pages)"""
         if not PDF_LIBRARIES_AVAILABLE:
             print("❌ PDF libraries not available")
             return []
@@ -167,19 +131,28 @@ class ComponentSpecificationExtractor:
         print(f"📄 Processing PDF: {pdf_path}")
 
         try:
-            # Extract text from PDF
-            page_texts = self._extract_text_from_pdf(pdf_path)
-            if not page_texts:
-                print("❌ No text extracted from PDF")
-                return []
+            # Stream pages so parsing starts before the whole PDF is read;
+            # parallel page ranges are only merged once every range is done
+            if workers > 1:
+                page_texts = self._extract_text_from_pdf(pdf_path, workers).items()
+            else:
+                page_texts = iter_page_texts(pdf_path, strip=True)
 
             # Extract component specifications
             components = []
-            for page_num, text in page_texts.items():
+            page_count = 0
+            for page_num, text in page_texts:
+                page_count += 1
+                if pages is not None and page_num not in pages:
+                    continue
                 page_components = self._extract_components_from_text(
                     text, page_num)
                 components.extend(page_components)
 
+            if not page_count:
+                print("❌ No text extracted from PDF")
+                return []
+
             print(f"✅ Extracted {len(components)} component specifications")
             return components
 
@@ -187,38 +160,15 @@ class ComponentSpecificationExtractor:
             print(f"❌ Error processing PDF: {e}")
             return []
 
-    def _extract_text_from_pdf(self, pdf_path: str) -> Dict[int, str]:
-        """Extract text from PDF pages"""
-        page_texts = {}
-
-        try:
-            # Try pdfplumber first (better for tables)
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text()
-                    if text and text.strip():
-                        page_texts[page_num] = text.strip()
-
-            if not page_texts:
-                # Fallback to PyMuPDF
-                doc = fitz.open(pdf_path)
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    text = page.get_text()
-                    if text and text.strip():
-                        page_texts[page_num + 1] = text.strip()
-                doc.close()
-
-            return page_texts
-
-        except Exception as e:
-            print(f"❌ Error extracting text: {e}")
-            return {}
+    def _extract_text_from_pdf(self, pdf_path: str, workers: int = 1) -> Dict[int, str]:
+        """Extract text from PDF pages, in parallel page ranges when workers > 1"""
+        return get_page_texts(pdf_path, strip=True, workers=workers)
 
     def _extract_components_from_text(self, text: str, page_num: int) -> List[ComponentSpecification]:
         """Extract component specifications from text"""
         components = []
         lines = text.split('\n')
+        index = LineIndex(lines)
 
         for i, line in enumerate(lines):
             # Detect component type
@@ -233,7 +183,7 @@ class ComponentSpecificationExtractor:
 
             # Extract component details
             component = self._extract_component_details(
-                lines, i, component_type, system_code, page_num
+                index, i, component_type, system_code, page_num
             )
             if component:
                 components.append(component)
@@ -242,53 +192,47 @@ class ComponentSpecificationExtractor:
 
     def _detect_component_type(self, text: str) -> Optional[str]:
         """Detect component type from text"""
-        text_lower = text.lower()
-
-        for comp_type, patterns in self.component_patterns.items():
-            for keyword in patterns['keywords']:
-                if keyword in text_lower:
-                    return comp_type
-
-        return None
+        hits = self.keyword_matcher.scan(text.lower())
+        return self.keyword_matcher.first(hits, 'type')
 
     def _extract_system_code(self, text: str) -> Optional[str]:
         """Extract system code from text"""
         for system_name, pattern in self.system_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 return match.group(0)
         return None
 
-    def _extract_component_details(self, lines: List[str], start_idx: int,
+    def _extract_component_details(self, index: LineIndex, start_idx: int,
                                    component_type: str, system_code: str,
                                    page_num: int) -> Optional[ComponentSpecification]:
         """Extract detailed component information"""
         try:
             # Get component name from the line
-            component_name = lines[start_idx].strip()
+            component_name = index.lines[start_idx].strip()
 
             # Extract specifications from surrounding lines
             specs = self._extract_specifications(
-                lines, start_idx, component_type)
+                index.window(start_idx-5, start_idx+10), component_type)
 
             # Extract part number if present
             part_number = self._extract_part_number(
-                lines[start_idx:start_idx+5])
+                index.window(start_idx, start_idx+5))
 
-            # Extract dimensions
-            dimensions = self._extract_dimensions(
-                lines[start_idx:start_idx+10])
+            # Detail window shared by the remaining extractors
+            window = index.window(start_idx, start_idx+10)
 
-            # Extract materials
-            materials = self._extract_materials(lines[start_idx:start_idx+10])
+            # Extract dimensions
+            dimensions = self._extract_dimensions(window)
 
-            # Extract compatibility
-            compatibility = self._extract_compatibility(
-                lines[start_idx:start_idx+10])
+            # Extract materials and compatibility from one keyword scan
+            keyword_hits = window.scan(self.keyword_matcher)
+            materials = self._extract_materials(keyword_hits)
+            compatibility = self._extract_compatibility(keyword_hits)
 
             # Extract weight and price
-            weight_kg = self._extract_weight(lines[start_idx:start_idx+10])
-            price_euro = self._extract_price(lines[start_idx:start_idx+10])
+            weight_kg = self._extract_weight(window)
+            price_euro = self._extract_price(window)
 
             return ComponentSpecification(
                 system_code=system_code,
@@ -308,18 +252,15 @@ class ComponentSpecificationExtractor:
             print(f"⚠️  Error extracting component details: {e}")
             return None
 
-    def _extract_specifications(self, lines: List[str], start_idx: int,
+    def _extract_specifications(self, window: LineWindow,
                                 component_type: str) -> Dict[str, Any]:
         """Extract specifications based on component type"""
         specs = {}
         patterns = self.component_patterns[component_type]['spec_patterns']
 
         # Look in surrounding lines
-        search_lines = lines[max(0, start_idx-5):start_idx+10]
-        text_block = ' '.join(search_lines)
-
         for spec_name, pattern in patterns.items():
-            match = re.search(pattern, text_block, re.IGNORECASE)
+            match = window.search(pattern)
             if match:
                 try:
                     # Try to convert to number if possible
@@ -335,115 +276,53 @@ class ComponentSpecificationExtractor:
 
         return specs
 
-    def _extract_part_number(self, lines: List[str]) -> Optional[str]:
-        """Extract part number from lines"""
-        for line in lines:
+    def _extract_part_number(self, window: LineWindow) -> Optional[str]:
+        """Extract part number from the window, one line at a time"""
+        for line in window.lines():
             # Look for patterns like "Part No:", "P/N:", "Article:", etc.
-            patterns = [
-                r'part\s*no\.?\s*:?\s*([A-Z0-9\-]+)',
-                r'p/n\s*:?\s*([A-Z0-9\-]+)',
-                r'article\s*:?\s*([A-Z0-9\-]+)',
-                r'item\s*:?\s*([A-Z0-9\-]+)'
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
+            for pattern in PART_NUMBER_PATTERNS:
+                match = line.search(pattern)
                 if match:
                     return match.group(1)
 
         return None
 
-    def _extract_dimensions(self, lines: List[str]) -> Dict[str, str]:
-        """Extract dimensions from lines"""
+    def _extract_dimensions(self, window: LineWindow) -> Dict[str, str]:
+        """Extract dimensions from the window"""
         dimensions = {}
-        text_block = ' '.join(lines)
-
-        # Common dimension patterns
-        patterns = {
-            'length': r'(\d+\.?\d*)\s*mm\s*(?:length|l)',
-            'width': r'(\d+\.?\d*)\s*mm\s*(?:width|w)',
-            'height': r'(\d+\.?\d*)\s*mm\s*(?:height|h)',
-            'diameter': r'(\d+\.?\d*)\s*mm\s*(?:diameter|d)',
-            'thickness': r'(\d+\.?\d*)\s*mm\s*(?:thickness|t)'
-        }
 
-        for dim_name, pattern in patterns.items():
-            match = re.search(pattern, text_block, re.IGNORECASE)
+        for dim_name, pattern in DIMENSION_PATTERNS.items():
+            match = window.search(pattern)
             if match:
                 dimensions[dim_name] = f"{match.group(1)}mm"
 
         return dimensions
 
-    def _extract_materials(self, lines: List[str]) -> List[str]:
-        """Extract materials from lines"""
-        materials = []
-        text_block = ' '.join(lines)
-
-        # Common material patterns
-        material_patterns = [
-            r'steel',
-            r'stainless steel',
-            r'aluminum',
-            r'plastic',
-            r'nylon',
-            r'ceramic',
-            r'brass',
-            r'bronze'
-        ]
-
-        for pattern in material_patterns:
-            if re.search(pattern, text_block, re.IGNORECASE):
-                materials.append(pattern.title())
-
-        return list(set(materials))  # Remove duplicates
-
-    def _extract_compatibility(self, lines: List[str]) -> List[str]:
-        """Extract compatibility information"""
-        compatibility = []
-        text_block = ' '.join(lines)
+    def _extract_materials(self, keyword_hits: Dict[str, Set[str]]) -> List[str]:
+        """Extract materials from keyword hits"""
+        return list(keyword_hits['material'])
 
+    def _extract_compatibility(self, keyword_hits: Dict[str, Set[str]]) -> List[str]:
+        """Extract compatibility information from keyword hits"""
         # Look for system codes
-        for system_name, pattern in self.system_patterns.items():
-            if re.search(pattern, text_block, re.IGNORECASE):
-                compatibility.append(system_name.upper())
+        return list({system_name.upper() for system_name in keyword_hits['system']})
 
-        return list(set(compatibility))
-
-    def _extract_weight(self, lines: List[str]) -> Optional[float]:
-        """Extract weight from lines"""
-        text_block = ' '.join(lines)
-
-        # Weight patterns
-        patterns = [
-            r'(\d+\.?\d*)\s*kg',
-            r'(\d+\.?\d*)\s*g',
-            r'weight\s*:?\s*(\d+\.?\d*)\s*kg'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text_block, re.IGNORECASE)
+    def _extract_weight(self, window: LineWindow) -> Optional[float]:
+        """Extract weight from the window"""
+        for pattern in WEIGHT_PATTERNS:
+            match = window.search(pattern)
             if match:
                 weight = float(match.group(1))
-                if 'g' in pattern and weight < 1000:  # Convert grams to kg
+                if 'g' in pattern.pattern and weight < 1000:  # Convert grams to kg
                     weight = weight / 1000
                 return weight
 
         return None
 
-    def _extract_price(self, lines: List[str]) -> Optional[float]:
-        """Extract price from lines"""
-        text_block = ' '.join(lines)
-
-        # Price patterns
-        patterns = [
-            r'(\d+\.?\d*)\s*€',
-            r'(\d+\.?\d*)\s*euro',
-            r'price\s*:?\s*(\d+\.?\d*)',
-            r'cost\s*:?\s*(\d+\.?\d*)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text_block, re.IGNORECASE)
+    def _extract_price(self, window: LineWindow) -> Optional[float]:
+        """Extract price from the window"""
+        for pattern in PRICE_PATTERNS:
+            match = window.search(pattern)
             if match:
                 return float(match.group(1))
 
@@ -528,8 +407,8 @@ class ComponentSpecificationExtractor:
             return False
 
         try:
-            # Convert to database format
-            db_components = []
+            # Convert to database format (one row per natural key, the last one wins)
+            db_components = {}
             for component in components:
                 db_component = {
                     'system_code': component.system_code,
@@ -546,19 +425,42 @@ class ComponentSpecificationExtractor:
                     'image_url': component.image_url,
                     'page_reference': component.page_reference
                 }
-                db_components.append(db_component)
+                db_components[(component.system_code, component.part_number or component.component_name)] = db_component
 
-            # Upload to database
-            result = self.supabase.table(
-                'component_specifications').insert(db_components).execute()
+            # Upsert, so uploading the same components again updates them in place
+            result = self.supabase.table('component_specifications').upsert(
+                list(db_components.values()), on_conflict=COMPONENT_UPSERT_KEY).execute()
 
-            print(f"✅ Uploaded {len(components)} components to database")
+            print(f"✅ Uploaded {len(db_components)} components to database")
             return True
 
         except Exception as e:
             print(f"❌ Error uploading to database: {e}")
             return False
 
+    def delete_from_database(self, components: List[Dict[str, Any]]) -> bool:
+        """Delete components from Supabase by system code and part number (or name)"""
+        if not self.supabase:
+            print("❌ Supabase not configured")
+            return False
+
+        try:
+            for component in components:
+                query = self.supabase.table('component_specifications').delete().eq(
+                    'system_code', component['system_code'])
+                if component.get('part_number'):
+                    query = query.eq('part_number', component['part_number'])
+                else:
+                    query = query.eq('name', component['component_name'])
+                query.execute()
+
+            print(f"🗑️  Deleted {len(components)} components from database")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error deleting from database: {e}")
+            return False
+
     def create_sample_data(self) -> List[ComponentSpecification]:
         """Create sample component specifications for testing"""
         sample_components = [
@@ -5,20 +5,15 @@ Captures system-level application information and intro text for filtering by cr
 """
 
 import os
-import re
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from dataclasses import dataclass, asdict
 from dotenv import load_dotenv
 
-# PDF processing libraries
-try:
-    import fitz  # PyMuPDF
-    import pdfplumber
-    PDF_LIBRARIES_AVAILABLE = True
-except ImportError:
-    PDF_LIBRARIES_AVAILABLE = False
-    print("⚠️  PDF libraries not installed. Run: pip install PyMuPDF pdfplumber")
+# PDF processing libraries (shared page text, one parse per catalog)
+from page_text_provider import PDF_LIBRARIES_AVAILABLE, get_page_texts
+from extraction_patterns import SYSTEM_SPEC_PATTERNS, KeywordMatcher
+from component_extractor import COMPONENT_UPSERT_KEY
 
 # Database connection
 try:
@@ -155,6 +150,9 @@ class EnhancedComponentExtractor:
             'heavy_duty': ['heavy duty', 'industrial', 'robust', 'high load']
         }
 
+        # All six flags are answered from one scan of each text
+        self.flag_matcher = KeywordMatcher({'flag': self.application_keywords})
+
     def extract_system_applications(self, pdf_path: str) -> List[SystemApplication]:
         """Extract system-level application information from PDF"""
         print(f"📖 Extracting system applications from: {pdf_path}")
@@ -207,15 +205,8 @@ class EnhancedComponentExtractor:
         specs = {}
 
         # Look for common specifications
-        patterns = {
-            'max_load': r'(\d+\.?\d*)\s*(?:kg|lb).*load',
-            'temperature': r'(\d+\.?\d*)\s*°C',
-            'speed': r'(\d+\.?\d*)\s*(?:m/min|ft/min)',
-            'pitch': r'(\d+\.?\d*)\s*mm\s*pitch'
-        }
-
-        for spec_name, pattern in patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
+        for spec_name, pattern in SYSTEM_SPEC_PATTERNS.items():
+            match = pattern.search(text)
             if match:
                 specs[spec_name] = float(match.group(1))
 
@@ -236,6 +227,9 @@ class EnhancedComponentExtractor:
         base_extractor = ComponentSpecificationExtractor()
         base_components = base_extractor.extract_from_pdf(pdf_path)
 
+        # Application keywords found in each system's text, scanned once per system
+        system_flag_hits = {}
+
         # Enhance components with application information
         enhanced_components = []
 
@@ -263,68 +257,42 @@ class EnhancedComponentExtractor:
                 enhanced_comp.system_features = system_app.features
 
                 # Determine application flags
-                enhanced_comp.washable = self._check_application_flag(
-                    component, system_app, 'washable')
-                enhanced_comp.food_grade = self._check_application_flag(
-                    component, system_app, 'food_grade')
-                enhanced_comp.high_temperature = self._check_application_flag(
-                    component, system_app, 'high_temperature')
-                enhanced_comp.chemical_resistant = self._check_application_flag(
-                    component, system_app, 'chemical_resistant')
-                enhanced_comp.hygienic = self._check_application_flag(
-                    component, system_app, 'hygienic')
-                enhanced_comp.heavy_duty = self._check_application_flag(
-                    component, system_app, 'heavy_duty')
+                if system_app.system_code not in system_flag_hits:
+                    system_flag_hits[system_app.system_code] = self._scan_system_flags(system_app)
+
+                flags = self._check_application_flags(
+                    component, system_flag_hits[system_app.system_code])
+                enhanced_comp.washable = flags['washable']
+                enhanced_comp.food_grade = flags['food_grade']
+                enhanced_comp.high_temperature = flags['high_temperature']
+                enhanced_comp.chemical_resistant = flags['chemical_resistant']
+                enhanced_comp.hygienic = flags['hygienic']
+                enhanced_comp.heavy_duty = flags['heavy_duty']
 
             enhanced_components.append(enhanced_comp)
 
         return enhanced_components
 
-    def _check_application_flag(self, component: Any, system_app: SystemApplication, flag_name: str) -> bool:
-        """Check if component meets application criteria"""
-        # Check component specifications
-        component_text = f"{component.component_name} {component.description}".lower(
-        )
-
-        # Check system applications
+    def _scan_system_flags(self, system_app: SystemApplication) -> Set[str]:
+        """Find the application flags whose keywords occur in the system text"""
         system_text = f"{system_app.description} {' '.join(system_app.applications)}".lower(
         )
+        return self.flag_matcher.scan(system_text)['flag']
 
-        # Check for keywords
-        keywords = self.application_keywords.get(flag_name, [])
+    def _check_application_flags(self, component: Any, system_flags: Set[str]) -> Dict[str, bool]:
+        """Check which application criteria the component meets"""
+        # Check component specifications
+        component_text = f"{component.component_name} {component.description}".lower(
+        )
 
-        for keyword in keywords:
-            if keyword in component_text or keyword in system_text:
-                return True
+        # Check for keywords in the component and its system
+        found = self.flag_matcher.scan(component_text)['flag'] | system_flags
 
-        return False
+        return {flag_name: flag_name in found for flag_name in self.application_keywords}
 
     def _extract_text_from_pdf(self, pdf_path: str) -> Dict[int, str]:
         """Extract text from PDF page by page"""
-        text_by_page = {}
-
-        try:
-            # Try pdfplumber first
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text()
-                    if text:
-                        text_by_page[page_num] = text
-        except Exception as e:
-            print(f"⚠️  pdfplumber failed: {e}")
-            # Fallback to PyMuPDF
-            try:
-                doc = fitz.open(pdf_path)
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    text = page.get_text()
-                    if text:
-                        text_by_page[page_num + 1] = text
-                doc.close()
-            except Exception as e2:
-                print(f"❌ Both PDF libraries failed: {e2}")
-
-        return text_by_page
+        return get_page_texts(pdf_path)
 
     def save_enhanced_components(self, components: List[EnhancedComponentSpecification], output_file: str):
         """Save enhanced components to JSON"""
@@ -343,14 +311,17 @@ class EnhancedComponentExtractor:
             return False
 
         try:
-            components_data = [asdict(comp) for comp in components]
+            # One row per natural key (the last one wins), as an upsert can't touch a row twice
+            components_data = list({
+                (comp.system_code, comp.part_number or comp.component_name): asdict(comp)
+                for comp in components}.values())
 
             # Upload in batches
             batch_size = 20
             for i in range(0, len(components_data), batch_size):
                 batch = components_data[i:i + batch_size]
-                result = self.supabase.table(
-                    'component_specifications').insert(batch).execute()
+                result = self.supabase.table('component_specifications').upsert(
+                    batch, on_conflict=COMPONENT_UPSERT_KEY).execute()
                 print(f"✅ Uploaded batch {i//batch_size + 1}")
 
             return True
@@ -6,11 +6,20 @@ Extracts blueprint drawings from PDF catalog and uploads to database
 
 import os
 import sys
+import json
 import argparse
 from pathlib import Path
 from typing import Dict, List, Any
 from image_extractor import FlexLinkImageExtractor
-from upload_images_to_database import FlexLinkImageUploader
+from upload_images_to_database import FlexLinkImageUploader, placement_coordinate
+from image_pipeline import FlexLinkImagePipeline
+from catalog_manifest import CatalogManifest, DEFAULT_MANIFEST_PATH, compute_page_fingerprints
+from page_text_cache import compute_pdf_sha256
+
+# Image manifest records are placements (image, page and position), not whole images;
+# version 3 records carry image hashes of the source image instead of the stored file,
+# version 4 coordinates rounded like the database (placement_coordinate)
+IMAGE_RECORD_VERSION = 4
 
 
 class FlexLinkImageProcessor:
@@ -20,21 +29,68 @@ class FlexLinkImageProcessor:
         self.uploader = FlexLinkImageUploader()
 
     def process_pdf_and_upload(self, pdf_path: str, save_local: bool = True,
-                               output_dir: str = "extracted_images") -> Dict[str, Any]:
-        """Process PDF and upload images to database"""
+                               output_dir: str = "extracted_images",
+                               incremental: bool = False,
+                               manifest_path: str = DEFAULT_MANIFEST_PATH,
+                               workers: int = 1, stream: bool = False,
+                               queue_size: int = 8) -> Dict[str, Any]:
+        """
+        Process PDF and upload images to database
+
+        With stream=True the images flow through bounded queues (extract → filter →
+        save → upload) instead of being collected first; uploads start while pages
+        are still being extracted.
+        """
         print(f"🔄 Starting complete image processing pipeline")
         print(f"📄 PDF: {pdf_path}")
         print(f"💾 Save locally: {save_local}")
         print(f"📁 Output directory: {output_dir}")
 
+        if stream:
+            return self._stream_pdf_and_upload(pdf_path, save_local, output_dir, queue_size)
+
+        # Compare page fingerprints with the previous edition
+        pages = None
+        if incremental:
+            manifest = CatalogManifest(manifest_path, 'images', IMAGE_RECORD_VERSION)
+            fingerprints = compute_page_fingerprints(pdf_path)
+            page_delta = manifest.diff(fingerprints)
+            manifest.print_summary(page_delta)
+            pages = set(page_delta.reprocess)
+
         # Step 1: Extract images from PDF
         print("\n📋 Step 1: Extracting images from PDF...")
         extraction_result = self.extractor.process_pdf_images(
             pdf_path,
             save_local=save_local,
-            output_dir=output_dir
+            output_dir=output_dir,
+            pages=pages,
+            workers=workers
         )
 
+        if incremental:
+            new_records = self._image_records_by_page(extraction_result.get('database_records', []))
+            # Moved pages are not re-extracted; their placements move to the new page number
+            for page_num, records in manifest.moved_records(page_delta).items():
+                new_records[page_num] = [
+                    self._placement_record(record['image_hash'], {**record, 'page_number': page_num})
+                    for record in records]
+            image_delta = self._plan_image_delta(
+                manifest, page_delta, new_records, extraction_result, manifest_path)
+
+            if not extraction_result.get('database_records'):
+                success = self._upload_known_placements(image_delta)['success']
+                if success:
+                    self._finish_incremental(manifest, image_delta, pdf_path, fingerprints,
+                                             page_delta, new_records)
+                print("✅ No new blueprint images to upload")
+                return {
+                    'success': success,
+                    'message': 'No new blueprint images',
+                    'extraction': extraction_result,
+                    'delta': image_delta
+                }
+
         if not extraction_result or not extraction_result.get('blueprint_images'):
             print("❌ No blueprint images found in PDF")
             return {
@@ -48,6 +104,13 @@ class FlexLinkImageProcessor:
             f"\n📋 Step 2: Uploading {len(extraction_result['database_records'])} images to database...")
         upload_result = self.uploader.upload_images_to_database(
             extraction_result['database_records'])
+        if incremental:
+            placement_result = self._upload_known_placements(image_delta)
+            upload_result['success'] = upload_result['success'] and placement_result['success']
+            # Deletions and the manifest wait for a complete upload, so a failed run is retried
+            if upload_result['success']:
+                self._finish_incremental(manifest, image_delta, pdf_path, fingerprints,
+                                         page_delta, new_records)
 
         # Step 3: Get final statistics
         print("\n📋 Step 3: Getting final statistics...")
@@ -74,6 +137,143 @@ class FlexLinkImageProcessor:
 
         return result
 
+    def _stream_pdf_and_upload(self, pdf_path: str, save_local: bool, output_dir: str,
+                               queue_size: int) -> Dict[str, Any]:
+        """Run the streaming pipeline and summarise it like a batch run"""
+        print("\n📋 Streaming: extracting, filtering, saving and uploading concurrently...")
+        pipeline = FlexLinkImagePipeline(self.extractor, self.uploader, queue_size=queue_size)
+        extraction_result = pipeline.run(pdf_path, save_local=save_local, output_dir=output_dir)
+        upload_result = extraction_result['upload']
+
+        print("\n📋 Getting final statistics...")
+        final_stats = self.uploader.get_image_statistics()
+
+        result = {
+            'success': extraction_result['blueprint_images'] > 0 and upload_result['success'],
+            'extraction': extraction_result,
+            'upload': upload_result,
+            'final_stats': final_stats,
+            'summary': {
+                'total_images_extracted': extraction_result['total_images'],
+                'blueprint_images_extracted': extraction_result['blueprint_images'],
+                'images_uploaded': upload_result['success_count'],
+                'upload_errors': upload_result['error_count'],
+                'product_codes_found': extraction_result['product_codes'],
+                'component_types_found': extraction_result['component_types']
+            }
+        }
+
+        self._print_summary(result)
+
+        return result
+
+    def _image_records_by_page(self, database_records: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        """Group placement records by the page they are on"""
+        records = {}
+        for record in database_records:
+            for placement in record.get('placements') or [record]:
+                placement_record = self._placement_record(record['image_hash'], placement)
+                page_records = records.setdefault(placement_record['page_number'], [])
+                if any(page_record['key'] == placement_record['key'] for page_record in page_records):
+                    continue
+                page_records.append(placement_record)
+        return records
+
+    @staticmethod
+    def _placement_record(image_hash: str, placement: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Manifest record of one place an image is drawn at: its upsert key and placement row
+        (coordinates rounded like the DECIMAL(10,2) columns, so they match the stored rows)
+        """
+        x_coord, y_coord = placement_coordinate(placement['x_coord']), placement_coordinate(placement['y_coord'])
+        return {
+            'key': f"{image_hash}:{placement['page_number']}:{x_coord:.2f}:{y_coord:.2f}",
+            'image_hash': image_hash,
+            'page_number': placement['page_number'],
+            'x_coord': x_coord,
+            'y_coord': y_coord,
+            'width': placement_coordinate(placement['width']),
+            'height': placement_coordinate(placement['height']),
+            'associated_text': placement.get('associated_text', ''),
+            'product_code': placement.get('product_code', ''),
+            'component_type': placement.get('component_type', '')
+        }
+
+    def _plan_image_delta(self, manifest: CatalogManifest, page_delta,
+                          new_records: Dict[int, List[Dict[str, Any]]],
+                          extraction_result: Dict[str, Any], manifest_path: str) -> Dict[str, Any]:
+        """
+        Work out the placement delta: keep only images new to the database for upload,
+        queue new placements of images uploaded before, and list the placements (and
+        images left without any) that disappeared. Nothing is deleted yet.
+        """
+        image_delta = manifest.build_delta(page_delta, new_records)
+
+        # Images uploaded before only need their new placements; new ones go up whole,
+        # with every placement found on the reprocessed pages
+        uploaded_hashes = manifest.known_keys('image_hash')
+        upsert_hashes = {record['image_hash'] for record in image_delta['upsert']}
+        extraction_result['database_records'] = [
+            record for record in extraction_result.get('database_records', [])
+            if record['image_hash'] in upsert_hashes and record['image_hash'] not in uploaded_hashes]
+        image_delta['placements'] = [record for record in image_delta['upsert']
+                                     if record['image_hash'] in uploaded_hashes]
+
+        # Images still drawn somewhere stay; the others go with their stored files
+        remaining_hashes = upsert_hashes | {
+            record['image_hash'] for page_num in page_delta.unchanged
+            for record in manifest.pages[page_num]['records']}
+        image_delta['orphaned'] = sorted(uploaded_hashes - remaining_hashes)
+
+        delta_file = Path(manifest_path).parent / "image_delta.json"
+        delta_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(delta_file, 'w') as f:
+            json.dump({
+                'pages': {
+                    'added': page_delta.added,
+                    'changed': page_delta.changed,
+                    'removed': page_delta.removed,
+                    'unchanged': page_delta.unchanged,
+                    'moved': page_delta.moved
+                },
+                'upsert': image_delta['upsert'],
+                'delete': image_delta['delete'],
+                'orphaned': image_delta['orphaned']
+            }, f, indent=2)
+
+        print(f"📝 Image delta: {len(image_delta['upsert'])} placements to upsert "
+              f"({len(extraction_result['database_records'])} new images), "
+              f"{len(image_delta['delete'])} to delete, {len(image_delta['orphaned'])} images "
+              f"to remove -> {delta_file}")
+
+        return image_delta
+
+    def _finish_incremental(self, manifest: CatalogManifest, image_delta: Dict[str, Any],
+                            pdf_path: str, fingerprints: Dict[int, str], page_delta,
+                            new_records: Dict[int, List[Dict[str, Any]]]):
+        """
+        After a complete upload: delete what disappeared and record the edition. Any
+        failure leaves the manifest as it was, so the next run retries these pages.
+        """
+        removed = (not image_delta['delete'] or self.uploader.delete_placements(image_delta['delete']))
+        deleted = sum(1 for image_hash in image_delta['orphaned'] if self.uploader.delete_image(image_hash))
+        print(f"🗑️  Deleted {len(image_delta['delete'])} placements and {deleted} images")
+
+        if not removed or deleted < len(image_delta['orphaned']):
+            print("⚠️  Some deletions failed; page manifest not updated, rerun to retry")
+            return
+
+        manifest.update(compute_pdf_sha256(pdf_path), fingerprints, page_delta, new_records)
+        manifest.save()
+
+    def _upload_known_placements(self, image_delta: Dict[str, Any]) -> Dict[str, Any]:
+        """Upsert the new placements of images that are already in the database"""
+        if not image_delta['placements']:
+            return {'success': True, 'success_count': 0, 'error_count': 0}
+
+        print(f"📍 Uploading {len(image_delta['placements'])} placements of images already uploaded...")
+        return self.uploader.upload_placements(image_delta['placements'])
+
     def _print_summary(self, result: Dict[str, Any]):
         """Print a comprehensive summary of the processing results"""
         print("\n" + "="*60)
@@ -123,7 +323,8 @@ class FlexLinkImageProcessor:
         else:
             print("❌ Processing completed with errors")
 
-    def batch_process_pdfs(self, pdf_directory: str, save_local: bool = True) -> Dict[str, Any]:
+    def batch_process_pdfs(self, pdf_directory: str, save_local: bool = True,
+                           workers: int = 1, stream: bool = False) -> Dict[str, Any]:
         """Process multiple PDF files in a directory"""
         pdf_dir = Path(pdf_directory)
         if not pdf_dir.exists():
@@ -149,7 +350,9 @@ class FlexLinkImageProcessor:
                 result = self.process_pdf_and_upload(
                     str(pdf_file),
                     save_local=save_local,
-                    output_dir=f"extracted_images/{pdf_file.stem}"
+                    output_dir=f"extracted_images/{pdf_file.stem}",
+                    workers=workers,
+                    stream=stream
                 )
 
                 results.append({
@@ -261,9 +464,21 @@ def main():
                         help='Search only blueprint images')
     parser.add_argument('--stats', action='store_true',
                         help='Show database statistics')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of processes for page-range image extraction (default: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only reprocess pages changed since the previous run (uses page_manifest.json)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Upload images while extraction is still running (bounded memory)')
+    parser.add_argument('--queue-size', type=int, default=8,
+                        help='Images buffered between streaming stages (default: 8)')
 
     args = parser.parse_args()
 
+    if args.stream and (args.incremental or args.workers > 1):
+        parser.error("--stream runs a single extraction stage and can't be combined "
+                     "with --incremental or --workers")
+
     processor = FlexLinkImageProcessor()
 
     if args.stats:
@@ -287,7 +502,11 @@ def main():
         result = processor.process_pdf_and_upload(
             args.pdf,
             save_local=not args.no_save_local,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            incremental=args.incremental,
+            workers=args.workers,
+            stream=args.stream,
+            queue_size=args.queue_size
         )
 
         if result['success']:
@@ -299,7 +518,9 @@ def main():
         # Process multiple PDFs
         result = processor.batch_process_pdfs(
             args.directory,
-            save_local=not args.no_save_local
+            save_local=not args.no_save_local,
+            workers=args.workers,
+            stream=args.stream
         )
 
         if result['success']:
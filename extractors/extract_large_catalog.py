@@ -6,13 +6,18 @@ Optimized for processing 500+ page catalogs with progress tracking and duplicate
 
 import os
 import sys
+import json
 import time
 from pathlib import Path
 from typing import List, Dict, Any
+from dataclasses import asdict, replace
 from dotenv import load_dotenv
 
 # Import our component extractor
 from component_extractor import ComponentSpecificationExtractor, ComponentSpecification
+from catalog_manifest import CatalogManifest, PageDelta, DEFAULT_MANIFEST_PATH, compute_page_fingerprints
+from page_text_cache import compute_pdf_sha256
+from async_uploader import FlexLinkAsyncUploader, DEFAULT_MAX_IN_FLIGHT
 
 
 class LargeCatalogExtractor:
@@ -23,9 +28,12 @@ class LargeCatalogExtractor:
         self.processed_components = 0
         self.duplicate_components = 0
         self.failed_components = 0
+        self.max_in_flight = DEFAULT_MAX_IN_FLIGHT
+        self.requests_per_second = None  # No rate limit
 
     def extract_from_large_pdf(self, pdf_path: str, batch_size: int = 50,
-                               save_progress: bool = True) -> Dict[str, Any]:
+                               save_progress: bool = True, workers: int = 1,
+                               incremental: bool = False) -> Dict[str, Any]:
         """
         Extract components from a large PDF with progress tracking
 
@@ -33,16 +41,19 @@ class LargeCatalogExtractor:
             pdf_path: Path to the PDF file
             batch_size: Number of components to process before saving
             save_progress: Whether to save progress to intermediate files
+            workers: Number of processes for page-range text extraction
+            incremental: Only reprocess pages changed since the previous edition
         """
         print(f"📖 Processing large catalog: {pdf_path}")
         print(f"📊 Batch size: {batch_size} components")
+        print(f"⚙️  Workers: {workers}")
 
         # Check file size
         file_size = os.path.getsize(pdf_path) / (1024 * 1024)  # MB
         print(f"📁 File size: {file_size:.1f} MB")
 
-        # Create output directory
-        output_dir = Path("data/large_catalog_extraction")
+        # Create output directory (under the repository root, next to the shared page manifest)
+        output_dir = Path(DEFAULT_MANIFEST_PATH).parent
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Extract components
@@ -50,15 +61,44 @@ class LargeCatalogExtractor:
 
         try:
             # Extract all components
-            all_components = self.extractor.extract_from_pdf(pdf_path)
+            # Compare page fingerprints with the previous edition
+            pages = None
+            if incremental:
+                manifest = CatalogManifest(DEFAULT_MANIFEST_PATH, 'components')
+                fingerprints = compute_page_fingerprints(pdf_path)
+                page_delta = manifest.diff(fingerprints)
+                manifest.print_summary(page_delta)
+                pages = set(page_delta.reprocess)
+
+            all_components = self.extractor.extract_from_pdf(
+                pdf_path, workers=workers, pages=pages)
 
             print(f"✅ Extracted {len(all_components)} components from PDF")
 
+            if incremental:
+                # Moved pages are not re-extracted; their components are carried over from
+                # the previous run with the new page number
+                moved_records = manifest.moved_records(page_delta)
+                all_components = all_components + self._moved_components(
+                    output_dir, page_delta, moved_records)
+
             # Remove duplicates based on part_number and system_code
             unique_components = self._remove_duplicates(all_components)
             print(
                 f"🔄 Removed {len(all_components) - len(unique_components)} duplicates")
 
+            final_components = unique_components
+            if incremental:
+                new_records = self._component_records_by_page(all_components)
+                new_records.update(moved_records)
+                component_delta = manifest.build_delta(page_delta, new_records)
+                upsert_keys = {record['key'] for record in component_delta['upsert']}
+                unique_components = [component for component in unique_components
+                                     if self._get_component_key(component) in upsert_keys]
+                self._save_delta(output_dir, page_delta, unique_components, component_delta['delete'])
+                final_components = self._merge_with_previous(
+                    output_dir, unique_components, component_delta)
+
             # Process in batches
             results = self._process_batches(
                 unique_components, batch_size, output_dir, save_progress)
@@ -71,7 +111,23 @@ class LargeCatalogExtractor:
                 unique_components) / (processing_time / 60)
 
             # Save final results
-            self._save_final_results(unique_components, results, output_dir)
+            self._save_final_results(final_components, results, output_dir)
+
+            if incremental:
+                # Vanished components and the manifest wait for a complete upload, so a
+                # failed run reprocesses the same pages next time
+                complete = results['failed_batches'] == 0 and (
+                    not self.extractor.supabase
+                    or results['components_uploaded'] == results['total_components'])
+                if complete and self.extractor.supabase and component_delta['delete']:
+                    # Changed components are upserted in place; only vanished ones are removed
+                    complete = self.extractor.delete_from_database(component_delta['delete'])
+
+                if complete:
+                    manifest.update(compute_pdf_sha256(pdf_path), fingerprints, page_delta, new_records)
+                    manifest.save()
+                else:
+                    print("⚠️  Upload incomplete; page manifest not updated, rerun to retry these pages")
 
             return results
 
@@ -86,7 +142,7 @@ class LargeCatalogExtractor:
 
         for component in components:
             # Create a unique key based on part_number and system_code
-            key = f"{component.part_number}_{component.system_code}" if component.part_number else f"{component.component_name}_{component.system_code}"
+            key = self._get_component_key(component)
 
             if key not in seen:
                 seen.add(key)
@@ -96,10 +152,72 @@ class LargeCatalogExtractor:
 
         return unique_components
 
+    def _get_component_key(self, component: ComponentSpecification) -> str:
+        """Natural key used for duplicate removal and incremental deltas"""
+        return f"{component.part_number}_{component.system_code}" if component.part_number else f"{component.component_name}_{component.system_code}"
+
+    def _component_records_by_page(self, components: List[ComponentSpecification]) -> Dict[int, List[Dict[str, Any]]]:
+        """Group component identities by the page they were found on"""
+        records = {}
+        for component in components:
+            records.setdefault(component.page_reference, []).append({
+                'key': self._get_component_key(component),
+                'system_code': component.system_code,
+                'part_number': component.part_number,
+                'component_name': component.component_name
+            })
+        return records
+
+    def _load_previous(self, output_dir: Path) -> List[ComponentSpecification]:
+        """Components saved by the previous run (all_components.json)"""
+        previous_file = output_dir / "all_components.json"
+        if not previous_file.exists():
+            return []
+        with open(previous_file, 'r') as f:
+            return [ComponentSpecification(**data) for data in json.load(f)]
+
+    def _moved_components(self, output_dir: Path, page_delta: PageDelta,
+                          moved_records: Dict[int, List[Dict[str, Any]]]) -> List[ComponentSpecification]:
+        """Previous components of moved pages, referencing their new page number"""
+        previous = {self._get_component_key(component): component
+                    for component in self._load_previous(output_dir)}
+        moved = []
+        for page_num, records in sorted(moved_records.items()):
+            for record in records:
+                component = previous.get(record['key'])
+                if component is None:
+                    continue
+                if component.page_reference == page_delta.moved[page_num]:
+                    component = replace(component, page_reference=page_num)
+                moved.append(component)
+        return moved
+
+    def _merge_with_previous(self, output_dir: Path, upserts: List[ComponentSpecification],
+                             component_delta: Dict[str, List[Dict[str, Any]]]) -> List[ComponentSpecification]:
+        """Combine the previous all_components.json with this run's delta"""
+        previous = self._load_previous(output_dir)
+
+        replaced_keys = {record['key'] for record in component_delta['upsert'] + component_delta['delete']}
+        return [component for component in previous
+                if self._get_component_key(component) not in replaced_keys] + upserts
+
+    def _save_delta(self, output_dir: Path, page_delta: PageDelta,
+                    upserts: List[ComponentSpecification], deletes: List[Dict[str, Any]]):
+        """Write the component delta for this edition"""
+        delta_file = output_dir / "component_delta.json"
+        with open(delta_file, 'w') as f:
+            json.dump({
+                'pages': asdict(page_delta),
+                'upsert': [asdict(component) for component in upserts],
+                'delete': deletes
+            }, f, indent=2)
+
+        print(f"📝 Component delta: {len(upserts)} to upsert, {len(deletes)} to delete -> {delta_file}")
+
     def _process_batches(self, components: List[ComponentSpecification],
                          batch_size: int, output_dir: Path,
                          save_progress: bool) -> Dict[str, Any]:
-        """Process components in batches"""
+        """Save components in batches and upload the saved batches concurrently"""
         total_components = len(components)
         batches = [components[i:i + batch_size]
                    for i in range(0, total_components, batch_size)]
@@ -115,35 +233,56 @@ class LargeCatalogExtractor:
 
         print(f"📦 Processing {len(batches)} batches...")
 
-        for i, batch in enumerate(batches, 1):
-            print(
-                f"🔄 Processing batch {i}/{len(batches)} ({len(batch)} components)")
-
-            try:
-                # Save batch to JSON
-                batch_file = output_dir / f"batch_{i:03d}.json"
-                self.extractor.save_to_json(batch, str(batch_file))
-                results['components_saved'] += len(batch)
-
-                # Upload to database if available
-                if self.extractor.supabase:
-                    if self.extractor.upload_to_database(batch):
-                        results['components_uploaded'] += len(batch)
-                        print(f"✅ Uploaded batch {i} to database")
-                    else:
-                        print(f"⚠️  Failed to upload batch {i} to database")
-                        results['failed_batches'] += 1
-
-                results['successful_batches'] += 1
-
-                # Save progress
-                if save_progress:
-                    self._save_progress(results, output_dir)
-
-            except Exception as e:
-                print(f"❌ Error processing batch {i}: {e}")
+        def saved_batches():
+            """Save each batch to JSON as the uploader asks for it; failed saves are skipped"""
+            for i, batch in enumerate(batches, 1):
+                print(
+                    f"🔄 Processing batch {i}/{len(batches)} ({len(batch)} components)")
+
+                try:
+                    # Save batch to JSON
+                    batch_file = output_dir / f"batch_{i:03d}.json"
+                    self.extractor.save_to_json(batch, str(batch_file))
+                    results['components_saved'] += len(batch)
+                    results['successful_batches'] += 1
+
+                    # Save progress
+                    if save_progress:
+                        self._save_progress(results, output_dir)
+
+                except Exception as e:
+                    print(f"❌ Error processing batch {i}: {e}")
+                    results['failed_batches'] += 1
+                    self.failed_components += len(batch)
+                    continue
+
+                yield i, batch
+
+        # Upload to database if available
+        if not self.extractor.supabase:
+            for _batch in saved_batches():
+                pass
+            return results
+
+        def upload(numbered_batch) -> bool:
+            return self.extractor.upload_to_database(numbered_batch[1])
+
+        def on_result(_upload_number: int, numbered_batch, success: bool):
+            i, batch = numbered_batch
+            if success:
+                results['components_uploaded'] += len(batch)
+                print(f"✅ Uploaded batch {i} to database")
+            else:
+                print(f"⚠️  Failed to upload batch {i} to database")
                 results['failed_batches'] += 1
-                self.failed_components += len(batch)
+
+            if save_progress:
+                self._save_progress(results, output_dir)
+
+        uploader = FlexLinkAsyncUploader(
+            max_in_flight=self.max_in_flight,
+            requests_per_second=self.requests_per_second)
+        uploader.upload_batches(saved_batches(), upload, on_result)
 
         return results
 
@@ -213,8 +352,17 @@ def main():
                         help="Number of components to process per batch (default: 50)")
     parser.add_argument("--no-progress", action="store_true",
                         help="Don't save progress files")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes for page-range text extraction (default: 1)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only reprocess pages changed since the previous run (uses page_manifest.json)")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f"Number of batches uploaded concurrently (default: {DEFAULT_MAX_IN_FLIGHT})")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Maximum batch requests per second (default: no limit)")
     parser.add_argument("--clear-db", action="store_true",
-                        help="Clear existing database before extraction")
+                        help="Clear existing database before extraction (components are upserted, "
+                             "so this only matters to drop ones no longer in the catalog)")
 
     args = parser.parse_args()
 
@@ -238,12 +386,16 @@ def main():
     # Initialize extractor
     load_dotenv()
     extractor = LargeCatalogExtractor()
+    extractor.max_in_flight = args.max_in_flight
+    extractor.requests_per_second = args.rate
 
     # Extract components
     results = extractor.extract_from_large_pdf(
         args.pdf_file,
         batch_size=args.batch_size,
-        save_progress=not args.no_progress
+        save_progress=not args.no_progress,
+        workers=args.workers,
+        incremental=args.incremental
     )
 
     if 'error' in results:
@@ -6,12 +6,16 @@ This version works without Supabase connection for local extraction and saving.
 
 import os
 import sys
+import json
 import time
 from pathlib import Path
 from typing import List, Dict, Any
+from dataclasses import asdict, replace
 
 # Import our component extractor
 from component_extractor import ComponentSpecificationExtractor, ComponentSpecification
+from catalog_manifest import CatalogManifest, PageDelta, DEFAULT_MANIFEST_PATH, compute_page_fingerprints
+from page_text_cache import compute_pdf_sha256
 
 
 class OfflineLargeCatalogExtractor:
@@ -24,7 +28,8 @@ class OfflineLargeCatalogExtractor:
         self.failed_components = 0
 
     def extract_from_large_pdf(self, pdf_path: str, batch_size: int = 50,
-                               save_progress: bool = True) -> Dict[str, Any]:
+                               save_progress: bool = True, workers: int = 1,
+                               incremental: bool = False) -> Dict[str, Any]:
         """
         Extract components from a large PDF with progress tracking
 
@@ -32,16 +37,19 @@ class OfflineLargeCatalogExtractor:
             pdf_path: Path to the PDF file
             batch_size: Number of components to process before saving
             save_progress: Whether to save progress to intermediate files
+            workers: Number of processes for page-range text extraction
+            incremental: Only reprocess pages changed since the previous edition
         """
         print(f"📖 Processing large catalog: {pdf_path}")
         print(f"📊 Batch size: {batch_size} components")
+        print(f"⚙️  Workers: {workers}")
 
         # Check file size
         file_size = os.path.getsize(pdf_path) / (1024 * 1024)  # MB
         print(f"📁 File size: {file_size:.1f} MB")
 
-        # Create output directory
-        output_dir = Path("data/large_catalog_extraction")
+        # Create output directory (under the repository root, next to the shared page manifest)
+        output_dir = Path(DEFAULT_MANIFEST_PATH).parent
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Extract components
@@ -50,15 +58,44 @@ class OfflineLargeCatalogExtractor:
         try:
             print("🔄 Extracting components from PDF...")
             # Extract all components
-            all_components = self.extractor.extract_from_pdf(pdf_path)
+            # Compare page fingerprints with the previous edition
+            pages = None
+            if incremental:
+                manifest = CatalogManifest(DEFAULT_MANIFEST_PATH, 'components')
+                fingerprints = compute_page_fingerprints(pdf_path)
+                page_delta = manifest.diff(fingerprints)
+                manifest.print_summary(page_delta)
+                pages = set(page_delta.reprocess)
+
+            all_components = self.extractor.extract_from_pdf(
+                pdf_path, workers=workers, pages=pages)
 
             print(f"✅ Extracted {len(all_components)} components from PDF")
 
+            if incremental:
+                # Moved pages are not re-extracted; their components are carried over from
+                # the previous run with the new page number
+                moved_records = manifest.moved_records(page_delta)
+                all_components = all_components + self._moved_components(
+                    output_dir, page_delta, moved_records)
+
             # Remove duplicates based on part_number and system_code
             unique_components = self._remove_duplicates(all_components)
             print(
                 f"🔄 Removed {len(all_components) - len(unique_components)} duplicates")
 
+            final_components = unique_components
+            if incremental:
+                new_records = self._component_records_by_page(all_components)
+                new_records.update(moved_records)
+                component_delta = manifest.build_delta(page_delta, new_records)
+                upsert_keys = {record['key'] for record in component_delta['upsert']}
+                unique_components = [component for component in unique_components
+                                     if self._get_component_key(component) in upsert_keys]
+                self._save_delta(output_dir, page_delta, unique_components, component_delta['delete'])
+                final_components = self._merge_with_previous(
+                    output_dir, unique_components, component_delta)
+
             # Process in batches
             results = self._process_batches(
                 unique_components, batch_size, output_dir, save_progress)
@@ -71,7 +108,15 @@ class OfflineLargeCatalogExtractor:
                 unique_components) / (processing_time / 60)
 
             # Save final results
-            self._save_final_results(unique_components, results, output_dir)
+            self._save_final_results(final_components, results, output_dir)
+
+            if incremental:
+                # A batch that wasn't saved means these pages are processed again next time
+                if results['failed_batches'] == 0:
+                    manifest.update(compute_pdf_sha256(pdf_path), fingerprints, page_delta, new_records)
+                    manifest.save()
+                else:
+                    print("⚠️  Some batches were not saved; page manifest not updated, rerun to retry")
 
             return results
 
@@ -86,7 +131,7 @@ class OfflineLargeCatalogExtractor:
 
         for component in components:
             # Create a unique key based on part_number and system_code
-            key = f"{component.part_number}_{component.system_code}" if component.part_number else f"{component.component_name}_{component.system_code}"
+            key = self._get_component_key(component)
 
             if key not in seen:
                 seen.add(key)
@@ -96,6 +141,68 @@ class OfflineLargeCatalogExtractor:
 
         return unique_components
 
+    def _get_component_key(self, component: ComponentSpecification) -> str:
+        """Natural key used for duplicate removal and incremental deltas"""
+        return f"{component.part_number}_{component.system_code}" if component.part_number else f"{component.component_name}_{component.system_code}"
+
+    def _component_records_by_page(self, components: List[ComponentSpecification]) -> Dict[int, List[Dict[str, Any]]]:
+        """Group component identities by the page they were found on"""
+        records = {}
+        for component in components:
+            records.setdefault(component.page_reference, []).append({
+                'key': self._get_component_key(component),
+                'system_code': component.system_code,
+                'part_number': component.part_number,
+                'component_name': component.component_name
+            })
+        return records
+
+    def _load_previous(self, output_dir: Path) -> List[ComponentSpecification]:
+        """Components saved by the previous run (all_components.json)"""
+        previous_file = output_dir / "all_components.json"
+        if not previous_file.exists():
+            return []
+        with open(previous_file, 'r') as f:
+            return [ComponentSpecification(**data) for data in json.load(f)]
+
+    def _moved_components(self, output_dir: Path, page_delta: PageDelta,
+                          moved_records: Dict[int, List[Dict[str, Any]]]) -> List[ComponentSpecification]:
+        """Previous components of moved pages, referencing their new page number"""
+        previous = {self._get_component_key(component): component
+                    for component in self._load_previous(output_dir)}
+        moved = []
+        for page_num, records in sorted(moved_records.items()):
+            for record in records:
+                component = previous.get(record['key'])
+                if component is None:
+                    continue
+                if component.page_reference == page_delta.moved[page_num]:
+                    component = replace(component, page_reference=page_num)
+                moved.append(component)
+        return moved
+
+    def _merge_with_previous(self, output_dir: Path, upserts: List[ComponentSpecification],
+                             component_delta: Dict[str, List[Dict[str, Any]]]) -> List[ComponentSpecification]:
+        """Combine the previous all_components.json with this run's delta"""
+        previous = self._load_previous(output_dir)
+
+        replaced_keys = {record['key'] for record in component_delta['upsert'] + component_delta['delete']}
+        return [component for component in previous
+                if self._get_component_key(component) not in replaced_keys] + upserts
+
+    def _save_delta(self, output_dir: Path, page_delta: PageDelta,
+                    upserts: List[ComponentSpecification], deletes: List[Dict[str, Any]]):
+        """Write the component delta for this edition"""
+        delta_file = output_dir / "component_delta.json"
+        with open(delta_file, 'w') as f:
+            json.dump({
+                'pages': asdict(page_delta),
+                'upsert': [asdict(component) for component in upserts],
+                'delete': deletes
+            }, f, indent=2)
+
+        print(f"📝 Component delta: {len(upserts)} to upsert, {len(deletes)} to delete -> {delta_file}")
+
     def _process_batches(self, components: List[ComponentSpecification],
                          batch_size: int, output_dir: Path,
                          save_progress: bool) -> Dict[str, Any]:
@@ -207,6 +314,10 @@ def main():
                         help="Number of components to process per batch (default: 50)")
     parser.add_argument("--no-progress", action="store_true",
                         help="Don't save progress files")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes for page-range text extraction (default: 1)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only reprocess pages changed since the previous run (uses page_manifest.json)")
 
     args = parser.parse_args()
 
@@ -222,7 +333,9 @@ def main():
     results = extractor.extract_from_large_pdf(
         args.pdf_file,
         batch_size=args.batch_size,
-        save_progress=not args.no_progress
+        save_progress=not args.no_progress,
+        workers=args.workers,
+        incremental=args.incremental
     )
 
     if 'error' in results:
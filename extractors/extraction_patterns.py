@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+FlexLink Extraction Patterns
+Regex registry compiled once at import and shared by the component, enhanced-component and image extractors
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Pattern, Set, Tuple
+
+# System code patterns
+SYSTEM_PATTERNS: Dict[str, Pattern] = {
+    name: re.compile(pattern, re.IGNORECASE) for name, pattern in {
+        'x45': r'X45|X-45',
+        'xs': r'XS|X-S',
+        'x65': r'X65|X-65',
+        'x85': r'X85|X-85',
+        'xh': r'XH|X-H',
+        'xk': r'XK|X-K',
+        'x180': r'X180|X-180',
+        'x300': r'X300|X-300'
+    }.items()
+}
+
+# Specification patterns per component type
+COMPONENT_SPEC_PATTERNS: Dict[str, Dict[str, Pattern]] = {
+    component_type: {name: re.compile(pattern, re.IGNORECASE) for name, pattern in patterns.items()}
+    for component_type, patterns in {
+        'chain': {
+            'pitch': r'(\d+\.?\d*)\s*mm\s*pitch',
+            'width': r'(\d+\.?\d*)\s*mm\s*width',
+            'max_load': r'(\d+\.?\d*)\s*kg.*(?:per\s*link|maximum)',
+            'material': r'(steel|stainless steel|plastic|nylon)',
+            'type': r'(plain|cleated|steel top|side flexing)'
+        },
+        'sprocket': {
+            'teeth': r'(\d+)\s*teeth',
+            'bore': r'(\d+\.?\d*)\s*mm\s*bore',
+            'pitch': r'(\d+\.?\d*)\s*mm\s*pitch',
+            'material': r'(steel|stainless steel|plastic)',
+            'type': r'(drive|idler|tension)'
+        },
+        'bearing': {
+            'load_rating': r'(\d+\.?\d*)\s*kg.*load',
+            'bore': r'(\d+\.?\d*)\s*mm\s*bore',
+            'material': r'(steel|stainless steel|ceramic)',
+            'seals': r'(single|double|open)\s*(lip|contact)',
+            'type': r'(roller|ball|needle)'
+        },
+        'track': {
+            'width': r'(\d+\.?\d*)\s*mm\s*width',
+            'height': r'(\d+\.?\d*)\s*mm\s*height',
+            'material': r'(aluminum|steel|stainless steel)',
+            'profile': r'(standard|low profile|high profile)',
+            'length': r'(\d+\.?\d*)\s*m\s*length'
+        },
+        'drive_unit': {
+            'power': r'(\d+\.?\d*)\s*kW',
+            'voltage': r'(\d+\.?\d*)\s*V',
+            'speed': r'(\d+\.?\d*)\s*rpm',
+            'torque': r'(\d+\.?\d*)\s*Nm',
+            'type': r'(end|intermediate|center)'
+        },
+        'bend': {
+            'radius': r'(\d+\.?\d*)\s*mm\s*radius',
+            'angle': r'(\d+\.?\d*)\s*degrees?',
+            'type': r'(horizontal|vertical|spiral)',
+            'direction': r'(left|right|up|down)'
+        }
+    }.items()
+}
+
+# Part number labels such as "Part No:", "P/N:", "Article:"
+PART_NUMBER_PATTERNS: List[Pattern] = [
+    re.compile(pattern, re.IGNORECASE) for pattern in [
+        r'part\s*no\.?\s*:?\s*([A-Z0-9\-]+)',
+        r'p/n\s*:?\s*([A-Z0-9\-]+)',
+        r'article\s*:?\s*([A-Z0-9\-]+)',
+        r'item\s*:?\s*([A-Z0-9\-]+)'
+    ]
+]
+
+# Common dimension patterns
+DIMENSION_PATTERNS: Dict[str, Pattern] = {
+    name: re.compile(pattern, re.IGNORECASE) for name, pattern in {
+        'length': r'(\d+\.?\d*)\s*mm\s*(?:length|l)',
+        'width': r'(\d+\.?\d*)\s*mm\s*(?:width|w)',
+        'height': r'(\d+\.?\d*)\s*mm\s*(?:height|h)',
+        'diameter': r'(\d+\.?\d*)\s*mm\s*(?:diameter|d)',
+        'thickness': r'(\d+\.?\d*)\s*mm\s*(?:thickness|t)'
+    }.items()
+}
+
+# Common material keywords (lower case), keyed by material name
+MATERIAL_KEYWORDS: Dict[str, List[str]] = {
+    material.title(): [material] for material in [
+        'steel',
+        'stainless steel',
+        'aluminum',
+        'plastic',
+        'nylon',
+        'ceramic',
+        'brass',
+        'bronze'
+    ]
+}
+
+# System code keywords (lower case), same alternatives as SYSTEM_PATTERNS
+SYSTEM_KEYWORDS: Dict[str, List[str]] = {
+    name: pattern.pattern.lower().split('|') for name, pattern in SYSTEM_PATTERNS.items()
+}
+
+# Weight patterns
+WEIGHT_PATTERNS: List[Pattern] = [
+    re.compile(pattern, re.IGNORECASE) for pattern in [
+        r'(\d+\.?\d*)\s*kg',
+        r'(\d+\.?\d*)\s*g',
+        r'weight\s*:?\s*(\d+\.?\d*)\s*kg'
+    ]
+]
+
+# Price patterns
+PRICE_PATTERNS: List[Pattern] = [
+    re.compile(pattern, re.IGNORECASE) for pattern in [
+        r'(\d+\.?\d*)\s*€',
+        r'(\d+\.?\d*)\s*euro',
+        r'price\s*:?\s*(\d+\.?\d*)',
+        r'cost\s*:?\s*(\d+\.?\d*)'
+    ]
+]
+
+# System-level specification patterns (enhanced extractor)
+SYSTEM_SPEC_PATTERNS: Dict[str, Pattern] = {
+    name: re.compile(pattern, re.IGNORECASE) for name, pattern in {
+        'max_load': r'(\d+\.?\d*)\s*(?:kg|lb).*load',
+        'temperature': r'(\d+\.?\d*)\s*°C',
+        'speed': r'(\d+\.?\d*)\s*(?:m/min|ft/min)',
+        'pitch': r'(\d+\.?\d*)\s*mm\s*pitch'
+    }.items()
+}
+
+# Product code patterns (image extractor, matched against upper-cased text)
+PRODUCT_CODE_PATTERNS: List[Pattern] = [
+    re.compile(pattern) for pattern in [
+        r'\bX\d+\b',  # X45, X65, etc.
+        r'\bXS\b',    # XS series
+        r'\bXH\b',    # XH series
+        r'\b[0-9]{3,4}[A-Z]?\b',  # 3-4 digit codes
+        r'\b[A-Z]{1,3}\d{1,3}\b'  # Letter + number combinations
+    ]
+]
+
+# Component type patterns (image extractor, matched against lower-cased text)
+IMAGE_COMPONENT_PATTERNS: List[Pattern] = [
+    re.compile(pattern) for pattern in [
+        r'\bchain\b', r'\bsprocket\b', r'\bbearing\b', r'\broller\b',
+        r'\blink\b', r'\bdrive\b', r'\bmotor\b', r'\bgear\b',
+        r'\bwheel\b', r'\bplate\b', r'\bbracket\b', r'\bsupport\b',
+        r'\bguide\b', r'\btrack\b', r'\bcarrier\b', r'\battachment\b'
+    ]
+]
+
+
+class KeywordMatcher:
+    def __init__(self, vocabulary: Dict[str, Dict[str, List[str]]]):
+        """
+        Build a single-pass matcher over labelled keyword groups
+
+        Args:
+            vocabulary: category -> label -> keywords, e.g.
+                {'material': {'Steel': ['steel']}, 'flag': {'washable': ['washable', 'cleaning']}}
+                Labels keep their order so callers can ask for the first hit of a category.
+        """
+        self.label_order = {category: list(labels) for category, labels in vocabulary.items()}
+
+        keyword_labels: Dict[str, Set[Tuple[str, str]]] = {}
+        for category, labels in vocabulary.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    keyword_labels.setdefault(keyword, set()).add((category, label))
+
+        # The lookahead reports the longest keyword starting at each position; every
+        # shorter keyword that is a prefix of it matches there too
+        self.labels_at: Dict[str, Set[Tuple[str, str]]] = {
+            keyword: set().union(*(labels for other, labels in keyword_labels.items()
+                                   if keyword.startswith(other)))
+            for keyword in keyword_labels
+        }
+
+        self.pattern = None
+        if keyword_labels:
+            first_chars = ''.join(sorted({re.escape(keyword[0]) for keyword in keyword_labels}))
+            self.pattern = re.compile(
+                f'(?=(?=[{first_chars}])({self._trie_regex(list(keyword_labels))}))')
+
+    def _trie_regex(self, keywords: List[str]) -> str:
+        """Regex of the keywords as a character trie, so each position is tried in one walk"""
+        trie: Dict[str, Any] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node: Dict[str, Any]) -> str:
+            branches = [re.escape(char) + build(child)
+                        for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+
+            # Optional (greedy) continuation so the longest keyword wins
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            if '' in node:
+                return f"(?:{body})?" if len(branches) == 1 else f"{body}?"
+            return body
+
+        return build(trie)
+
+    def scan(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> Dict[str, Set[str]]:
+        """Find the labels of every keyword occurring in text[pos:endpos], grouped by category"""
+        hits: Dict[str, Set[str]] = {category: set() for category in self.label_order}
+        if self.pattern is None:
+            return hits
+
+        if endpos is None:
+            endpos = len(text)
+
+        for keyword in set(self.pattern.findall(text, pos, endpos)):
+            for category, label in self.labels_at[keyword]:
+                hits[category].add(label)
+
+        return hits
+
+    def first(self, hits: Dict[str, Set[str]], category: str) -> Optional[str]:
+        """First label of a category (in vocabulary order) that was hit"""
+        found = hits.get(category)
+        if found:
+            for label in self.label_order[category]:
+                if label in found:
+                    return label
+        return None
@@ -4,18 +4,29 @@ FlexLink Image Extractor Tool
 Extracts images (blueprint drawings) from FlexLink catalog PDFs
 """
 import os
-import re
 import json
 import base64
+import shutil
 import hashlib
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+import tempfile
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple, Set
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import io
+import numpy as np
 from PIL import Image
 import fitz  # PyMuPDF
 from dotenv import load_dotenv
 
+from extraction_patterns import PRODUCT_CODE_PATTERNS, IMAGE_COMPONENT_PATTERNS
+from span_index import SpanIndex
+from vector_regions import find_drawing_regions
+from image_store import LocalImageStore, make_thumbnails, THUMBNAIL_SIZES
+
+# Image stream filters whose data is a complete image file, by the format it is stored as
+NATIVE_IMAGE_FILTERS = {'/DCTDecode': 'jpeg', '/JPXDecode': 'jp2'}
+
 
 @dataclass
 class ExtractedImage:
@@ -30,6 +41,15 @@ class ExtractedImage:
     associated_text: str = ""
     product_code: str = ""
     component_type: str = ""
+    image_path: str = ""  # Set when a worker already wrote image_data to disk
+    is_blueprint: Optional[bool] = None  # Decided from the raw pixmap during extraction
+    quality_score: Optional[float] = None
+    xref: int = 0  # PDF object the image was decoded from
+    original_size: int = 0  # Bytes of the decoded pixmap
+    encoded_size: int = 0  # Bytes of image_data as encoded for storage
+    source: str = 'raster'  # 'raster' (embedded image) or 'vector' (rendered drawing region)
+    thumbnails: List[Dict[str, Any]] = field(default_factory=list)  # size, width, height, image_format, data
+    placements: List[Dict[str, Any]] = field(default_factory=list)  # Every page/bbox it is drawn at
 
 
 class FlexLinkImageExtractor:
@@ -50,21 +70,10 @@ class FlexLinkImageExtractor:
         ]
 
         # Product code patterns (FlexLink specific)
-        self.product_patterns = [
-            r'\bX\d+\b',  # X45, X65, etc.
-            r'\bXS\b',    # XS series
-            r'\bXH\b',    # XH series
-            r'\b[0-9]{3,4}[A-Z]?\b',  # 3-4 digit codes
-            r'\b[A-Z]{1,3}\d{1,3}\b'  # Letter + number combinations
-        ]
+        self.product_patterns = PRODUCT_CODE_PATTERNS
 
         # Component type patterns
-        self.component_patterns = [
-            r'\bchain\b', r'\bsprocket\b', r'\bbearing\b', r'\broller\b',
-            r'\blink\b', r'\bdrive\b', r'\bmotor\b', r'\bgear\b',
-            r'\bwheel\b', r'\bplate\b', r'\bbracket\b', r'\bsupport\b',
-            r'\bguide\b', r'\btrack\b', r'\bcarrier\b', r'\battachment\b'
-        ]
+        self.component_patterns = IMAGE_COMPONENT_PATTERNS
 
         # Quality thresholds
         self.min_image_size = 100  # Minimum width/height in pixels
@@ -72,8 +81,41 @@ class FlexLinkImageExtractor:
         self.min_aspect_ratio = 0.5  # Minimum aspect ratio
         self.max_aspect_ratio = 3.0  # Maximum aspect ratio
 
-    def extract_images_from_pdf(self, pdf_path: str) -> List[ExtractedImage]:
-        """Extract all images from PDF"""
+        # Scoring features
+        self.score_max_side = None  # Downsample images larger than this (pixels) before scoring
+        self.ink_threshold = 128  # Gray level below which a pixel counts as ink
+        self.edge_threshold = 32  # Gray step between neighbouring pixels that counts as an edge
+
+        # Storage encoding of kept images
+        self.output_encoding = 'compact'  # 'compact' (smallest lossless format for the content) or 'png'
+        self.webp_method = 4  # Lossless WebP effort, 0 (fast) to 6 (smallest)
+        self.passthrough_formats = ('jpeg',)  # Embedded streams stored as-is ('jp2' only displays in Safari)
+
+        # Vector drawings (paths, not embedded images): regions are rendered and scored like images
+        self.vector_dpi = 150  # Render resolution of drawing regions; 0 disables vector capture
+        self.vector_gap = 12.0  # Points between paths of the same drawing
+        self.vector_min_segments = 24  # Lines/curves/rects a region needs to count as a drawing
+        self.vector_min_size = 72.0  # Minimum region width/height in points
+
+        # Thumbnail pyramid for listing views (longest side in pixels; larger than the image is skipped)
+        self.thumbnail_sizes = THUMBNAIL_SIZES
+        self.thumbnail_format = 'webp'
+        self.thumbnail_quality = 80
+
+    def extract_images_from_pdf(self, pdf_path: str, pages: Optional[Set[int]] = None,
+                                workers: int = 1, spool_dir: Optional[str] = None) -> List[ExtractedImage]:
+        """
+        Extract all images from PDF, or only from the given 1-based page numbers
+
+        Args:
+            workers: Number of processes to extract page ranges with (1 = serial)
+            spool_dir: Directory workers write image files to; images then carry
+                image_path instead of image_data. Without it, the data is read back
+                into memory and the temporary files are removed.
+        """
+        if workers > 1:
+            return self._extract_images_parallel(pdf_path, pages, workers, spool_dir)
+
         images = []
 
         try:
@@ -81,16 +123,23 @@ class FlexLinkImageExtractor:
             print(f"📄 Processing PDF: {pdf_path}")
             print(f"📊 Total pages: {len(doc)}")
 
+            # Each xref is decoded, scored and hashed once per document
+            xref_cache: Dict[Any, Dict[str, Any]] = {}
+
             for page_num in range(len(doc)):
+                if pages is not None and page_num + 1 not in pages:
+                    continue
+
                 page = doc.load_page(page_num)
-                page_images = self._extract_images_from_page(page, page_num)
+                page_images = self._extract_images_from_page(page, page_num, xref_cache)
                 images.extend(page_images)
 
                 if page_num % 50 == 0 and page_num > 0:
                     print(f"📄 Processed {page_num + 1}/{len(doc)} pages...")
 
             doc.close()
-            print(f"✅ Extracted {len(images)} images from PDF")
+            images = self._merge_duplicates(images)
+            self._print_extracted(images)
 
         except Exception as e:
             print(f"❌ Error processing PDF: {e}")
@@ -98,90 +147,221 @@ class FlexLinkImageExtractor:
 
         return images
 
-    def _extract_images_from_page(self, page: fitz.Page, page_num: int) -> List[ExtractedImage]:
-        """Extract images from a single page"""
+    def iter_images(self, pdf_path: str, pages: Optional[Set[int]] = None) -> Iterator[ExtractedImage]:
+        """
+        Extract images page by page for streaming consumers
+
+        Yields the first occurrence of every image (rejected ones too, so they can be
+        filtered downstream). Further placements of a kept image are yielded as a copy
+        without image_data that carries only the new placements; the extractor does
+        not hold on to image bytes once they have been yielded.
+        """
+        xref_cache: Dict[Any, Dict[str, Any]] = {}
+        yielded: Set[Any] = set()
+        rejected: Set[Any] = set()
+        hash_owners: Dict[str, Any] = {}
+
+        doc = fitz.open(pdf_path)
+        try:
+            print(f"📄 Streaming PDF: {pdf_path}")
+            print(f"📊 Total pages: {len(doc)}")
+
+            for page_num in range(len(doc)):
+                if pages is not None and page_num + 1 not in pages:
+                    continue
+
+                page = doc.load_page(page_num)
+                self._extract_images_from_page(page, page_num, xref_cache)
+
+                # Images (and rendered drawings) that are new or were drawn again on this page
+                for xref, entry in list(xref_cache.items()):
+                    image = entry['image']
+                    if image is None:
+                        continue
+
+                    if not image.is_blueprint:
+                        if xref not in rejected:
+                            rejected.add(xref)
+                            yield replace(image, placements=list(image.placements))
+                        continue
+
+                    if xref not in yielded:
+                        yielded.add(xref)
+                        # Identical data under another xref only adds placements
+                        owner = hash_owners.setdefault(image.image_hash, xref)
+                        if owner == xref:
+                            yield replace(image, placements=list(image.placements))
+                        else:
+                            yield replace(image, image_data=b"", thumbnails=[], placements=list(image.placements))
+                    elif image.placements:
+                        yield replace(image, image_data=b"", thumbnails=[], placements=list(image.placements))
+                    else:
+                        continue
+
+                    image.image_data = b""
+                    image.thumbnails = []
+                    image.placements = []
+
+                if page_num % 50 == 0 and page_num > 0:
+                    print(f"📄 Processed {page_num + 1}/{len(doc)} pages...")
+        finally:
+            doc.close()
+
+    def _extract_images_parallel(self, pdf_path: str, pages: Optional[Set[int]],
+                                 workers: int, spool_dir: Optional[str]) -> List[ExtractedImage]:
+        """Extract images in page ranges across worker processes"""
+        try:
+            doc = fitz.open(pdf_path)
+            page_count = len(doc)
+            doc.close()
+        except Exception as e:
+            print(f"❌ Error processing PDF: {e}")
+            return []
+
+        page_indices = [page_num for page_num in range(page_count)
+                        if pages is None or page_num + 1 in pages]
+        if not page_indices:
+            return []
+
+        # Several small ranges per worker so progress is reported while they run
+        range_size = max(1, min(25, -(-len(page_indices) // (workers * 4))))
+        ranges = [page_indices[i:i + range_size] for i in range(0, len(page_indices), range_size)]
+
+        print(f"📄 Processing PDF: {pdf_path}")
+        print(f"📊 Total pages: {page_count}")
+        print(f"🔀 Extracting images from {len(page_indices)} pages in {len(ranges)} page ranges "
+              f"({workers} workers)")
+
+        temporary_spool = spool_dir is None
+        spool_dir = spool_dir or tempfile.mkdtemp(prefix="flexlink_images_")
+        os.makedirs(spool_dir, exist_ok=True)
+
+        images = []
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+                futures = [executor.submit(_extract_image_range, pdf_path, page_range, spool_dir)
+                           for page_range in ranges]
+                range_sizes = dict(zip(futures, map(len, ranges)))
+
+                pages_done = 0
+                for future in as_completed(futures):
+                    previous = pages_done
+                    pages_done += range_sizes[future]
+                    if pages_done // 50 > previous // 50:
+                        print(f"📄 Processed {pages_done}/{len(page_indices)} pages...")
+
+                # Results are collected in submission order, so images stay in page order
+                for future in futures:
+                    images.extend(future.result())
+
+            # Ranges have their own xref caches; fold repeats across ranges together
+            images = self._merge_duplicates(images)
+
+            if temporary_spool:
+                for image in images:
+                    image.image_data = self._read_image_data(image)
+                    image.image_path = ""
+
+            self._print_extracted(images)
+
+        except Exception as e:
+            print(f"❌ Error processing PDF: {e}")
+            return []
+
+        finally:
+            if temporary_spool:
+                shutil.rmtree(spool_dir, ignore_errors=True)
+
+        return images
+
+    def _print_extracted(self, images: List[ExtractedImage]):
+        """Report unique images and how often they are drawn"""
+        placements = sum(len(image.placements) or 1 for image in images)
+        print(f"✅ Extracted {len(images)} unique images ({placements} placements) from PDF")
+
+    def _read_image_data(self, image: ExtractedImage) -> bytes:
+        """Image bytes, read from the worker's file if they are not held in memory"""
+        if image.image_data or not image.image_path:
+            return image.image_data
+        with open(image.image_path, 'rb') as f:
+            return f.read()
+
+    def _extract_images_from_page(self, page: fitz.Page, page_num: int,
+                                  xref_cache: Optional[Dict[Any, Dict[str, Any]]] = None) -> List[ExtractedImage]:
+        """
+        Extract images from a single page
+
+        Args:
+            xref_cache: Per-document cache of decoded xrefs (and of rendered vector drawings,
+                keyed by pixel digest). An xref already in it is not decoded again; the
+                page only adds a placement to its image, which is returned from the page
+                it first appeared on.
+        """
         images = []
+        if xref_cache is None:
+            xref_cache = {}
 
         try:
             # Get image list from page - try different methods
             image_list = page.get_images()
 
+            # Text spans are indexed once per page, on the first image that needs them
+            span_index = None
+
             for img_index, img in enumerate(image_list):
                 try:
                     # Get image data
                     xref = img[0]
 
-                    # Try to get pixmap
-                    try:
-                        pix = fitz.Pixmap(page.parent, xref)
-                    except Exception as e:
-                        # Try alternative method for problematic images
-                        try:
-                            pix = fitz.Pixmap(
-                                page.parent, xref, page.parent.extract_image(xref)["image"])
-                        except:
-                            continue
-
-                    # Skip if image is too small
-                    if pix.width < self.min_image_size or pix.height < self.min_image_size:
+                    pix = None
+                    entry = xref_cache.get(xref)
+                    if entry is None:
+                        entry = {'features': None, 'image': None,
+                                 'native': self._native_format(page.parent, xref)}
+                        xref_cache[xref] = entry
+
+                        if entry['native'] is not None:
+                            # Embedded JPEG: scored from its own stream, never rendered to a pixmap
+                            try:
+                                entry['features'] = self._native_features(page.parent, xref)
+                            except Exception:
+                                entry['native'] = None
+
+                        if entry['native'] is None:
+                            pix = self._load_pixmap(page.parent, xref)
+
+                        # Skip if image is too small; read the raw samples for scoring
+                        if pix is not None and pix.width >= self.min_image_size and pix.height >= self.min_image_size:
+                            try:
+                                entry['features'] = self._pixel_features(
+                                    self._pixmap_gray(pix), pix.width, pix.height)
+                            except Exception:
+                                pass
+
+                    if entry['features'] is None:
                         pix = None
                         continue
 
-                    # Convert to PIL Image for processing
-                    try:
-                        img_data = pix.tobytes("png")
-                        pil_image = Image.open(io.BytesIO(img_data))
-                    except Exception as e:
-                        # Try alternative format if PNG fails
-                        try:
-                            img_data = pix.tobytes("jpeg")
-                            pil_image = Image.open(io.BytesIO(img_data))
-                        except:
-                            pix = None
-                            continue
-
                     # Get image coordinates and dimensions
                     try:
                         img_rect = page.get_image_bbox(img)
-                        x_coord = img_rect.x0
-                        y_coord = img_rect.y0
-                        width = img_rect.width
-                        height = img_rect.height
                     except:
                         # Use default coordinates if bbox not available
-                        x_coord = 0
-                        y_coord = 0
-                        width = pix.width
-                        height = pix.height
-
-                    # Generate hash
-                    image_hash = hashlib.md5(img_data).hexdigest()
+                        img_rect = fitz.Rect(0, 0, entry['features']['pixel_width'],
+                                             entry['features']['pixel_height'])
 
                     # Get surrounding text
-                    associated_text = self._get_surrounding_text(
-                        page, img_rect if 'img_rect' in locals() else fitz.Rect(0, 0, width, height))
-
-                    # Extract product and component information
-                    product_code = self._extract_product_code(associated_text)
-                    component_type = self._extract_component_type(
-                        associated_text)
-
-                    # Create ExtractedImage object
-                    extracted_image = ExtractedImage(
-                        image_data=img_data,
-                        image_hash=image_hash,
-                        page_number=page_num + 1,
-                        x_coord=x_coord,
-                        y_coord=y_coord,
-                        width=width,
-                        height=height,
-                        image_format='png',
-                        associated_text=associated_text,
-                        product_code=product_code,
-                        component_type=component_type
-                    )
-
-                    images.append(extracted_image)
+                    if span_index is None:
+                        span_index = SpanIndex(page)
+                    placement = self._make_placement(page, page_num, img_rect, span_index)
+
+                    extracted_image = self._add_placement(
+                        entry, placement,
+                        lambda: self._encode_xref(page.parent, xref, entry['native'], pix),
+                        lambda: self._source_hash(page.parent, xref),
+                        xref=xref)
+                    if extracted_image is not None:
+                        images.append(extracted_image)
 
                     # Clean up
                     pix = None
@@ -192,31 +372,424 @@ class FlexLinkImageExtractor:
                         f"⚠️ Error processing image {img_index} on page {page_num + 1}: {e}")
                     continue
 
+            # Vector drawings never show up in get_images()
+            if self.vector_dpi:
+                images.extend(self._extract_vector_regions(page, page_num, xref_cache, span_index))
+
         except Exception as e:
             print(f"❌ Error processing page {page_num + 1}: {e}")
 
         return images
 
-    def _get_surrounding_text(self, page: fitz.Page, img_rect: fitz.Rect) -> str:
+    def _extract_vector_regions(self, page: fitz.Page, page_num: int, xref_cache: Dict[Any, Dict[str, Any]],
+                                span_index: Optional[SpanIndex] = None) -> List[ExtractedImage]:
+        """
+        Render the vector drawing regions of a page once each and score them like images
+
+        Renders are cached by the digest of their pixels, so a drawing repeated on
+        other pages only adds placements.
+        """
+        images = []
+        try:
+            regions = find_drawing_regions(
+                page, gap=self.vector_gap, min_segments=self.vector_min_segments,
+                min_size=self.vector_min_size,
+                exclude=[info['bbox'] for info in page.get_image_info()])
+        except Exception as e:
+            print(f"⚠️ Error finding vector drawings on page {page_num + 1}: {e}")
+            return images
+
+        for region in regions:
+            try:
+                # Dimension labels are text, usually just outside the paths
+                region = (region + (-self.vector_gap, -self.vector_gap, self.vector_gap, self.vector_gap)) & page.rect
+                pix = page.get_pixmap(clip=region, dpi=self.vector_dpi)
+                pixel_hash = hashlib.md5(pix.samples_mv).hexdigest()
+                key = ('vector', pixel_hash)
+                entry = xref_cache.get(key)
+                if entry is None:
+                    entry = {'features': None, 'image': None, 'native': None}
+                    xref_cache[key] = entry
+                    if pix.width >= self.min_image_size and pix.height >= self.min_image_size:
+                        entry['features'] = self._pixel_features(self._pixmap_gray(pix), pix.width, pix.height)
+
+                if entry['features'] is None:
+                    continue
+
+                if span_index is None:
+                    span_index = SpanIndex(page)
+                placement = self._make_placement(page, page_num, region, span_index)
+
+                extracted_image = self._add_placement(entry, placement, lambda: self._encode_kept(pix),
+                                                      lambda: pixel_hash, source='vector')
+                if extracted_image is not None:
+                    images.append(extracted_image)
+
+            except Exception as e:
+                print(f"⚠️ Error rendering vector drawing on page {page_num + 1}: {e}")
+                continue
+
+        return images
+
+    def _make_placement(self, page: fitz.Page, page_num: int, rect: fitz.Rect,
+                        span_index: SpanIndex) -> Dict[str, Any]:
+        """Page, bbox and surrounding text of one place an image is drawn at"""
+        associated_text = self._get_surrounding_text(page, rect, span_index)
+        return {
+            'page_number': page_num + 1,
+            'x_coord': rect.x0,
+            'y_coord': rect.y0,
+            'width': rect.width,
+            'height': rect.height,
+            'associated_text': associated_text,
+            'product_code': self._extract_product_code(associated_text),
+            'component_type': self._extract_component_type(associated_text)
+        }
+
+    def _add_placement(self, entry: Dict[str, Any], placement: Dict[str, Any],
+                       encode: Callable[[], Optional[Tuple[bytes, str, int, List[Dict[str, Any]]]]],
+                       source_hash: Callable[[], str],
+                       xref: int = 0, source: str = 'raster') -> Optional[ExtractedImage]:
+        """
+        Score a placement of a cached image and record it
+
+        Returns a new ExtractedImage on the image's first placement; later placements are
+        appended to it. encode and source_hash are only called (once) when the image is
+        first kept. The image hash comes from source_hash, not from the encoded bytes, so
+        it stays the same whatever encoding the image is stored in.
+        """
+        # The text part of the score depends on the placement
+        scores = self._score_features(entry['features'], placement['associated_text'])
+        is_blueprint = scores['blueprint_score'] >= self.quality_threshold
+
+        extracted_image = entry['image']
+        if extracted_image is not None and (extracted_image.is_blueprint or not is_blueprint):
+            # Seen before: only record where else it is drawn
+            extracted_image.placements.append(placement)
+            return None
+
+        # Only blueprint drawings are encoded and hashed, once per image
+        img_data = b""
+        image_hash = ""
+        image_format = 'png'
+        original_size = encoded_size = 0
+        thumbnails = []
+        if is_blueprint:
+            encoded = encode()
+            if encoded is None:
+                return None
+            img_data, image_format, original_size, thumbnails = encoded
+            image_hash = source_hash() or hashlib.md5(img_data).hexdigest()
+            encoded_size = len(img_data)
+
+        if extracted_image is not None:
+            # A later placement qualifies: keep the image, described by that placement
+            extracted_image.image_data = img_data
+            extracted_image.image_hash = image_hash
+            extracted_image.image_format = image_format
+            extracted_image.original_size = original_size
+            extracted_image.encoded_size = encoded_size
+            extracted_image.thumbnails = thumbnails
+            extracted_image.is_blueprint = True
+            extracted_image.quality_score = scores['quality_score']
+            self._set_primary_placement(extracted_image, placement)
+            extracted_image.placements.append(placement)
+            return None
+
+        # Create ExtractedImage object
+        extracted_image = ExtractedImage(
+            image_data=img_data,
+            image_hash=image_hash,
+            page_number=placement['page_number'],
+            x_coord=placement['x_coord'],
+            y_coord=placement['y_coord'],
+            width=placement['width'],
+            height=placement['height'],
+            image_format=image_format,
+            associated_text=placement['associated_text'],
+            product_code=placement['product_code'],
+            component_type=placement['component_type'],
+            is_blueprint=is_blueprint,
+            quality_score=scores['quality_score'],
+            xref=xref,
+            original_size=original_size,
+            encoded_size=encoded_size,
+            thumbnails=thumbnails,
+            placements=[placement],
+            source=source
+        )
+
+        entry['image'] = extracted_image
+        return extracted_image
+
+    def _encode_xref(self, doc: fitz.Document, xref: int, native: Optional[str],
+                     pix: Optional[fitz.Pixmap]) -> Optional[Tuple[bytes, str, int, List[Dict[str, Any]]]]:
+        """Stored form of a kept xref: its own stream if it passes through, else the encoded pixmap"""
+        if native is not None:
+            return self._passthrough(doc, xref, native)
+        if pix is None:
+            pix = self._load_pixmap(doc, xref)
+        return self._encode_kept(pix) if pix is not None else None
+
+    def _source_hash(self, doc: fitz.Document, xref: int) -> str:
+        """Hash of an embedded image: digest of its raw stream and soft mask, or '' without a stream"""
+        data = doc.xref_stream_raw(xref)
+        if not data:
+            return ""
+        digest = hashlib.md5(data)
+        kind, value = doc.xref_get_key(xref, "SMask")
+        if kind == 'xref':
+            digest.update(doc.xref_stream_raw(int(value.split()[0])) or b'')
+        return digest.hexdigest()
+
+    def _encode_kept(self, pix: fitz.Pixmap) -> Optional[Tuple[bytes, str, int, List[Dict[str, Any]]]]:
+        """Encoded pixmap of a kept image; returns (data, image_format, original_size, thumbnails)"""
+        encoded = self._encode_pixmap(pix)
+        if encoded is None:
+            return None
+        img_data, image_format = encoded
+        return img_data, image_format, pix.stride * pix.height, self._make_thumbnails(pix)
+
+    def _load_pixmap(self, doc: fitz.Document, xref: int) -> Optional[fitz.Pixmap]:
+        """Decode an image xref, or None if it can't be decoded"""
+        try:
+            return fitz.Pixmap(doc, xref)
+        except Exception:
+            # Try alternative method for problematic images
+            try:
+                return fitz.Pixmap(doc, xref, doc.extract_image(xref)["image"])
+            except:
+                return None
+
+    def _native_format(self, doc: fitz.Document, xref: int) -> Optional[str]:
+        """Format an embedded image stream can be stored in as-is, or None if it must be re-encoded"""
+        if not self.passthrough_formats:
+            return None
+
+        kind, value = doc.xref_get_key(xref, "Filter")
+        image_format = NATIVE_IMAGE_FILTERS.get(value) if kind == 'name' else None
+        if image_format not in self.passthrough_formats:
+            return None
+
+        # Masks and decode arrays are applied when the page is drawn, not stored in the stream
+        if any(doc.xref_get_key(xref, key)[0] != 'null' for key in ('SMask', 'Mask', 'Decode')):
+            return None
+        if doc.xref_get_key(xref, "ImageMask")[1] == 'true':
+            return None
+        return image_format
+
+    def _open_native(self, doc: fitz.Document, xref: int) -> Tuple[bytes, Image.Image]:
+        """Raw stream of a passthrough image and a lazy PIL handle on it (nothing decoded yet)"""
+        data = doc.xref_stream_raw(xref)
+        image = Image.open(io.BytesIO(data))
+        if image.mode not in ('L', 'RGB'):
+            # CMYK JPEGs are often stored inverted, which browsers don't undo
+            raise ValueError(f"Unsupported passthrough mode: {image.mode}")
+        return data, image
+
+    def _native_features(self, doc: fitz.Document, xref: int) -> Optional[Dict[str, float]]:
+        """Scoring features of a passthrough image, or None if it is too small"""
+        _data, image = self._open_native(doc, xref)
+        width, height = image.size
+        if width < self.min_image_size or height < self.min_image_size:
+            return None
+
+        if self.score_max_side and max(width, height) > self.score_max_side:
+            # JPEG decodes straight to gray at 1/2, 1/4 or 1/8 scale for a fraction of the cost
+            image.draft('L', (self.score_max_side, self.score_max_side))
+        gray = image.convert('L')
+        step = self._score_step(*gray.size)
+        return self._pixel_features(np.asarray(gray)[::step, ::step], width, height)
+
+    def _passthrough(self, doc: fitz.Document, xref: int,
+                     image_format: str) -> Tuple[bytes, str, int, List[Dict[str, Any]]]:
+        """Original bytes of a kept passthrough image; returns (data, image_format, original_size, thumbnails)"""
+        data, image = self._open_native(doc, xref)
+        original_size = image.width * image.height * len(image.getbands())
+
+        try:
+            if self.thumbnail_sizes:
+                size = max(self.thumbnail_sizes)
+                image.draft(image.mode, (size, size))
+            thumbnails = make_thumbnails(image, self.thumbnail_sizes,
+                                         self.thumbnail_format, self.thumbnail_quality)
+        except Exception as e:
+            print(f"⚠️ Error creating thumbnails: {e}")
+            thumbnails = []
+
+        return data, image_format, original_size, thumbnails
+
+    def _set_primary_placement(self, image: ExtractedImage, placement: Dict[str, Any]):
+        """Describe an image by one of its placements"""
+        for key in ('page_number', 'x_coord', 'y_coord', 'width', 'height',
+                    'associated_text', 'product_code', 'component_type'):
+            setattr(image, key, placement[key])
+
+    def _merge_duplicates(self, images: List[ExtractedImage]) -> List[ExtractedImage]:
+        """
+        Fold images of the same xref (split across page ranges) or with the same
+        content hash (identical data under different xrefs) into one image
+        """
+        merged: List[ExtractedImage] = []
+        positions: Dict[Tuple[str, Any], int] = {}
+
+        for image in images:
+            keys = [('xref', image.xref)] if image.xref else []
+            if image.image_hash:
+                keys.append(('hash', image.image_hash))
+
+            index = next((positions[key] for key in keys if key in positions), None)
+            if index is None:
+                index = len(merged)
+                merged.append(image)
+            else:
+                base = merged[index]
+                if image.is_blueprint and not base.is_blueprint:
+                    # The kept copy describes the image; placements stay in page order
+                    image.placements = base.placements + image.placements
+                    merged[index] = image
+                else:
+                    base.placements.extend(image.placements)
+
+            for key in keys:
+                positions[key] = index
+
+        return merged
+
+    def _pixmap_image(self, pix: fitz.Pixmap) -> Image.Image:
+        """PIL view of the pixmap samples (shares memory with pix where PIL allows)"""
+        modes = {(1, 0): 'L', (2, 1): 'LA', (3, 0): 'RGB', (4, 1): 'RGBA', (4, 0): 'CMYK'}
+        mode = modes.get((pix.n, pix.alpha))
+        if mode is None:
+            raise ValueError(f"Unsupported pixmap layout: n={pix.n}, alpha={pix.alpha}")
+
+        return Image.frombuffer(mode, (pix.width, pix.height), pix.samples_mv,
+                                'raw', mode, pix.stride, 1)
+
+    def _pixmap_gray(self, pix: fitz.Pixmap) -> np.ndarray:
+        """Grayscale array read straight from the pixmap samples (downsampled first if configured)"""
+        step = self._score_step(pix.width, pix.height)
+        colors = pix.n - pix.alpha
+        if colors not in (1, 3):
+            # CMYK and other layouts go through PIL's conversion
+            return np.asarray(self._pixmap_image(pix).convert('L'))[::step, ::step]
+
+        samples = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)
+        pixels = samples[::step, :pix.width * pix.n].reshape(-1, pix.width, pix.n)[:, ::step]
+        if colors == 1:
+            return pixels[:, :, 0]
+
+        # Same integer luma as PIL's RGB -> L conversion
+        rgb = pixels[:, :, :3].astype(np.uint32)
+        return ((rgb[:, :, 0] * 19595 + rgb[:, :, 1] * 38470 + rgb[:, :, 2] * 7471 + 0x8000)
+                >> 16).astype(np.uint8)
+
+    def _score_step(self, width: int, height: int) -> int:
+        """Pixel stride that keeps the longest side within score_max_side"""
+        if not self.score_max_side or max(width, height) <= self.score_max_side:
+            return 1
+        return -(-max(width, height) // self.score_max_side)
+
+    def _encode_pixmap(self, pix: fitz.Pixmap) -> Optional[Tuple[bytes, str]]:
+        """Encode a kept pixmap for storage; returns (data, image_format)"""
+        if self.output_encoding == 'compact':
+            try:
+                return self._encode_compact(pix)
+            except Exception:
+                pass
+
+        try:
+            return pix.tobytes("png"), 'png'
+        except Exception:
+            # Try alternative format if PNG fails
+            try:
+                return pix.tobytes("jpeg"), 'jpeg'
+            except Exception:
+                return None
+
+    def _encode_compact(self, pix: fitz.Pixmap) -> Tuple[bytes, str]:
+        """
+        Smallest lossless encoding for the content of a pixmap
+
+        Drawings are often stored as RGB although they are gray or black and white:
+        bilevel content becomes a 1-bit PNG, gray content an 8-bit gray PNG or lossless
+        WebP, content with at most 256 colours a palette PNG or lossless WebP, and
+        anything else lossless WebP.
+        """
+        image = self._pixmap_image(pix)
+        if image.mode == 'CMYK':
+            image = image.convert('RGB')
+
+        candidates: List[Tuple[Image.Image, str, Dict[str, Any]]] = []
+        webp = {'lossless': True, 'exact': True, 'method': self.webp_method}
+
+        if image.mode == 'RGB':
+            pixels = np.asarray(image)
+            if np.array_equal(pixels[:, :, 0], pixels[:, :, 1]) and np.array_equal(pixels[:, :, 1], pixels[:, :, 2]):
+                image = Image.fromarray(np.ascontiguousarray(pixels[:, :, 0]), 'L')
+
+        if image.mode == 'L':
+            levels = image.getcolors(2)
+            if levels is not None and {value for _count, value in levels} <= {0, 255}:
+                candidates.append((image.convert('1'), 'png', {'optimize': True}))
+            else:
+                candidates.append((image, 'png', {'optimize': True}))
+                candidates.append((image, 'webp', webp))
+        elif image.mode == 'RGB':
+            palette_image = self._palette_image(image)
+            if palette_image is not None:
+                candidates.append((palette_image, 'png', {'optimize': True}))
+            candidates.append((image, 'webp', webp))
+        else:
+            # Alpha channel: only WebP keeps it losslessly at a useful size
+            candidates.append((image, 'webp', webp))
+
+        best = None
+        for candidate, image_format, options in candidates:
+            buffer = io.BytesIO()
+            candidate.save(buffer, image_format.upper(), **options)
+            if best is None or buffer.tell() < len(best[0]):
+                best = (buffer.getvalue(), image_format)
+
+        return best
+
+    def _palette_image(self, image: Image.Image) -> Optional[Image.Image]:
+        """Exact palette version of an RGB image with at most 256 colours"""
+        colors = image.getcolors(256)
+        if colors is None:
+            return None
+
+        pixels = np.asarray(image).astype(np.uint32)
+        keys = (pixels[:, :, 0] << 16) | (pixels[:, :, 1] << 8) | pixels[:, :, 2]
+        palette = np.array(sorted((r << 16) | (g << 8) | b for _count, (r, g, b) in colors), dtype=np.uint32)
+
+        palette_image = Image.fromarray(np.searchsorted(palette, keys).astype(np.uint8), 'P')
+        palette_image.putpalette(
+            np.stack([palette >> 16, (palette >> 8) & 0xFF, palette & 0xFF], axis=1).astype(np.uint8).tobytes())
+        return palette_image
+
+    def _make_thumbnails(self, pix: fitz.Pixmap) -> List[Dict[str, Any]]:
+        """Thumbnail pyramid of a kept image, from its decoded pixmap"""
+        try:
+            return make_thumbnails(self._pixmap_image(pix), self.thumbnail_sizes,
+                                   self.thumbnail_format, self.thumbnail_quality)
+        except Exception as e:
+            print(f"⚠️ Error creating thumbnails: {e}")
+            return []
+
+    def _get_surrounding_text(self, page: fitz.Page, img_rect: fitz.Rect,
+                              span_index: Optional[SpanIndex] = None) -> str:
         """Extract text surrounding the image"""
         try:
             # Expand the rectangle to capture more surrounding text
             # Add 50 points in each direction
             expanded_rect = img_rect + (50, 50, 50, 50)
 
-            # Get text blocks in the expanded area
-            text_blocks = page.get_text("dict")["blocks"]
-            surrounding_text = []
-
-            for block in text_blocks:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            span_rect = fitz.Rect(span["bbox"])
-                            if span_rect.intersects(expanded_rect):
-                                surrounding_text.append(span["text"])
+            # Get text spans in the expanded area
+            if span_index is None:
+                span_index = SpanIndex(page)
 
-            return " ".join(surrounding_text)
+            return " ".join(span_index.query(expanded_rect))
 
         except Exception as e:
             print(f"⚠️ Error extracting surrounding text: {e}")
@@ -227,7 +800,7 @@ class FlexLinkImageExtractor:
         text_upper = text.upper()
 
         for pattern in self.product_patterns:
-            matches = re.findall(pattern, text_upper)
+            matches = pattern.findall(text_upper)
             if matches:
                 return matches[0]
 
@@ -238,8 +811,9 @@ class FlexLinkImageExtractor:
         text_lower = text.lower()
 
         for pattern in self.component_patterns:
-            if re.search(pattern, text_lower):
-                return re.search(pattern, text_lower).group()
+            match = pattern.search(text_lower)
+            if match:
+                return match.group()
 
         return ""
 
@@ -249,11 +823,19 @@ class FlexLinkImageExtractor:
 
         for image in images:
             try:
+                # Already scored from the raw pixmap during extraction
+                if image.is_blueprint is not None:
+                    if image.is_blueprint:
+                        blueprint_images.append(image)
+                    continue
+
                 # Convert image data to PIL Image
-                pil_image = Image.open(io.BytesIO(image.image_data))
+                pil_image = Image.open(io.BytesIO(self._read_image_data(image)))
 
                 # Check if it's likely a blueprint drawing
-                if self._is_blueprint_drawing(pil_image, image.associated_text):
+                scores = self._score_pil_image(pil_image, image.associated_text)
+                image.quality_score = scores['quality_score']
+                if scores['blueprint_score'] >= self.quality_threshold:
                     blueprint_images.append(image)
 
             except Exception as e:
@@ -266,62 +848,104 @@ class FlexLinkImageExtractor:
     def _is_blueprint_drawing(self, image: Image.Image, associated_text: str) -> bool:
         """Determine if an image is likely a blueprint drawing"""
         try:
-            # Convert to grayscale for analysis
-            gray_image = image.convert('L')
-
-            # Calculate image properties
-            width, height = gray_image.size
-            aspect_ratio = width / height if height > 0 else 0
-
-            # Check aspect ratio (blueprints are often rectangular)
-            if aspect_ratio < self.min_aspect_ratio or aspect_ratio > self.max_aspect_ratio:
-                return False
-
-            # Calculate brightness and contrast
-            pixels = list(gray_image.getdata())
-            avg_brightness = sum(pixels) / len(pixels)
-
-            # Calculate contrast (standard deviation)
-            variance = sum((p - avg_brightness) **
-                           2 for p in pixels) / len(pixels)
-            contrast = variance ** 0.5
-
-            # Check for technical text indicators
-            text_score = 0
-            text_lower = associated_text.lower()
-            for term in self.technical_terms:
-                if term in text_lower:
-                    text_score += 1
-
-            # Calculate overall blueprint score
-            brightness_score = 1.0 if 50 <= avg_brightness <= 200 else 0.5
-            contrast_score = 1.0 if contrast > 30 else 0.5
-            text_score = min(text_score / 3, 1.0)  # Normalize text score
-
-            blueprint_score = (brightness_score +
-                               contrast_score + text_score) / 3
-
-            return blueprint_score >= self.quality_threshold
+            scores = self._score_pil_image(image, associated_text)
+            return scores['blueprint_score'] >= self.quality_threshold
 
         except Exception as e:
             print(f"⚠️ Error in blueprint detection: {e}")
             return False
 
+    def _score_pil_image(self, image: Image.Image, associated_text: str) -> Dict[str, float]:
+        """Score a decoded image"""
+        # Convert to grayscale for analysis
+        width, height = image.size
+        step = self._score_step(width, height)
+        gray = np.asarray(image.convert('L'))[::step, ::step]
+
+        return self._score_image(gray, width, height, associated_text)
+
+    def _score_image(self, gray: np.ndarray, width: int, height: int,
+                     associated_text: str) -> Dict[str, float]:
+        """
+        Vectorised blueprint scoring of a grayscale array
+
+        Returns the brightness/contrast/ink/edge features, the blueprint_score the
+        filter thresholds on, and the quality_score stored with kept images (the
+        blueprint score with the line-art features folded in).
+        """
+        return self._score_features(self._pixel_features(gray, width, height), associated_text)
+
+    def _pixel_features(self, gray: np.ndarray, width: int, height: int) -> Dict[str, float]:
+        """Features of the pixels alone, shared by every placement of an image"""
+        # Calculate image properties (of the full-size image)
+        aspect_ratio = width / height if height > 0 else 0
+        features = {'pixel_width': width, 'pixel_height': height,
+                    'aspect_ok': self.min_aspect_ratio <= aspect_ratio <= self.max_aspect_ratio}
+
+        # Check aspect ratio (blueprints are often rectangular)
+        if not features['aspect_ok']:
+            return features
+
+        # Calculate brightness and contrast (standard deviation)
+        features['brightness'] = float(gray.mean())
+        features['contrast'] = float(gray.std())
+
+        # Line-art features: share of dark pixels and of sharp neighbour steps
+        features['ink_coverage'] = float((gray < self.ink_threshold).mean())
+        signed = gray.astype(np.int16)
+        horizontal_edges = np.abs(np.diff(signed, axis=1)) > self.edge_threshold
+        vertical_edges = np.abs(np.diff(signed, axis=0)) > self.edge_threshold
+        edge_pairs = horizontal_edges.size + vertical_edges.size
+        features['edge_density'] = float(
+            (horizontal_edges.sum() + vertical_edges.sum()) / edge_pairs) if edge_pairs else 0.0
+
+        return features
+
+    def _score_features(self, features: Dict[str, float], associated_text: str) -> Dict[str, float]:
+        """Combine pixel features with the technical terms of the text around a placement"""
+        if not features['aspect_ok']:
+            return {'blueprint_score': 0.0, 'quality_score': 0.0}
+
+        avg_brightness = features['brightness']
+        contrast = features['contrast']
+        ink_coverage = features['ink_coverage']
+        edge_density = features['edge_density']
+
+        # Check for technical text indicators
+        text_score = 0
+        text_lower = associated_text.lower()
+        for term in self.technical_terms:
+            if term in text_lower:
+                text_score += 1
+
+        # Calculate overall blueprint score
+        brightness_score = 1.0 if 50 <= avg_brightness <= 200 else 0.5
+        contrast_score = 1.0 if contrast > 30 else 0.5
+        text_score = min(text_score / 3, 1.0)  # Normalize text score
+        line_art_score = 1.0 if 0.005 <= ink_coverage <= 0.5 and edge_density >= 0.01 else 0.5
+
+        blueprint_score = (brightness_score +
+                           contrast_score + text_score) / 3
+
+        return {
+            'brightness': avg_brightness,
+            'contrast': contrast,
+            'ink_coverage': ink_coverage,
+            'edge_density': edge_density,
+            'blueprint_score': blueprint_score,
+            'quality_score': (brightness_score + contrast_score + text_score + line_art_score) / 4
+        }
+
     def save_images_locally(self, images: List[ExtractedImage], output_dir: str) -> Dict[str, str]:
-        """Save extracted images to local directory"""
+        """Save extracted images to the content-addressed store in output_dir"""
         saved_files = {}
 
         try:
-            os.makedirs(output_dir, exist_ok=True)
-
-            for i, image in enumerate(images):
-                filename = f"image_{image.page_number:03d}_{i:03d}_{image.image_hash[:8]}.png"
-                filepath = os.path.join(output_dir, filename)
-
-                with open(filepath, 'wb') as f:
-                    f.write(image.image_data)
+            store = LocalImageStore(output_dir)
 
-                saved_files[image.image_hash] = filepath
+            for image in images:
+                saved_files[image.image_hash] = store.put(
+                    self._read_image_data(image), self._image_metadata(image), image.thumbnails)
 
             print(f"💾 Saved {len(saved_files)} images to {output_dir}")
 
@@ -330,6 +954,35 @@ class FlexLinkImageExtractor:
 
         return saved_files
 
+    def _image_metadata(self, image: ExtractedImage) -> Dict[str, Any]:
+        """Database fields of an image, without the image data"""
+        return {
+            'image_hash': image.image_hash,
+            'page_number': image.page_number,
+            'x_coord': float(image.x_coord),
+            'y_coord': float(image.y_coord),
+            'width': float(image.width),
+            'height': float(image.height),
+            'image_format': image.image_format,
+            'associated_text': image.associated_text,
+            'product_code': image.product_code,
+            'component_type': image.component_type,
+            'is_blueprint': True,  # All images passed through filter are blueprints
+            'image_quality_score': round(image.quality_score, 3) if image.quality_score is not None else 0.8,
+            'original_size_bytes': image.original_size or None,
+            'encoded_size_bytes': image.encoded_size or None,
+            'image_source': image.source,
+            # One row per page/bbox the image is drawn at (product_image_placements)
+            'placements': [
+                {**placement,
+                 'x_coord': float(placement['x_coord']),
+                 'y_coord': float(placement['y_coord']),
+                 'width': float(placement['width']),
+                 'height': float(placement['height'])}
+                for placement in (image.placements or [self._primary_placement(image)])
+            ]
+        }
+
     def prepare_images_for_database(self, images: List[ExtractedImage]) -> List[Dict[str, Any]]:
         """Prepare images for database upload"""
         db_images = []
@@ -338,24 +991,20 @@ class FlexLinkImageExtractor:
             try:
                 # Convert image data to base64
                 image_base64 = base64.b64encode(
-                    image.image_data).decode('utf-8')
+                    self._read_image_data(image)).decode('utf-8')
 
                 # Create database record
-                db_record = {
-                    'image_hash': image.image_hash,
-                    'page_number': image.page_number,
-                    'x_coord': float(image.x_coord),
-                    'y_coord': float(image.y_coord),
-                    'width': float(image.width),
-                    'height': float(image.height),
-                    'image_format': image.image_format,
-                    'image_data': image_base64,
-                    'associated_text': image.associated_text,
-                    'product_code': image.product_code,
-                    'component_type': image.component_type,
-                    'is_blueprint': True,  # All images passed through filter are blueprints
-                    'image_quality_score': 0.8  # Default quality score
-                }
+                db_record = self._image_metadata(image)
+                db_record['image_data'] = image_base64
+                # One row per size (product_image_thumbnails)
+                db_record['thumbnails'] = [
+                    {'size': thumbnail['size'],
+                     'width': thumbnail['width'],
+                     'height': thumbnail['height'],
+                     'image_format': thumbnail['image_format'],
+                     'image_data': base64.b64encode(thumbnail['data']).decode('utf-8')}
+                    for thumbnail in image.thumbnails
+                ]
 
                 db_images.append(db_record)
 
@@ -365,19 +1014,41 @@ class FlexLinkImageExtractor:
 
         return db_images
 
+    def _primary_placement(self, image: ExtractedImage) -> Dict[str, Any]:
+        """Placement described by the image's own page/bbox fields"""
+        return {key: getattr(image, key) for key in (
+            'page_number', 'x_coord', 'y_coord', 'width', 'height',
+            'associated_text', 'product_code', 'component_type')}
+
     def process_pdf_images(self, pdf_path: str, save_local: bool = True,
-                           output_dir: str = "extracted_images") -> Dict[str, Any]:
+                           output_dir: str = "extracted_images",
+                           pages: Optional[Set[int]] = None,
+                           workers: int = 1) -> Dict[str, Any]:
         """Main method to process PDF and extract blueprint images"""
+        if workers > 1:
+            # Workers hand back file paths; image bytes are only read when needed
+            with tempfile.TemporaryDirectory(prefix="flexlink_images_") as spool_dir:
+                return self._process_pdf_images(pdf_path, save_local, output_dir, pages,
+                                                workers, spool_dir)
+
+        return self._process_pdf_images(pdf_path, save_local, output_dir, pages)
+
+    def _process_pdf_images(self, pdf_path: str, save_local: bool, output_dir: str,
+                            pages: Optional[Set[int]], workers: int = 1,
+                            spool_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Extract, filter, save and prepare images (spooled images stay on disk until used)"""
         print(f"🚀 Starting image extraction from: {pdf_path}")
 
         # Extract all images
-        all_images = self.extract_images_from_pdf(pdf_path)
+        all_images = self.extract_images_from_pdf(
+            pdf_path, pages=pages, workers=workers, spool_dir=spool_dir)
 
         if not all_images:
             print("❌ No images found in PDF")
             return {
                 'total_images': 0,
                 'blueprint_images': 0,
+                'blueprint_placements': 0,
                 'saved_files': {},
                 'database_records': []
             }
@@ -398,6 +1069,9 @@ class FlexLinkImageExtractor:
         database_records = self.prepare_images_for_database(blueprint_images)
 
         # Print summary
+        placement_count = sum(len(record['placements']) for record in database_records)
+        original_bytes = sum(image.original_size for image in blueprint_images)
+        encoded_bytes = sum(image.encoded_size for image in blueprint_images)
         product_codes = set(
             img.product_code for img in blueprint_images if img.product_code)
         component_types = set(
@@ -406,6 +1080,10 @@ class FlexLinkImageExtractor:
         print(f"📊 Extraction Summary:")
         print(f"   Total images: {len(all_images)}")
         print(f"   Blueprint images: {len(blueprint_images)}")
+        print(f"   Blueprint placements: {placement_count}")
+        if encoded_bytes:
+            print(f"   Encoded size: {encoded_bytes / (1024 * 1024):.1f} MB "
+                  f"(decoded {original_bytes / (1024 * 1024):.1f} MB)")
         print(f"   Product codes found: {len(product_codes)}")
         print(f"   Component types found: {len(component_types)}")
 
@@ -417,6 +1095,9 @@ class FlexLinkImageExtractor:
         return {
             'total_images': len(all_images),
             'blueprint_images': len(blueprint_images),
+            'blueprint_placements': placement_count,
+            'original_bytes': original_bytes,
+            'encoded_bytes': encoded_bytes,
             'saved_files': saved_files,
             'database_records': database_records,
             'product_codes': list(product_codes),
@@ -424,6 +1105,41 @@ class FlexLinkImageExtractor:
         }
 
 
+_worker_extractor: Optional[FlexLinkImageExtractor] = None
+
+
+def _extract_image_range(pdf_path: str, page_indices: List[int], spool_dir: str) -> List[ExtractedImage]:
+    """Extract images from the given 0-based pages (runs in worker processes)"""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = FlexLinkImageExtractor()
+
+    images = []
+    xref_cache: Dict[Any, Dict[str, Any]] = {}
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num in page_indices:
+            images.extend(_worker_extractor._extract_images_from_page(
+                doc.load_page(page_num), page_num, xref_cache))
+    finally:
+        doc.close()
+
+    # Spool after the whole range: a later placement can still make an image a blueprint
+    for image in images:
+        if not image.image_data:
+            continue
+
+        # Write the bytes here and return only the path
+        image_path = os.path.join(spool_dir, f"{image.image_hash}.{image.image_format}")
+        if not os.path.exists(image_path):
+            with open(image_path, 'wb') as f:
+                f.write(image.image_data)
+        image.image_path = image_path
+        image.image_data = b""
+
+    return images
+
+
 def main():
     """Main function for testing the image extractor"""
     extractor = FlexLinkImageExtractor()
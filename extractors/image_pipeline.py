@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+FlexLink Streaming Image Pipeline
+Extract → filter → save → upload stages connected by bounded queues, so memory stays flat
+and uploads start while the catalog is still being read
+"""
+
+import time
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from image_extractor import FlexLinkImageExtractor, ExtractedImage
+from image_store import LocalImageStore
+
+# Marks the end of the stream on every queue
+_END = object()
+
+
+class FlexLinkImagePipeline:
+    def __init__(self, extractor: Optional[FlexLinkImageExtractor] = None,
+                 uploader=None, queue_size: int = 8):
+        """
+        Set up the pipeline
+
+        Args:
+            extractor: Image extractor (a new one by default)
+            uploader: FlexLinkImageUploader; without it the upload stage is skipped
+            queue_size: Images held between two stages; bounds memory to a few images
+                per stage whatever the catalog size
+        """
+        self.extractor = extractor or FlexLinkImageExtractor()
+        self.uploader = uploader
+        self.queue_size = queue_size
+
+    def run(self, pdf_path: str, save_local: bool = True,
+            output_dir: str = "extracted_images",
+            pages: Optional[Set[int]] = None) -> Dict[str, Any]:
+        """Stream the images of a PDF through every stage and return the summary"""
+        print(f"🚀 Streaming image pipeline: {pdf_path}")
+        start_time = time.time()
+
+        self.stats = {
+            'total_images': 0,
+            'blueprint_images': 0,
+            'blueprint_placements': 0,
+            'original_bytes': 0,
+            'encoded_bytes': 0,
+            'saved_files': {},
+            'success_count': 0,
+            'error_count': 0,
+            'errors': [],
+            'product_codes': set(),
+            'component_types': set()
+        }
+        self.lock = threading.Lock()
+
+        stages: List[Callable[[ExtractedImage], Optional[ExtractedImage]]] = [self._filter]
+        if save_local:
+            self.store = LocalImageStore(output_dir)
+            stages.append(self._save)
+        if self.uploader is not None:
+            stages.append(self._upload)
+
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in stages]
+        threads = [threading.Thread(target=self._produce, args=(pdf_path, pages, queues[0]),
+                                    name="extract", daemon=True)]
+        for index, stage in enumerate(stages):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            threads.append(threading.Thread(target=self._consume, args=(stage, queues[index], outbox),
+                                            name=f"stage-{index}", daemon=True))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = self.stats
+        result = {
+            'total_images': stats['total_images'],
+            'blueprint_images': stats['blueprint_images'],
+            'blueprint_placements': stats['blueprint_placements'],
+            'original_bytes': stats['original_bytes'],
+            'encoded_bytes': stats['encoded_bytes'],
+            'saved_files': stats['saved_files'],
+            'product_codes': sorted(stats['product_codes']),
+            'component_types': sorted(stats['component_types']),
+            'upload': {
+                'success': stats['error_count'] == 0,
+                'total_images': stats['blueprint_images'],
+                'success_count': stats['success_count'],
+                'error_count': stats['error_count'],
+                'errors': stats['errors']
+            },
+            'processing_time': time.time() - start_time
+        }
+
+        self._print_summary(result)
+        return result
+
+    def _produce(self, pdf_path: str, pages: Optional[Set[int]], outbox: queue.Queue):
+        """Extraction stage: feed images into the first queue as pages are read"""
+        try:
+            for image in self.extractor.iter_images(pdf_path, pages):
+                if image.image_data or not image.is_blueprint:
+                    with self.lock:
+                        self.stats['total_images'] += 1
+                outbox.put(image)
+        except Exception as e:
+            print(f"❌ Error processing PDF: {e}")
+            self._record_error(f"Extraction: {e}")
+        finally:
+            outbox.put(_END)
+
+    def _consume(self, stage: Callable[[ExtractedImage], Optional[ExtractedImage]],
+                 inbox: queue.Queue, outbox: Optional[queue.Queue]):
+        """Run one stage over its queue until the end marker, passing results on"""
+        while True:
+            image = inbox.get()
+            if image is _END:
+                if outbox is not None:
+                    outbox.put(_END)
+                return
+
+            try:
+                image = stage(image)
+            except Exception as e:
+                print(f"⚠️ Pipeline stage error for image on page {image.page_number}: {e}")
+                self._record_error(f"Page {image.page_number}: {e}")
+                continue
+
+            if image is not None and outbox is not None:
+                outbox.put(image)
+
+    def _filter(self, image: ExtractedImage) -> Optional[ExtractedImage]:
+        """Blueprint filter stage"""
+        if not self.extractor.filter_blueprint_images([image]):
+            return None
+
+        with self.lock:
+            if image.image_data:
+                self.stats['blueprint_images'] += 1
+                self.stats['original_bytes'] += image.original_size
+                self.stats['encoded_bytes'] += image.encoded_size
+            self.stats['blueprint_placements'] += len(image.placements)
+            for placement in image.placements:
+                if placement['product_code']:
+                    self.stats['product_codes'].add(placement['product_code'])
+                if placement['component_type']:
+                    self.stats['component_types'].add(placement['component_type'])
+        return image
+
+    def _save(self, image: ExtractedImage) -> ExtractedImage:
+        """Local store stage (placement-only items are appended to the manifest)"""
+        if image.image_data:
+            filepath = self.store.put(image.image_data, self.extractor._image_metadata(image),
+                                      image.thumbnails)
+            with self.lock:
+                self.stats['saved_files'][image.image_hash] = filepath
+        elif image.image_hash in self.store:
+            self.store.add_placements(image.image_hash, self.extractor._image_metadata(image)['placements'])
+        return image
+
+    def _upload(self, image: ExtractedImage) -> None:
+        """Upload stage: image rows with their placements, or extra placements of a stored image"""
+        record = self.extractor.prepare_images_for_database([image])[0]
+        if image.image_data:
+            result = self.uploader._upload_single_image(record)
+        else:
+            result = self.uploader.upload_image_placements(record)
+
+        if result['success']:
+            if image.image_data:
+                with self.lock:
+                    self.stats['success_count'] += 1
+                print(f"✅ Uploaded image from page {image.page_number}: {image.product_code or 'Unknown'}")
+        else:
+            print(f"❌ Failed to upload image from page {image.page_number}: {result['message']}")
+            self._record_error(f"Page {image.page_number}: {result['message']}")
+        return None
+
+    def _record_error(self, message: str):
+        """Count a failed item"""
+        with self.lock:
+            self.stats['error_count'] += 1
+            self.stats['errors'].append(message)
+
+    def _print_summary(self, result: Dict[str, Any]):
+        """Print the pipeline summary"""
+        print(f"📊 Streaming Pipeline Summary:")
+        print(f"   Total images: {result['total_images']}")
+        print(f"   Blueprint images: {result['blueprint_images']}")
+        print(f"   Blueprint placements: {result['blueprint_placements']}")
+        if result['encoded_bytes']:
+            print(f"   Encoded size: {result['encoded_bytes'] / (1024 * 1024):.1f} MB "
+                  f"(decoded {result['original_bytes'] / (1024 * 1024):.1f} MB)")
+        print(f"   Saved locally: {len(result['saved_files'])}")
+        if self.uploader is not None:
+            print(f"   Uploads succeeded: {result['upload']['success_count']}")
+            print(f"   Uploads failed: {result['upload']['error_count']}")
+        print(f"   Processing time: {result['processing_time']:.1f}s")
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+FlexLink Local Image Store
+Content-addressed image files in sharded directories, indexed by an append-only JSONL manifest
+"""
+
+import io
+import os
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from PIL import Image
+
+DEFAULT_STORE_DIR = "extracted_images"
+MANIFEST_NAME = "manifest.jsonl"
+THUMBNAIL_SIZES = (512, 256, 128)
+
+
+def make_thumbnails(image: Image.Image, sizes: Iterable[int] = THUMBNAIL_SIZES,
+                    image_format: str = 'webp', quality: int = 80) -> List[Dict[str, Any]]:
+    """
+    Thumbnail pyramid of an image, smallest first
+
+    Each size is reduced from the previous (larger) one; sizes the image already fits
+    in are skipped. Returns dicts with size, width, height, image_format and data.
+    """
+    if image.mode not in ('L', 'RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.mode else 'RGB')
+
+    full_size = max(image.size)
+    thumbnails = []
+    for size in sorted(sizes, reverse=True):
+        if full_size <= size:
+            continue
+        # In place on a copy of the full image, then on the previous thumbnail
+        image = image.copy() if max(image.size) == full_size else image
+        image.thumbnail((size, size), Image.LANCZOS)
+
+        buffer = io.BytesIO()
+        image.save(buffer, image_format.upper(), quality=quality)
+        thumbnails.append({
+            'size': size,
+            'width': image.width,
+            'height': image.height,
+            'image_format': image_format,
+            'data': buffer.getvalue()
+        })
+
+    return thumbnails[::-1]
+
+
+class LocalImageStore:
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        """
+        Open (or create) a store
+
+        Files live at <root>/objects/<hash[:2]>/<hash[2:4]>/<hash>.<format>; every write
+        appends one line to <root>/manifest.jsonl. The manifest is read once into an
+        in-memory index keyed by image hash, so lookups never glob the directory.
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifest_path = self.root / MANIFEST_NAME
+        self.index: Dict[str, Dict[str, Any]] = {}
+        # MD5s of stored files (and of imported flat files) whose image is keyed by another hash
+        self.aliases: Dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        """Replay the manifest: the latest metadata wins, placements and thumbnails accumulate"""
+        if not self.manifest_path.exists():
+            return
+
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from an interrupted run; everything before it is valid
+                    print(f"⚠️  Skipping unreadable manifest line {line_number} in {self.manifest_path}")
+                    continue
+                self._apply(entry)
+
+    def _apply(self, entry: Dict[str, Any]):
+        """Fold one manifest line into the index"""
+        image_hash = entry['image_hash']
+        if entry.get('op') == 'placements':
+            current = self.index.get(image_hash)
+            if current is not None:
+                current.setdefault('placements', []).extend(entry['placements'])
+            return
+        if entry.get('op') == 'thumbnails':
+            current = self.index.get(image_hash)
+            if current is not None:
+                current.setdefault('thumbnails', {}).update(entry['thumbnails'])
+            return
+
+        # A put merges into the stored record: fields it carries win, thumbnails and
+        # legacy hashes it lacks are kept
+        record = {key: value for key, value in entry.items() if key != 'op'}
+        current = self.index.get(image_hash)
+        if current is not None:
+            thumbnails = {**current.get('thumbnails', {}), **record.get('thumbnails', {})}
+            legacy_hashes = sorted(set(current.get('legacy_hashes', [])) | set(record.get('legacy_hashes', [])))
+            record = {**current, **record}
+            if thumbnails:
+                record['thumbnails'] = thumbnails
+            if legacy_hashes:
+                record['legacy_hashes'] = legacy_hashes
+        self.index[image_hash] = record
+        for legacy_hash in record.get('legacy_hashes', []):
+            self.aliases[legacy_hash] = image_hash
+
+    def _append(self, entry: Dict[str, Any]):
+        """Append one line to the manifest and apply it"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._apply(entry)
+
+    def object_path(self, image_hash: str, image_format: str = 'png') -> Path:
+        """Sharded path of an image file"""
+        return self.objects_dir / image_hash[:2] / image_hash[2:4] / f"{image_hash}.{image_format}"
+
+    def thumbnail_path(self, image_hash: str, size: int, image_format: str = 'webp') -> Path:
+        """Sharded path of a thumbnail, one tree per size"""
+        return (self.root / "thumbnails" / str(size) / image_hash[:2] / image_hash[2:4]
+                / f"{image_hash}.{image_format}")
+
+    def _write(self, path: Path, data: bytes):
+        """Write a file atomically, once: the same hash and format always hold the same image"""
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def put(self, data: bytes, metadata: Dict[str, Any],
+            thumbnails: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Store image bytes with their metadata
+
+        Args:
+            data: Encoded image
+            metadata: Database-style fields (page, bbox, text, codes, scores, placements);
+                image_data is never written to the manifest. Stored under its image_hash,
+                or the digest of the data without one; a stored image keeps the
+                thumbnails and fields this call doesn't give
+            thumbnails: Downscaled copies (size, width, height, image_format, data)
+
+        Returns:
+            Path of the stored file
+        """
+        file_hash = hashlib.md5(data).hexdigest()
+        image_hash = metadata.get('image_hash') or file_hash
+        image_format = metadata.get('image_format', 'png')
+        path = self.object_path(image_hash, image_format)
+        self._write(path, data)
+
+        entry = {key: value for key, value in metadata.items() if key not in ('image_data', 'thumbnails')}
+        entry.update({
+            'op': 'put',
+            'image_hash': image_hash,
+            'image_format': image_format,
+            'path': str(path.relative_to(self.root)),
+            'size_bytes': len(data),
+            'stored_at': time.time()
+        })
+        if file_hash != image_hash:
+            # The hash older runs keyed this file by, so import_legacy recognises it
+            entry['legacy_hashes'] = [file_hash]
+
+        if thumbnails:
+            entry['thumbnails'] = self._write_thumbnails(image_hash, thumbnails)
+
+        self._append(entry)
+
+        return str(path)
+
+    def _write_thumbnails(self, image_hash: str, thumbnails: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Write thumbnail files and describe them for the manifest (keyed by size)"""
+        described = {}
+        for thumbnail in thumbnails:
+            thumbnail_path = self.thumbnail_path(image_hash, thumbnail['size'], thumbnail['image_format'])
+            self._write(thumbnail_path, thumbnail['data'])
+            described[str(thumbnail['size'])] = {
+                'path': str(thumbnail_path.relative_to(self.root)),
+                'width': thumbnail['width'],
+                'height': thumbnail['height'],
+                'image_format': thumbnail['image_format'],
+                'size_bytes': len(thumbnail['data'])
+            }
+        return described
+
+    def add_thumbnails(self, image_hash: str, thumbnails: List[Dict[str, Any]]):
+        """Store thumbnails of an image that is already in the store"""
+        if image_hash not in self.index:
+            raise KeyError(f"Image {image_hash} is not in the store")
+        self._append({'op': 'thumbnails', 'image_hash': image_hash,
+                      'thumbnails': self._write_thumbnails(image_hash, thumbnails)})
+
+    def backfill_thumbnails(self, sizes: Iterable[int] = THUMBNAIL_SIZES) -> int:
+        """Create thumbnails for stored images that have none (e.g. imported flat files)"""
+        created = 0
+        for entry in list(self.index.values()):
+            if entry.get('thumbnails'):
+                continue
+            with Image.open(self.path(entry['image_hash'])) as image:
+                thumbnails = make_thumbnails(image, sizes)
+            if thumbnails:
+                self.add_thumbnails(entry['image_hash'], thumbnails)
+                created += 1
+        return created
+
+    def thumbnail(self, image_hash: str, size: int) -> Optional[str]:
+        """
+        Absolute path of the thumbnail closest to size
+
+        The smallest stored thumbnail at least as large as size, else the largest one,
+        else the image itself.
+        """
+        entry = self.index.get(image_hash)
+        if entry is None:
+            return None
+
+        sizes = sorted(int(stored) for stored in entry.get('thumbnails', {}))
+        if not sizes:
+            return self.path(image_hash)
+        chosen = next((stored for stored in sizes if stored >= size), sizes[-1])
+        return str(self.root / entry['thumbnails'][str(chosen)]['path'])
+
+    def add_placements(self, image_hash: str, placements: List[Dict[str, Any]]):
+        """Record further pages/bboxes a stored image is drawn at"""
+        if image_hash not in self.index:
+            raise KeyError(f"Image {image_hash} is not in the store")
+        self._append({'op': 'placements', 'image_hash': image_hash, 'placements': placements})
+
+    def get(self, image_hash: str) -> Optional[Dict[str, Any]]:
+        """Metadata of a stored image"""
+        return self.index.get(image_hash)
+
+    def path(self, image_hash: str) -> Optional[str]:
+        """Absolute path of a stored image file"""
+        entry = self.index.get(image_hash)
+        return str(self.root / entry['path']) if entry else None
+
+    def read(self, image_hash: str) -> bytes:
+        """Bytes of a stored image"""
+        path = self.path(image_hash)
+        if path is None:
+            raise KeyError(f"Image {image_hash} is not in the store")
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Metadata of every stored image, in the order they were first stored"""
+        return iter(self.index.values())
+
+    def resolve(self, image_hash: str) -> Optional[str]:
+        """Hash a stored image is keyed by, given that hash or one of its legacy hashes"""
+        if image_hash in self.index:
+            return image_hash
+        return self.aliases.get(image_hash)
+
+    def __contains__(self, image_hash: str) -> bool:
+        return image_hash in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def import_legacy(self, directory: str, move: bool = False) -> int:
+        """
+        Import flat image_<page>_<index>_<hash8>.png files from older runs
+
+        Older runs keyed images by the MD5 of the file, so a file is skipped when that
+        MD5 is a stored image's hash or one of its legacy hashes (a file stored since
+        under its source hash). Others are stored under the MD5 of the file, since the
+        source stream they came from is unknown. Only the page number can be recovered
+        from the filename; the other fields are left empty. Returns the number of newly
+        stored images.
+        """
+        imported = 0
+        for image_file in sorted(Path(directory).glob("image_*.png")):
+            with open(image_file, 'rb') as f:
+                data = f.read()
+
+            if self.resolve(hashlib.md5(data).hexdigest()):
+                if move:
+                    image_file.unlink()
+                continue
+
+            parts = image_file.stem.split('_')
+            page_number = int(parts[1]) if len(parts) >= 3 and parts[1].isdigit() else None
+
+            self.put(data, {
+                'page_number': page_number,
+                'image_format': 'png',
+                'is_blueprint': True,
+                'source_file': image_file.name
+            })
+            imported += 1
+
+            if move:
+                image_file.unlink()
+
+        return imported
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts and sizes of the stored images"""
+        entries = list(self.index.values())
+        return {
+            'images': len(entries),
+            'total_bytes': sum(entry.get('size_bytes', 0) for entry in entries),
+            'thumbnail_bytes': sum(thumbnail['size_bytes'] for entry in entries
+                                   for thumbnail in entry.get('thumbnails', {}).values()),
+            'placements': sum(len(entry.get('placements') or []) for entry in entries),
+            'pages': len({placement['page_number'] for entry in entries
+                          for placement in (entry.get('placements') or [entry])
+                          if placement.get('page_number') is not None}),
+            'product_codes': len({entry['product_code'] for entry in entries if entry.get('product_code')})
+        }
+
+    def compact(self):
+        """Rewrite the manifest with one line per image"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for entry in self.index.values():
+                f.write(json.dumps({'op': 'put', **entry}, ensure_ascii=False) + '\n')
+        os.replace(temp_path, self.manifest_path)
+
+
+def main():
+    """Command-line interface for the local image store"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Inspect and maintain the local image store")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR,
+                        help=f"Store directory (default: {DEFAULT_STORE_DIR})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="Show image counts and sizes")
+
+    show_parser = subparsers.add_parser("show", help="Show the metadata of one image")
+    show_parser.add_argument("image_hash", help="Full image hash")
+
+    import_parser = subparsers.add_parser(
+        "import", help="Import flat image_<page>_<index>_<hash8>.png files from older runs")
+    import_parser.add_argument("directory", help="Directory holding the flat files")
+    import_parser.add_argument("--move", action="store_true",
+                               help="Delete the flat files once they are stored")
+
+    subparsers.add_parser("thumbnails", help="Create thumbnails for images that have none")
+
+    subparsers.add_parser("compact", help="Rewrite the manifest with one line per image")
+
+    args = parser.parse_args()
+
+    store = LocalImageStore(args.store)
+
+    if args.command == "stats":
+        stats = store.stats()
+        print(f"🗂️  Image store: {store.root}")
+        print(f"   Images: {stats['images']}")
+        print(f"   Size: {stats['total_bytes'] / (1024 * 1024):.1f} MB")
+        print(f"   Thumbnails: {stats['thumbnail_bytes'] / (1024 * 1024):.1f} MB")
+        print(f"   Placements: {stats['placements']}")
+        print(f"   Pages: {stats['pages']}")
+        print(f"   Product codes: {stats['product_codes']}")
+
+    elif args.command == "show":
+        image_hash = store.resolve(args.image_hash)
+        if image_hash is None:
+            print(f"❌ Image not found: {args.image_hash}")
+            return
+        print(json.dumps({**store.get(image_hash), 'file': store.path(image_hash)}, indent=2, ensure_ascii=False))
+
+    elif args.command == "import":
+        imported = store.import_legacy(args.directory, move=args.move)
+        print(f"📥 Imported {imported} images into {store.root} ({len(store)} stored)")
+
+    elif args.command == "thumbnails":
+        created = store.backfill_thumbnails()
+        print(f"🖼️  Created thumbnails for {created} images")
+
+    elif args.command == "compact":
+        store.compact()
+        print(f"🧹 Manifest rewritten with {len(store)} entries")
+
+
+if __name__ == "__main__":
+    main()
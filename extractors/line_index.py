@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+FlexLink Page Line Index
+One joined buffer per page with line offsets, so windows of lines are searched without re-joining
+"""
+
+from typing import Dict, List, Optional, Pattern, Match, Set, Tuple
+
+# Patterns already checked by LineIndex.search
+_span_safe: Set[Pattern] = set()
+
+
+def is_span_safe(pattern: str) -> bool:
+    """
+    Whether searching a span of the buffer gives the same match as searching that text on
+    its own: no anchors, word boundaries or lookarounds, which look outside the span
+    """
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if not in_class and pattern[i + 1:i + 2] in ('b', 'B', 'A', 'Z'):
+                return False
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+            # '^' right after '[' negates the class; a ']' right after that is literal
+            i += 1
+            if pattern[i:i + 1] == '^':
+                i += 1
+            if pattern[i:i + 1] == ']':
+                i += 1
+            continue
+        elif char in '^$' or pattern.startswith(('(?=', '(?!', '(?<=', '(?<!'), i):
+            return False
+        i += 1
+    return True
+
+
+class LineIndex:
+    def __init__(self, lines: List[str]):
+        """
+        Index the lines of a page
+
+        The buffer is ' '.join(lines), so the span of lines[start:end] is exactly the
+        text the detail extractors used to build with their own ' '.join.
+        """
+        self.lines = lines
+        self.buffer, self.offsets = self._join(lines)
+        # Lower-casing can change the length of some characters, so it gets its own offsets
+        self.lower_buffer, self.lower_offsets = self._join([line.lower() for line in lines])
+
+        # Last unbounded search per pattern: (search start, match or None)
+        self._searches: Dict[Pattern, Tuple[int, Optional[Match]]] = {}
+
+    @staticmethod
+    def _join(lines: List[str]) -> Tuple[str, List[int]]:
+        """Join lines with single spaces and record where each line starts"""
+        offsets = []
+        position = 0
+        for line in lines:
+            offsets.append(position)
+            position += len(line) + 1
+        offsets.append(position)
+
+        return ' '.join(lines), offsets
+
+    def window(self, start: int, end: int) -> 'LineWindow':
+        """View of lines[start:end] (clamped like a list slice of non-negative bounds)"""
+        start = min(max(start, 0), len(self.lines))
+        end = min(max(end, start), len(self.lines))
+        return LineWindow(self, start, end)
+
+    def search(self, pattern: Pattern, pos: int, endpos: int) -> Optional[Match]:
+        """
+        Search buffer[pos:endpos] for pattern
+
+        Same result as searching the sliced text, for patterns without anchors, word
+        boundaries or lookarounds (see is_span_safe; other patterns raise ValueError).
+        Overlapping windows share one unbounded search per pattern: the leftmost match
+        from an earlier start is still the leftmost one for any start up to it.
+        """
+        if pattern not in _span_safe:
+            if not is_span_safe(pattern.pattern):
+                raise ValueError(f"Pattern looks outside the searched lines: {pattern.pattern!r}")
+            _span_safe.add(pattern)
+
+        previous = self._searches.get(pattern)
+        if previous and previous[0] <= pos and (previous[1] is None or pos <= previous[1].start()):
+            match = previous[1]
+        else:
+            match = pattern.search(self.buffer, pos)
+            self._searches[pattern] = (pos, match)
+
+        if match is None or match.end() <= endpos:
+            return match
+
+        # The shared match runs past this window; search the window itself
+        return pattern.search(self.buffer, pos, endpos)
+
+
+class LineWindow:
+    def __init__(self, index: LineIndex, start: int, end: int):
+        """View of index.lines[start:end] as spans of the index buffers"""
+        self.index = index
+        self.start = start
+        self.end = end
+
+        if start == end:
+            self.pos = self.endpos = index.offsets[start]
+            self.lower_pos = self.lower_endpos = index.lower_offsets[start]
+        else:
+            self.pos, self.endpos = index.offsets[start], index.offsets[end] - 1
+            self.lower_pos, self.lower_endpos = index.lower_offsets[start], index.lower_offsets[end] - 1
+
+    @property
+    def text(self) -> str:
+        """Lines of the window joined with spaces"""
+        return self.index.buffer[self.pos:self.endpos]
+
+    def lines(self) -> List['LineWindow']:
+        """One single-line view per line of the window"""
+        return [LineWindow(self.index, line_idx, line_idx + 1) for line_idx in range(self.start, self.end)]
+
+    def search(self, pattern: Pattern) -> Optional[Match]:
+        """pattern.search over the window text"""
+        return self.index.search(pattern, self.pos, self.endpos)
+
+    def scan(self, matcher) -> Dict[str, Set[str]]:
+        """Keyword hits of a KeywordMatcher over the lower-cased window text"""
+        return matcher.scan(self.index.lower_buffer, self.lower_pos, self.lower_endpos)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+FlexLink Image Object Storage
+Image and thumbnail files live in a Supabase Storage bucket (or a local directory standing
+in for it); product_images rows only keep the object key, size, dimensions and content hash
+"""
+
+import io
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from PIL import Image
+from dotenv import load_dotenv
+
+from rest_client import FlexLinkRestClient, get_client
+
+DEFAULT_BUCKET = "product-images"
+DEFAULT_LOCAL_DIR = "data/object_storage"
+CONTENT_TYPES = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+    'jp2': 'image/jp2'
+}
+
+
+def image_object_key(image_hash: str, image_format: str) -> str:
+    """Object key of an image file: images/<hash[:2]>/<hash[2:4]>/<hash>.<format>"""
+    return f"images/{image_hash[:2]}/{image_hash[2:4]}/{image_hash}.{image_format}"
+
+
+def thumbnail_object_key(image_hash: str, size: int, image_format: str) -> str:
+    """Object key of a thumbnail file: thumbs/<hash>/<size>.<format>"""
+    return f"thumbs/{image_hash}/{size}.{image_format}"
+
+
+def stored_object_fields(storage_key: str, data: bytes) -> Dict[str, Any]:
+    """product_images columns describing a stored image file"""
+    pixel_width = pixel_height = None
+    try:
+        # Only reads the header
+        with Image.open(io.BytesIO(data)) as image:
+            pixel_width, pixel_height = image.size
+    except Exception:
+        pass
+
+    return {
+        'storage_key': storage_key,
+        'encoded_size_bytes': len(data),
+        'pixel_width': pixel_width,
+        'pixel_height': pixel_height,
+        'content_sha256': hashlib.sha256(data).hexdigest()
+    }
+
+
+class SupabaseStorageBackend:
+    def __init__(self, bucket: str = DEFAULT_BUCKET, client: Optional[FlexLinkRestClient] = None):
+        """Objects in a Supabase Storage bucket, sent through the shared REST session"""
+        self.bucket = bucket
+        self.client = client or get_client()
+
+    def put(self, key: str, data: bytes, content_type: str = 'application/octet-stream') -> bool:
+        """
+        Store an object unless it is there already (keys come from the image hash and
+        format, so an existing object holds the same image). Returns True if it was uploaded.
+        """
+        response = self.client.storage(
+            'POST', f"object/{self.bucket}/{key}",
+            data=data,
+            headers={'Content-Type': content_type, 'Cache-Control': 'max-age=31536000'}
+        )
+        if response.status_code == 200:
+            return True
+        if response.status_code in (400, 409) and 'Duplicate' in response.text:
+            return False
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+
+    def get(self, key: str) -> bytes:
+        """Bytes of an object"""
+        response = self.client.storage('GET', f"object/{self.bucket}/{key}")
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+        return response.content
+
+    def delete(self, keys: List[str]) -> int:
+        """Delete objects; returns how many were removed"""
+        if not keys:
+            return 0
+        response = self.client.storage('DELETE', f"object/{self.bucket}", json={'prefixes': keys})
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+        return len(response.json())
+
+    def public_url(self, key: str) -> str:
+        """URL of an object in the (public) bucket"""
+        return self.client.url(f"object/public/{self.bucket}/{key}", api='storage')
+
+    def ensure_bucket(self, public: bool = True) -> bool:
+        """Create the bucket if it doesn't exist yet"""
+        response = self.client.storage('GET', f"bucket/{self.bucket}")
+        if response.status_code == 200:
+            return True
+
+        response = self.client.storage(
+            'POST', "bucket", json={'id': self.bucket, 'name': self.bucket, 'public': public})
+        return response.status_code == 200 or 'already exists' in response.text
+
+
+class LocalStorageBackend:
+    def __init__(self, root: str = DEFAULT_LOCAL_DIR, bucket: str = DEFAULT_BUCKET):
+        """Objects as files under <root>/<bucket>/<key>, for tests and offline runs"""
+        self.bucket = bucket
+        self.root = Path(root) / bucket
+
+    def put(self, key: str, data: bytes, content_type: str = 'application/octet-stream') -> bool:
+        """Write an object unless it exists; returns True if it was written"""
+        path = self.root / key
+        if path.exists():
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a crash never leaves a truncated object behind
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+    def get(self, key: str) -> bytes:
+        """Bytes of an object"""
+        with open(self.root / key, 'rb') as f:
+            return f.read()
+
+    def delete(self, keys: List[str]) -> int:
+        """Delete objects; returns how many were removed"""
+        removed = 0
+        for key in keys:
+            path = self.root / key
+            if path.exists():
+                path.unlink()
+                removed += 1
+        return removed
+
+    def public_url(self, key: str) -> str:
+        """file:// URL of an object"""
+        return (self.root / key).resolve().as_uri()
+
+    def ensure_bucket(self, public: bool = True) -> bool:
+        """Create the bucket directory"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return True
+
+
+def get_storage_backend(backend: Optional[str] = None, bucket: Optional[str] = None,
+                        client: Optional[FlexLinkRestClient] = None):
+    """
+    Storage backend from IMAGE_STORAGE_BACKEND ('supabase' by default, or 'local'),
+    IMAGE_STORAGE_BUCKET and IMAGE_STORAGE_DIR (local backend); the Supabase backend
+    uses client, or the shared client of the project in the environment
+    """
+    load_dotenv()
+    backend = backend or os.getenv('IMAGE_STORAGE_BACKEND', 'supabase')
+    bucket = bucket or os.getenv('IMAGE_STORAGE_BUCKET', DEFAULT_BUCKET)
+
+    if backend == 'supabase':
+        return SupabaseStorageBackend(bucket, client)
+    if backend == 'local':
+        return LocalStorageBackend(os.getenv('IMAGE_STORAGE_DIR', DEFAULT_LOCAL_DIR), bucket)
+    raise ValueError(f"Unknown image storage backend: {backend}")
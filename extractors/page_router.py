@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+FlexLink Page Engine Router
+Cheaply classifies pages with PyMuPDF so only table pages pay for pdfplumber
+"""
+
+import re
+from typing import Dict, List, Tuple
+from dataclasses import dataclass
+
+# Same section headers extract_technical_tables looks for
+TABLE_HEADER_PATTERN = re.compile(
+    r'technical\s*data|specifications|load\s*per\s*link', re.IGNORECASE)
+
+
+@dataclass
+class PageRoute:
+    """Routing decision for a single page"""
+    engine: str
+    has_table_header: bool = False
+    grid_rows: int = 0
+    ruling_lines: int = 0
+
+
+class PageRouter:
+    def __init__(self, min_grid_rows: int = 4, min_ruling_lines: int = 6,
+                 column_tolerance: float = 3.0, cell_gap: float = 1.5,
+                 min_rule_length: float = 30.0):
+        """
+        Initialize the page router
+
+        Args:
+            min_grid_rows: Rows of column-aligned cells that mark a table
+            min_ruling_lines: Horizontal/vertical rules that mark a table
+            column_tolerance: Max x-offset in points for cells to share a column
+            cell_gap: Gap between words, in word heights, that starts a new cell
+                (word spacing in prose, monospace included, stays well below it)
+            min_rule_length: Shortest line in points that counts as a rule (shorter
+                strokes are glyph parts such as drawn underscores)
+        """
+        self.min_grid_rows = min_grid_rows
+        self.min_ruling_lines = min_ruling_lines
+        self.column_tolerance = column_tolerance
+        self.cell_gap = cell_gap
+        self.min_rule_length = min_rule_length
+
+    def route(self, page, text: str, words: List[Tuple]) -> PageRoute:
+        """Pick 'pdfplumber' for table-bearing pages and 'pymupdf' for the rest"""
+        # Cheapest signals first; drawings are only inspected when text is inconclusive
+        if TABLE_HEADER_PATTERN.search(text):
+            return PageRoute('pdfplumber', has_table_header=True)
+
+        grid_rows = self._count_grid_rows(words)
+        if grid_rows >= self.min_grid_rows:
+            return PageRoute('pdfplumber', grid_rows=grid_rows)
+
+        ruling_lines = self._count_ruling_lines(page)
+        if ruling_lines >= self.min_ruling_lines:
+            return PageRoute('pdfplumber', grid_rows=grid_rows, ruling_lines=ruling_lines)
+
+        return PageRoute('pymupdf', grid_rows=grid_rows, ruling_lines=ruling_lines)
+
+    def _count_grid_rows(self, words: List[Tuple]) -> int:
+        """
+        Count text rows of three or more cells that line up with cells of other rows
+
+        Words are joined into cells unless a wide gap separates them, so a line of prose
+        is a single cell however its words happen to align with the lines around it.
+        A cell lines up when its left or right edge shares a column with cells on at
+        least min_grid_rows rows (left- and right-aligned columns both count).
+        """
+        rows: Dict[int, List[Tuple]] = {}
+        for word in words:
+            rows.setdefault(round(word[1]), []).append(word)
+
+        row_cells: Dict[int, List[Tuple[int, int]]] = {}
+        for top, row_words in rows.items():
+            row_words.sort(key=lambda word: word[0])
+            cells = []
+            cell_start = row_words[0][0]
+            for previous, word in zip(row_words, row_words[1:]):
+                if word[0] - previous[2] > self.cell_gap * (previous[3] - previous[1]):
+                    cells.append((cell_start, previous[2]))
+                    cell_start = word[0]
+            cells.append((cell_start, row_words[-1][2]))
+
+            if len(cells) >= 3:
+                row_cells[top] = [(round(x0 / self.column_tolerance), round(x1 / self.column_tolerance))
+                                  for x0, x1 in cells]
+        if len(row_cells) < self.min_grid_rows:
+            return 0
+
+        # Keep the left and right edges shared by enough rows
+        edge_rows: Dict[Tuple[str, int], set] = {}
+        for top, cells in row_cells.items():
+            for left, right in cells:
+                edge_rows.setdefault(('left', left), set()).add(top)
+                edge_rows.setdefault(('right', right), set()).add(top)
+        columns = {edge for edge, tops in edge_rows.items() if len(tops) >= self.min_grid_rows}
+
+        return sum(1 for cells in row_cells.values()
+                   if sum(1 for left, right in cells
+                          if ('left', left) in columns or ('right', right) in columns) >= 3)
+
+    def _count_ruling_lines(self, page) -> int:
+        """Count horizontal and vertical rules (and cell boxes) of table size drawn on the page"""
+        count = 0
+        try:
+            for path in page.get_drawings():
+                for item in path.get("items", []):
+                    if item[0] == "l":
+                        p1, p2 = item[1], item[2]
+                        width, height = abs(p1.x - p2.x), abs(p1.y - p2.y)
+                        if (height < 1 or width < 1) and max(width, height) >= self.min_rule_length:
+                            count += 1
+                    elif item[0] == "re":
+                        if max(item[1].width, item[1].height) >= self.min_rule_length:
+                            count += 1
+
+                    if count >= self.min_ruling_lines:
+                        return count
+        except Exception:
+            pass
+
+        return count
+
+
+def engine_share(pages: List) -> Dict[str, int]:
+    """Count pages per extraction engine"""
+    share: Dict[str, int] = {}
+    for page in pages:
+        share[page.engine] = share.get(page.engine, 0) + 1
+    return share
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+FlexLink Page Text Cache
+Persistent SQLite cache of extracted page text and word boxes, keyed by PDF content hash
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from typing import Dict, List, Any, Iterator, Optional
+from pathlib import Path
+
+# Under the repository root, wherever the tools are run from
+DEFAULT_CACHE_PATH = str(Path(__file__).resolve().parent.parent / "data" / "page_text_cache.sqlite")
+
+
+def compute_pdf_sha256(pdf_path: str) -> str:
+    """Hash the PDF contents so renamed or copied catalogs share cache entries"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PageTextCache:
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH):
+        """
+        Initialize the page text cache
+
+        Pages are stored under the version of the engine that produced them, so engine
+        modes share the pages they have in common; a document row lists the page version
+        of each of its pages.
+        """
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                pdf_sha256 TEXT NOT NULL,
+                extractor_version TEXT NOT NULL,
+                pdf_path TEXT,
+                page_count INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                page_versions TEXT,
+                PRIMARY KEY (pdf_sha256, extractor_version)
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                pdf_sha256 TEXT NOT NULL,
+                page_index INTEGER NOT NULL,
+                extractor_version TEXT NOT NULL,
+                engine TEXT NOT NULL,
+                text TEXT NOT NULL,
+                words TEXT NOT NULL,
+                PRIMARY KEY (pdf_sha256, page_index, extractor_version)
+            );
+        """)
+        # Caches written before pages were keyed by engine
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(documents)")]
+        if 'page_versions' not in columns:
+            self.conn.execute("ALTER TABLE documents ADD COLUMN page_versions TEXT")
+        self.conn.commit()
+        self._uncommitted = 0
+
+    def find_document(self, pdf_sha256: str, extractor_version: str) -> Optional[List[str]]:
+        """Page version of every page of a document, or None if it is not fully cached"""
+        document = self.conn.execute(
+            "SELECT page_versions FROM documents WHERE pdf_sha256 = ? AND extractor_version = ?",
+            (pdf_sha256, extractor_version)).fetchone()
+        if not document or document[0] is None:
+            return None
+
+        page_versions = json.loads(document[0])
+        stored = set(self.conn.execute(
+            "SELECT page_index, extractor_version FROM pages WHERE pdf_sha256 = ?", (pdf_sha256,)))
+        if any((index, version) not in stored for index, version in enumerate(page_versions)):
+            return None
+        return page_versions
+
+    def iter_pages(self, pdf_sha256: str, page_versions: List[str]) -> Iterator[Dict[str, Any]]:
+        """Yield the cached pages of a document found with find_document, one at a time"""
+        rows = self.conn.execute(
+            "SELECT page_index, extractor_version, engine, text, words FROM pages "
+            "WHERE pdf_sha256 = ? ORDER BY page_index", (pdf_sha256,))
+        for page_index, version, engine, text, words in rows:
+            if page_index < len(page_versions) and version == page_versions[page_index]:
+                yield {
+                    'page_index': page_index,
+                    'engine': engine,
+                    'text': text,
+                    'words': [tuple(word) for word in json.loads(words)]
+                }
+
+    def load_pages(self, pdf_sha256: str, extractor_version: str) -> Optional[List[Dict[str, Any]]]:
+        """Load all cached pages of a document, or None if it is not fully cached"""
+        page_versions = self.find_document(pdf_sha256, extractor_version)
+        if page_versions is None:
+            return None
+        return list(self.iter_pages(pdf_sha256, page_versions))
+
+    def store_page(self, pdf_sha256: str, page: Dict[str, Any]):
+        """
+        Store one page under its page version (page['version']), replacing any previous
+        entry; pages are committed in groups and by store_document
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages (pdf_sha256, page_index, extractor_version, engine, text, words) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (pdf_sha256, page['page_index'], page['version'], page['engine'],
+             page['text'], json.dumps(page['words'])))
+        self._uncommitted += 1
+        if self._uncommitted >= 64:
+            self.conn.commit()
+            self._uncommitted = 0
+
+    def store_document(self, pdf_sha256: str, extractor_version: str, pdf_path: str,
+                       page_versions: List[str]):
+        """Record a document whose pages are all stored, replacing any previous entry"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents "
+                "(pdf_sha256, extractor_version, pdf_path, page_count, created_at, page_versions) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (pdf_sha256, extractor_version, os.path.abspath(pdf_path), len(page_versions),
+                 time.time(), json.dumps(page_versions)))
+        self._uncommitted = 0
+
+    def store_pages(self, pdf_sha256: str, extractor_version: str, pdf_path: str,
+                    pages: List[Dict[str, Any]]):
+        """Store all pages of a document (each with its page version), replacing any previous entry"""
+        for page in pages:
+            self.store_page(pdf_sha256, page)
+        self.store_document(pdf_sha256, extractor_version, pdf_path, [page['version'] for page in pages])
+
+    def list_documents(self) -> List[Dict[str, Any]]:
+        """List cached documents with the size of their pages on disk"""
+        rows = self.conn.execute("""
+            SELECT pdf_sha256, extractor_version, pdf_path, page_count, created_at, page_versions
+            FROM documents
+            ORDER BY created_at DESC
+        """).fetchall()
+
+        documents = []
+        for sha, version, path, page_count, created_at, page_versions in rows:
+            wanted = set(enumerate(json.loads(page_versions or '[]')))
+            size = sum(page_size for page_index, page_version, page_size in self.conn.execute(
+                "SELECT page_index, extractor_version, LENGTH(text) + LENGTH(words) FROM pages "
+                "WHERE pdf_sha256 = ?", (sha,)) if (page_index, page_version) in wanted)
+            documents.append({
+                'pdf_sha256': sha,
+                'extractor_version': version,
+                'pdf_path': path,
+                'page_count': page_count,
+                'created_at': created_at,
+                'size_bytes': size
+            })
+        return documents
+
+    def evict(self, pdf_sha256: Optional[str] = None, extractor_version: Optional[str] = None,
+              exclude_version: Optional[str] = None, older_than_days: Optional[float] = None) -> int:
+        """
+        Evict cached documents matching all given filters, with the pages no other
+        document uses
+
+        Args:
+            pdf_sha256: Full hash or hash prefix of the document
+            extractor_version: Only evict entries written by this extractor version
+            exclude_version: Evict every version not starting with this one (stale entries)
+            older_than_days: Only evict entries older than this many days
+
+        Returns:
+            Number of documents evicted
+        """
+        conditions = []
+        params = []
+        if pdf_sha256:
+            conditions.append("pdf_sha256 LIKE ?")
+            params.append(f"{pdf_sha256}%")
+        if extractor_version:
+            conditions.append("extractor_version = ?")
+            params.append(extractor_version)
+        if exclude_version:
+            conditions.append("extractor_version NOT LIKE ?")
+            params.append(f"{exclude_version}-%")
+        if older_than_days is not None:
+            conditions.append("created_at < ?")
+            params.append(time.time() - older_than_days * 86400)
+
+        where = " AND ".join(conditions) if conditions else "1 = 1"
+        targets = self.conn.execute(
+            f"SELECT pdf_sha256, extractor_version FROM documents WHERE {where}", params).fetchall()
+
+        with self.conn:
+            for sha, version in targets:
+                self.conn.execute(
+                    "DELETE FROM documents WHERE pdf_sha256 = ? AND extractor_version = ?", (sha, version))
+
+            for sha in {sha for sha, _ in targets}:
+                used = set()
+                for (page_versions,) in self.conn.execute(
+                        "SELECT page_versions FROM documents WHERE pdf_sha256 = ?", (sha,)).fetchall():
+                    used.update(enumerate(json.loads(page_versions or '[]')))
+                stored = self.conn.execute(
+                    "SELECT page_index, extractor_version FROM pages WHERE pdf_sha256 = ?", (sha,)).fetchall()
+                self.conn.executemany(
+                    "DELETE FROM pages WHERE pdf_sha256 = ? AND page_index = ? AND extractor_version = ?",
+                    [(sha, index, version) for index, version in stored if (index, version) not in used])
+
+            # Pages of streams that were abandoned before their document was recorded
+            self.conn.execute(
+                "DELETE FROM pages WHERE pdf_sha256 NOT IN (SELECT pdf_sha256 FROM documents)")
+
+        if targets:
+            self.conn.execute("VACUUM")
+
+        return len(targets)
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
+def main():
+    """Command-line interface for inspecting and evicting cache entries"""
+    import argparse
+    from datetime import datetime
+    from page_text_provider import EXTRACTOR_VERSION
+
+    parser = argparse.ArgumentParser(
+        description="Inspect and evict cached page text")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH,
+                        help=f"Cache database path (default: {DEFAULT_CACHE_PATH})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="List cached documents")
+
+    evict_parser = subparsers.add_parser("evict", help="Evict cached documents")
+    evict_parser.add_argument("--sha", help="Document hash or hash prefix")
+    evict_parser.add_argument("--version", help="Extractor version to evict")
+    evict_parser.add_argument("--stale", action="store_true",
+                              help=f"Evict entries not written by the current extractor version ({EXTRACTOR_VERSION})")
+    evict_parser.add_argument("--older-than-days", type=float,
+                              help="Evict entries older than this many days")
+    evict_parser.add_argument("--all", action="store_true",
+                              help="Evict every cached document")
+
+    args = parser.parse_args()
+
+    cache = PageTextCache(args.cache)
+
+    if args.command == "list":
+        documents = cache.list_documents()
+        if not documents:
+            print("📭 Page text cache is empty")
+        for doc in documents:
+            created = datetime.fromtimestamp(doc['created_at']).strftime('%Y-%m-%d %H:%M')
+            current = "" if doc['extractor_version'].startswith(f"{EXTRACTOR_VERSION}-") else " (stale)"
+            print(f"📄 {doc['pdf_sha256'][:16]}  v{doc['extractor_version']}{current}  "
+                  f"{doc['page_count']} pages  {doc['size_bytes'] / 1024:.1f} KB  {created}")
+            print(f"   {doc['pdf_path']}")
+
+    elif args.command == "evict":
+        if not (args.sha or args.version or args.stale or args.older_than_days is not None or args.all):
+            print("❌ Specify --sha, --version, --stale, --older-than-days or --all")
+            cache.close()
+            return
+
+        evicted = cache.evict(
+            pdf_sha256=args.sha,
+            extractor_version=args.version,
+            exclude_version=EXTRACTOR_VERSION if args.stale else None,
+            older_than_days=args.older_than_days)
+        print(f"🧹 Evicted {evicted} cached documents")
+
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
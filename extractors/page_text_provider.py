@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+FlexLink Page Text Provider
+Shared page-text extraction so every extractor reads a catalog from a single parse
+"""
+
+import os
+import multiprocessing
+from queue import Empty
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Optional, Iterator
+from dataclasses import dataclass, field
+
+from page_text_cache import PageTextCache, DEFAULT_CACHE_PATH, compute_pdf_sha256
+from page_router import PageRouter, engine_share
+
+# PDF processing libraries
+try:
+    import fitz  # PyMuPDF
+    import pdfplumber
+    PDF_LIBRARIES_AVAILABLE = True
+except ImportError:
+    PDF_LIBRARIES_AVAILABLE = False
+    print("⚠️  PDF libraries not installed. Run: pip install PyMuPDF pdfplumber")
+
+# Bump when page text extraction changes so cached pages are re-extracted
+EXTRACTOR_VERSION = "3"
+
+# 'auto' (default) routes each page to one engine; 'pdfplumber' and 'pymupdf' use one for every page
+ENGINE_MODES = ('auto', 'pdfplumber', 'pymupdf')
+
+
+@dataclass
+class PageText:
+    """Text of a single PDF page"""
+    page_number: int
+    text: str
+    engine: str
+    # Word boxes as (x0, top, x1, bottom, text) in PDF points
+    words: List[Tuple[float, float, float, float, str]] = field(default_factory=list)
+
+
+class PageTextProvider:
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH, engine: str = 'auto'):
+        """
+        Initialize the page text provider
+
+        Args:
+            cache_path: SQLite page text cache location, or None to always parse
+            engine: 'auto' (per-page routing), 'pdfplumber' or 'pymupdf'
+        """
+        if engine not in ENGINE_MODES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINE_MODES}")
+
+        # Documents parsed by get_pages, keyed by (absolute path, mtime, size)
+        self._documents: Dict[Tuple[str, float, int], List[PageText]] = {}
+        self.cache_path = cache_path
+        self.engine = engine
+        # Cached documents are keyed by engine mode, their pages by the engine that produced them
+        self.cache_version = f"{EXTRACTOR_VERSION}-{engine}"
+        self._cache: Optional[PageTextCache] = None
+
+    def get_pages(self, pdf_path: str, workers: int = 1) -> List[PageText]:
+        """
+        Get all pages of a PDF, parsing it only on first request (the pages are kept in memory)
+
+        Args:
+            pdf_path: Path to the PDF file
+            workers: Number of processes to parse page ranges with (1 = serial)
+        """
+        if not PDF_LIBRARIES_AVAILABLE:
+            print("❌ PDF libraries not available")
+            return []
+
+        try:
+            key = self._document_key(pdf_path)
+        except OSError as e:
+            print(f"❌ Cannot read PDF: {e}")
+            return []
+
+        if key not in self._documents:
+            self._documents[key] = self._load_document(pdf_path, workers)
+
+        return self._documents[key]
+
+    def get_page_texts(self, pdf_path: str, strip: bool = False,
+                       workers: int = 1) -> Dict[int, str]:
+        """Get non-empty page texts keyed by 1-based page number"""
+        page_texts = {}
+
+        for page in self.get_pages(pdf_path, workers):
+            text = page.text.strip() if strip else page.text
+            if text.strip():
+                page_texts[page.page_number] = text
+
+        return page_texts
+
+    def iter_pages(self, pdf_path: str, read_ahead: int = 8) -> Iterator[PageText]:
+        """
+        Stream pages in document order while later pages are still being parsed
+
+        Pages are written to the on-disk cache as they pass and not kept in memory
+        (get_pages keeps a document). If parsing fails partway the error is raised after
+        the pages already yielded, so callers never mistake a truncated stream for a
+        short document.
+
+        Args:
+            pdf_path: Path to the PDF file
+            read_ahead: Maximum number of parsed pages waiting to be consumed
+        """
+        if not PDF_LIBRARIES_AVAILABLE:
+            print("❌ PDF libraries not available")
+            return
+
+        try:
+            key = self._document_key(pdf_path)
+        except OSError as e:
+            print(f"❌ Cannot read PDF: {e}")
+            return
+
+        if key in self._documents:
+            yield from self._documents[key]
+            return
+
+        pdf_sha256, page_versions = self._find_cached(pdf_path)
+        if page_versions is not None:
+            yield from self._iter_cached(pdf_sha256, page_versions)
+            return
+
+        cache = self._cache if pdf_sha256 else None
+        page_versions = []
+        share: Dict[str, int] = {}
+        try:
+            for page in _stream_pages(pdf_path, self.engine, read_ahead):
+                page_versions.append(self._page_version(page.engine))
+                share[page.engine] = share.get(page.engine, 0) + 1
+                if cache:
+                    try:
+                        cache.store_page(pdf_sha256, self._cache_record(page))
+                    except Exception as e:
+                        print(f"⚠️  Could not write page text cache: {e}")
+                        cache = None
+                yield page
+        except Exception as e:
+            print(f"❌ PDF text extraction failed after {len(page_versions)} pages: {e}")
+            raise
+
+        # Only a fully consumed stream is recorded; an abandoned one is parsed again next time
+        self._report_engine_share(share)
+        if cache and page_versions:
+            try:
+                cache.store_document(pdf_sha256, self.cache_version, pdf_path, page_versions)
+            except Exception as e:
+                print(f"⚠️  Could not write page text cache: {e}")
+
+    def iter_page_texts(self, pdf_path: str, strip: bool = False,
+                        read_ahead: int = 8) -> Iterator[Tuple[int, str]]:
+        """Stream (page number, text) pairs for non-empty pages"""
+        for page in self.iter_pages(pdf_path, read_ahead):
+            text = page.text.strip() if strip else page.text
+            if text.strip():
+                yield page.page_number, text
+
+    def clear(self):
+        """Drop all parsed documents held in memory"""
+        self._documents.clear()
+
+    def _document_key(self, pdf_path: str) -> Tuple[str, float, int]:
+        """Build a cache key that changes when the file is replaced"""
+        path = os.path.abspath(pdf_path)
+        stat = os.stat(path)
+        return (path, stat.st_mtime, stat.st_size)
+
+    def _get_cache(self) -> Optional[PageTextCache]:
+        """Open the on-disk cache on first use"""
+        if self._cache is None and self.cache_path:
+            try:
+                self._cache = PageTextCache(self.cache_path)
+            except Exception as e:
+                print(f"⚠️  Page text cache unavailable: {e}")
+                self.cache_path = None
+        return self._cache
+
+    def _load_document(self, pdf_path: str, workers: int) -> List[PageText]:
+        """Load pages from the on-disk cache, parsing and storing them on a miss"""
+        pdf_sha256, page_versions = self._find_cached(pdf_path)
+        if page_versions is not None:
+            return list(self._iter_cached(pdf_sha256, page_versions))
+
+        pages = self._parse_document(pdf_path, workers)
+        self._store_cached(pdf_sha256, pdf_path, pages)
+        return pages
+
+    def _find_cached(self, pdf_path: str) -> Tuple[Optional[str], Optional[List[str]]]:
+        """Look the document up in the on-disk cache, returning its hash and, if cached, its page versions"""
+        cache = self._get_cache()
+        if not cache:
+            return None, None
+
+        pdf_sha256 = compute_pdf_sha256(pdf_path)
+        page_versions = cache.find_document(pdf_sha256, self.cache_version)
+        if page_versions is not None:
+            print(f"⚡ Loading text for {len(page_versions)} pages from cache ({pdf_sha256[:12]})")
+        return pdf_sha256, page_versions
+
+    def _iter_cached(self, pdf_sha256: str, page_versions: List[str]) -> Iterator[PageText]:
+        """Yield the cached pages of a document found with _find_cached"""
+        for page in self._cache.iter_pages(pdf_sha256, page_versions):
+            yield PageText(page['page_index'] + 1, page['text'], page['engine'], page['words'])
+
+    def _store_cached(self, pdf_sha256: Optional[str], pdf_path: str, pages: List[PageText]):
+        """Write freshly parsed pages to the on-disk cache"""
+        cache = self._get_cache()
+        if not cache or not pdf_sha256 or not pages:
+            return
+
+        try:
+            cache.store_pages(pdf_sha256, self.cache_version, pdf_path,
+                              [self._cache_record(page) for page in pages])
+        except Exception as e:
+            print(f"⚠️  Could not write page text cache: {e}")
+
+    @staticmethod
+    def _page_version(engine: str) -> str:
+        """Cache version of a page produced by an engine (shared by every engine mode)"""
+        return f"{EXTRACTOR_VERSION}-{engine}"
+
+    def _cache_record(self, page: PageText) -> Dict:
+        """Page text cache record of a page"""
+        return {
+            'page_index': page.page_number - 1,
+            'version': self._page_version(page.engine),
+            'engine': page.engine,
+            'text': page.text,
+            'words': page.words
+        }
+
+    def _parse_document(self, pdf_path: str, workers: int = 1) -> List[PageText]:
+        """Parse every page once using the configured engine mode (same fallback rule as iter_pages)"""
+        try:
+            pages = self._extract_with_engine(pdf_path, self.engine, workers)
+            if self.engine == 'pdfplumber' and not any(page.text.strip() for page in pages):
+                # No pdfplumber text anywhere: redo the document with PyMuPDF
+                pages = self._extract_with_engine(pdf_path, 'pymupdf', workers)
+        except Exception as e:
+            print(f"❌ PDF text extraction failed: {e}")
+            return []
+
+        self._report_engine_share(engine_share(pages))
+        return pages
+
+    def _report_engine_share(self, share: Dict[str, int]):
+        """Print how many pages each engine handled"""
+        total = sum(share.values())
+        if not total:
+            print("⚠️  No pages extracted")
+            return
+
+        engines = ", ".join(f"{engine} {count} ({count / total:.0%})"
+                            for engine, count in sorted(share.items()))
+        print(f"✅ Extracted text from {total} pages using {engines}")
+
+    def _extract_with_engine(self, pdf_path: str, engine: str, workers: int) -> List[PageText]:
+        """Extract all pages with one engine, split over worker processes if requested"""
+        if workers <= 1:
+            return _extract_page_range(pdf_path, engine, 0, None)
+
+        doc = fitz.open(pdf_path)
+        page_count = len(doc)
+        doc.close()
+
+        # Contiguous page ranges, one per worker
+        range_size = max(1, -(-page_count // workers))
+        ranges = [(start, min(start + range_size, page_count))
+                  for start in range(0, page_count, range_size)]
+
+        print(f"🔀 Extracting {page_count} pages with {engine} in {len(ranges)} page ranges "
+              f"({workers} workers)")
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            futures = [executor.submit(_extract_page_range, pdf_path, engine, start, end)
+                       for start, end in ranges]
+            # Results are collected in submission order, so pages stay in document order
+            pages = []
+            for future in futures:
+                pages.extend(future.result())
+
+        return pages
+
+
+def _stream_pages(pdf_path: str, engine: str, read_ahead: int) -> Iterator[PageText]:
+    """Parse pages in a producer process and yield them through a bounded queue"""
+    context = multiprocessing.get_context()
+    queue = context.Queue(maxsize=max(1, read_ahead))
+    process = context.Process(target=_stream_worker, args=(pdf_path, engine, queue), daemon=True)
+    process.start()
+
+    try:
+        while True:
+            try:
+                item = queue.get(timeout=1)
+            except Empty:
+                if process.is_alive():
+                    continue
+                # The producer may have flushed its last items just before exiting
+                try:
+                    item = queue.get(timeout=1)
+                except Empty:
+                    raise RuntimeError("page stream worker exited unexpectedly")
+
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+
+def _stream_worker(pdf_path: str, engine: str, queue):
+    """Producer process for _stream_pages; blocks whenever the read-ahead queue is full"""
+    try:
+        for page in _iter_document_pages(pdf_path, engine):
+            queue.put(page)
+        queue.put(None)
+    except Exception as e:
+        queue.put(RuntimeError(str(e)))
+
+
+def _iter_document_pages(pdf_path: str, engine: str) -> Iterator[PageText]:
+    """Yield every page of a document one at a time"""
+    if engine != 'pdfplumber':
+        yield from _iter_page_range(pdf_path, engine, 0, None)
+        return
+
+    # Same rule as PageTextProvider._parse_document: pdfplumber pages (PyMuPDF for pages
+    # pdfplumber fails on), or PyMuPDF for the whole document if no page has text.
+    # Leading empty pages are held back until some text shows up.
+    held_back = []
+    found_text = False
+    for page in _iter_page_range(pdf_path, 'pdfplumber', 0, None):
+        if not found_text and not page.text.strip():
+            held_back.append(page)
+            continue
+        found_text = True
+        yield from held_back
+        held_back = []
+        yield page
+
+    if not found_text:
+        yield from _iter_page_range(pdf_path, 'pymupdf', 0, None)
+
+
+def _extract_page_range(pdf_path: str, engine: str, start: int, end) -> List[PageText]:
+    """Extract pages [start, end) with fresh document handles (runs in worker processes)"""
+    return list(_iter_page_range(pdf_path, engine, start, end))
+
+
+def _iter_page_range(pdf_path: str, engine: str, start: int, end) -> Iterator[PageText]:
+    """Yield pages [start, end) with fresh document handles"""
+    if engine == 'pdfplumber':
+        yield from _iter_pdfplumber_range(pdf_path, start, end)
+        return
+
+    router = PageRouter() if engine == 'auto' else None
+    pdf = None
+    doc = fitz.open(pdf_path)
+
+    try:
+        stop = len(doc) if end is None else end
+        for page_num in range(start, stop):
+            page = doc.load_page(page_num)
+            page_text = _extract_pymupdf_page(page, page_num + 1)
+
+            if router and router.route(page, page_text.text, page_text.words).engine == 'pdfplumber':
+                try:
+                    # Opened lazily so ranges without tables never touch pdfplumber
+                    if pdf is None:
+                        pdf = pdfplumber.open(pdf_path)
+                    page_text = _extract_pdfplumber_page(pdf.pages[page_num], page_num + 1)
+                except Exception as e:
+                    print(f"⚠️  pdfplumber failed on page {page_num + 1}, keeping PyMuPDF text: {e}")
+
+            yield page_text
+    finally:
+        doc.close()
+        if pdf is not None:
+            pdf.close()
+
+
+def _iter_pdfplumber_range(pdf_path: str, start: int, end) -> Iterator[PageText]:
+    """Yield pdfplumber pages [start, end); pages pdfplumber fails on get PyMuPDF text"""
+    pdf = None
+    try:
+        pdf = pdfplumber.open(pdf_path)
+        pages = pdf.pages[start:end]
+    except Exception as e:
+        if pdf is not None:
+            pdf.close()
+        print(f"⚠️  pdfplumber failed, using PyMuPDF: {e}")
+        yield from _iter_page_range(pdf_path, 'pymupdf', start, end)
+        return
+
+    doc = None
+    try:
+        for page_num, page in enumerate(pages, start + 1):
+            try:
+                page_text = _extract_pdfplumber_page(page, page_num)
+            except Exception as e:
+                print(f"⚠️  pdfplumber failed on page {page_num}, using PyMuPDF: {e}")
+                if doc is None:
+                    doc = fitz.open(pdf_path)
+                page_text = _extract_pymupdf_page(doc.load_page(page_num - 1), page_num)
+            yield page_text
+    finally:
+        pdf.close()
+        if doc is not None:
+            doc.close()
+
+
+def _extract_pymupdf_page(page, page_number: int) -> PageText:
+    """Extract text and word boxes from a PyMuPDF page"""
+    return PageText(page_number, page.get_text(), 'pymupdf',
+                    [tuple(w[:5]) for w in page.get_text("words")])
+
+
+def _extract_pdfplumber_page(page, page_number: int) -> PageText:
+    """Extract text and word boxes from a pdfplumber page"""
+    text = page.extract_text() or ""
+    words = [(w['x0'], w['top'], w['x1'], w['bottom'], w['text'])
+             for w in page.extract_words()]
+    return PageText(page_number, text, 'pdfplumber', words)
+
+
+# Process-wide provider shared by all extractors
+# (PAGE_TEXT_CACHE=off disables the disk cache, PAGE_TEXT_ENGINE picks the engine mode)
+_cache_setting = os.getenv('PAGE_TEXT_CACHE', DEFAULT_CACHE_PATH)
+_default_provider = PageTextProvider(
+    None if _cache_setting.lower() == 'off' else _cache_setting,
+    engine=os.getenv('PAGE_TEXT_ENGINE', 'auto'))
+
+
+def get_page_text_provider() -> PageTextProvider:
+    """Get the process-wide page text provider"""
+    return _default_provider
+
+
+def get_pages(pdf_path: str, workers: int = 1) -> List[PageText]:
+    """Get all pages of a PDF from the shared provider"""
+    return _default_provider.get_pages(pdf_path, workers)
+
+
+def get_page_texts(pdf_path: str, strip: bool = False, workers: int = 1) -> Dict[int, str]:
+    """Get non-empty page texts of a PDF from the shared provider"""
+    return _default_provider.get_page_texts(pdf_path, strip=strip, workers=workers)
+
+
+def iter_page_texts(pdf_path: str, strip: bool = False,
+                    read_ahead: int = 8) -> Iterator[Tuple[int, str]]:
+    """Stream non-empty page texts of a PDF from the shared provider"""
+    return _default_provider.iter_page_texts(pdf_path, strip=strip, read_ahead=read_ahead)
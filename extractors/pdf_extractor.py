@@ -7,7 +7,6 @@ Extracts structured data from FlexLink catalog PDFs
 import os
 import re
 import json
-import requests
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from dotenv import load_dotenv
@@ -15,13 +14,9 @@ from dotenv import load_dotenv
 # You'll need to install these
 # pip install PyMuPDF pdfplumber
 
-try:
-    import fitz  # PyMuPDF
-    import pdfplumber
-    PDF_LIBRARIES_AVAILABLE = True
-except ImportError:
-    PDF_LIBRARIES_AVAILABLE = False
-    print("⚠️  PDF libraries not installed. Run: pip install PyMuPDF pdfplumber")
+# Shared page text (one parse per catalog per process)
+from page_text_provider import PDF_LIBRARIES_AVAILABLE, get_page_texts, iter_page_texts
+from rest_client import get_client
 
 
 @dataclass
@@ -53,12 +48,9 @@ class FlexLinkPDFExtractor:
         self.supabase_url = os.getenv('SUPABASE_URL')
         self.supabase_key = os.getenv('SUPABASE_ANON_KEY')
 
-        self.headers = {
-            'apikey': self.supabase_key,
-            'Authorization': f'Bearer {self.supabase_key}',
-            'Content-Type': 'application/json',
-            'Prefer': 'return=minimal'
-        }
+        # Pooled session shared with every other REST caller in the process
+        self.client = get_client(self.supabase_url, self.supabase_key)
+        self.headers = {'Prefer': 'return=minimal'}
 
         # Patterns for extracting different types of content
         self.system_patterns = {
@@ -83,61 +75,35 @@ class FlexLinkPDFExtractor:
             print("❌ PDF libraries not available")
             return {}
 
-        page_texts = {}
-
-        try:
-            # Try with pdfplumber first (better for tables)
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text()
-                    if text:
-                        page_texts[page_num] = text
-
-            print(
-                f"✅ Extracted text from {len(page_texts)} pages using pdfplumber")
-            return page_texts
-
-        except Exception as e:
-            print(f"⚠️  pdfplumber failed: {e}")
-
-            # Fallback to PyMuPDF
-            try:
-                doc = fitz.open(pdf_path)
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    text = page.get_text()
-                    if text.strip():
-                        page_texts[page_num + 1] = text
-
-                doc.close()
-                print(
-                    f"✅ Extracted text from {len(page_texts)} pages using PyMuPDF")
-                return page_texts
-
-            except Exception as e2:
-                print(f"❌ Both PDF extraction methods failed: {e2}")
-                return {}
+        return get_page_texts(pdf_path)
 
     def extract_systems_from_text(self, page_texts: Dict[int, str]) -> List[ExtractedSystem]:
         """Extract system information from text"""
         systems = []
 
         for page_num, text in page_texts.items():
-            lines = text.split('\n')
+            systems.extend(self._extract_systems_from_page(text, page_num))
 
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
+        return systems
 
-                # Look for system headers
-                system_match = re.search(
-                    r'Conveyor\s*system\s*([A-Z]+\d+[A-Z]*)', line, re.IGNORECASE)
-                if system_match:
-                    system = self._extract_system_details(lines, i, page_num)
-                    if system:
-                        systems.append(system)
+    def _extract_systems_from_page(self, text: str, page_num: int) -> List[ExtractedSystem]:
+        """Extract system information from a single page"""
+        systems = []
+        lines = text.split('\n')
 
-                i += 1
+        i = 0
+        while i < len(lines):
+            line = lines[i].strip()
+
+            # Look for system headers
+            system_match = re.search(
+                r'Conveyor\s*system\s*([A-Z]+\d+[A-Z]*)', line, re.IGNORECASE)
+            if system_match:
+                system = self._extract_system_details(lines, i, page_num)
+                if system:
+                    systems.append(system)
+
+            i += 1
 
         return systems
 
@@ -239,14 +205,21 @@ class FlexLinkPDFExtractor:
         tables_data = []
 
         for page_num, text in page_texts.items():
-            lines = text.split('\n')
+            tables_data.extend(self._extract_tables_from_page(text))
 
-            # Look for table indicators
-            for i, line in enumerate(lines):
-                if re.search(r'(technical\s*data|specifications|load\s*per\s*link)', line, re.IGNORECASE):
-                    table_data = self._extract_table_from_text(lines, i)
-                    if table_data:
-                        tables_data.extend(table_data)
+        return tables_data
+
+    def _extract_tables_from_page(self, text: str) -> List[Dict]:
+        """Extract technical data tables from a single page"""
+        tables_data = []
+        lines = text.split('\n')
+
+        # Look for table indicators
+        for i, line in enumerate(lines):
+            if re.search(r'(technical\s*data|specifications|load\s*per\s*link)', line, re.IGNORECASE):
+                table_data = self._extract_table_from_text(lines, i)
+                if table_data:
+                    tables_data.extend(table_data)
 
         return tables_data
 
@@ -286,15 +259,27 @@ class FlexLinkPDFExtractor:
             print(f"❌ File not found: {pdf_path}")
             return {}
 
-        # Extract text
-        page_texts = self.extract_text_from_pdf(pdf_path)
-        if not page_texts:
-            print("❌ No text extracted from PDF")
+        if not PDF_LIBRARIES_AVAILABLE:
+            print("❌ PDF libraries not available")
             return {}
 
-        # Extract structured data
-        systems = self.extract_systems_from_text(page_texts)
-        tables = self.extract_technical_tables(page_texts)
+        # Extract structured data page by page as the text streams in
+        systems = []
+        tables = []
+        page_count = 0
+        try:
+            for page_num, text in iter_page_texts(pdf_path):
+                page_count += 1
+                systems.extend(self._extract_systems_from_page(text, page_num))
+                tables.extend(self._extract_tables_from_page(text))
+        except Exception as e:
+            # A stream that broke off partway is a failure, not a shorter catalog
+            print(f"❌ Error processing PDF: {e}")
+            return {}
+
+        if not page_count:
+            print("❌ No text extracted from PDF")
+            return {}
 
         print(
             f"✅ Extracted {len(systems)} systems and {len(tables)} table entries")
@@ -302,7 +287,7 @@ class FlexLinkPDFExtractor:
         return {
             'systems': systems,
             'tables': tables,
-            'page_count': len(page_texts)
+            'page_count': page_count
         }
 
     def save_extracted_data(self, extracted_data: Dict[str, Any], output_file: str):
@@ -351,9 +336,8 @@ class FlexLinkPDFExtractor:
             db_systems.append(db_system)
 
         try:
-            url = f"{self.supabase_url}/rest/v1/conveyor_systems"
-            response = requests.post(
-                url, headers=self.headers, json=db_systems)
+            response = self.client.post(
+                "conveyor_systems", headers=self.headers, json=db_systems)
 
             if response.status_code in [201, 200]:
                 print(f"✅ Uploaded {len(db_systems)} systems to database")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+FlexLink Image Hash Re-keying
+Renames product_images rows uploaded under an older image_hash to the current one
+
+image_hash used to be the MD5 of the uploaded file (a PNG of the decoded image, later
+the compact encoding). It is now the MD5 of the source image, so rows from older runs
+would no longer match their upsert key. Run database/rekey_image_hashes.sql first, so
+placements and thumbnails follow the renamed rows.
+"""
+
+import hashlib
+import argparse
+from typing import Dict, List, Set
+
+import fitz  # PyMuPDF
+
+from image_extractor import FlexLinkImageExtractor
+from upload_images_to_database import FlexLinkImageUploader
+
+
+def find_old_hashes(pdf_path: str, extractor: FlexLinkImageExtractor) -> Dict[str, str]:
+    """Map the hashes older runs gave the catalog's blueprint images to their current hash"""
+    images = [image for image in extractor.extract_images_from_pdf(pdf_path) if image.is_blueprint]
+
+    old_hashes = {}
+    doc = fitz.open(pdf_path)
+    try:
+        for image in images:
+            # Compact encoding (current settings), then the plain PNG of earlier versions
+            candidates = {hashlib.md5(image.image_data).hexdigest()}
+            pix = extractor._load_pixmap(doc, image.xref) if image.xref else None
+            if pix is not None:
+                try:
+                    candidates.add(hashlib.md5(pix.tobytes("png")).hexdigest())
+                except Exception:
+                    pass
+
+            for old_hash in candidates - {image.image_hash}:
+                old_hashes[old_hash] = image.image_hash
+    finally:
+        doc.close()
+
+    return old_hashes
+
+
+def existing_hashes(uploader: FlexLinkImageUploader, hashes: List[str]) -> Set[str]:
+    """Which of the hashes have a product_images row"""
+    found = set()
+    for start in range(0, len(hashes), 100):
+        response = uploader.client.get(
+            f"product_images?select=image_hash&image_hash=in.({','.join(hashes[start:start + 100])})")
+        response.raise_for_status()
+        found.update(row['image_hash'] for row in response.json())
+    return found
+
+
+def rekey_images(pdf_path: str, dry_run: bool = False) -> Dict[str, int]:
+    """Rename the catalog's rows to their current image_hash; returns counts"""
+    extractor = FlexLinkImageExtractor()
+    uploader = FlexLinkImageUploader()
+
+    old_hashes = find_old_hashes(pdf_path, extractor)
+    found = existing_hashes(uploader, sorted(set(old_hashes) | set(old_hashes.values())))
+
+    counts = {'renamed': 0, 'duplicates_removed': 0, 'failed': 0}
+    for old_hash, image_hash in sorted(old_hashes.items()):
+        if old_hash not in found:
+            continue
+
+        if image_hash in found:
+            # Uploaded again under the new hash already: the old row is a duplicate
+            print(f"🔄 {old_hash} is a duplicate of {image_hash}")
+            if not dry_run:
+                if uploader.delete_image(old_hash):
+                    counts['duplicates_removed'] += 1
+                else:
+                    counts['failed'] += 1
+            continue
+
+        print(f"🔄 {old_hash} -> {image_hash}")
+        if dry_run:
+            continue
+        response = uploader.client.patch(f"product_images?image_hash=eq.{old_hash}",
+                                         json={'image_hash': image_hash})
+        if response.status_code in (200, 204):
+            counts['renamed'] += 1
+            found.add(image_hash)
+        else:
+            print(f"❌ Error renaming {old_hash}: HTTP {response.status_code}: {response.text[:200]}")
+            counts['failed'] += 1
+
+    return counts
+
+
+def main():
+    """Command-line interface for re-keying"""
+    parser = argparse.ArgumentParser(
+        description="Rename images uploaded under an older image_hash to the current one")
+    parser.add_argument("pdf_file", help="Catalog PDF the images were extracted from")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only list the rows that would be renamed or removed")
+
+    args = parser.parse_args()
+
+    counts = rekey_images(args.pdf_file, args.dry_run)
+
+    print(f"\n📊 Re-keying summary:")
+    print(f"   Renamed: {counts['renamed']}")
+    print(f"   Duplicates removed: {counts['duplicates_removed']}")
+    print(f"   Failed: {counts['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+FlexLink Supabase REST Transport
+One pooled keep-alive session for every PostgREST and Storage call: per-host connection
+limits, timeouts, gzip bodies, and request counts and latency per endpoint
+"""
+
+import os
+import gzip
+from json import dumps
+import time
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+DEFAULT_TIMEOUT = (5, 60)  # Seconds to connect, seconds to wait for the response
+DEFAULT_POOL_SIZE = 10  # Keep-alive connections per host
+GZIP_MIN_BYTES = 1024  # Smaller request bodies are sent as they are
+
+_clients: Dict[Tuple[str, str], 'FlexLinkRestClient'] = {}
+_clients_lock = threading.Lock()
+
+
+class FlexLinkRestClient:
+    def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, pool_size: int = DEFAULT_POOL_SIZE,
+                 gzip_requests: Optional[bool] = None):
+        """
+        Open a session on a Supabase project
+
+        Args:
+            supabase_url, supabase_key: Project URL and key (SUPABASE_URL / SUPABASE_ANON_KEY by default)
+            timeout: Default (connect, read) timeout of every request
+            pool_size: Connections kept open per host; further concurrent requests wait
+                for a free one instead of opening more
+            gzip_requests: Gzip request bodies of GZIP_MIN_BYTES or more. Only enable it
+                when the server (or a proxy in front of it) accepts Content-Encoding: gzip
+                (SUPABASE_GZIP_REQUESTS=1 by default); responses are always requested and
+                decoded as gzip.
+        """
+        load_dotenv()
+        self.supabase_url = (supabase_url or os.getenv('SUPABASE_URL') or '').rstrip('/')
+        self.supabase_key = supabase_key or os.getenv('SUPABASE_ANON_KEY') or ''
+        self.timeout = timeout
+        if gzip_requests is None:
+            gzip_requests = os.getenv('SUPABASE_GZIP_REQUESTS', '') == '1'
+        self.gzip_requests = gzip_requests
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'apikey': self.supabase_key,
+            'Authorization': f'Bearer {self.supabase_key}',
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip'
+        })
+
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.lock = threading.Lock()
+
+    def url(self, path: str, api: str = 'rest') -> str:
+        """Full URL of a REST path ('product_images', 'rpc/get_image_stats', ...) or Storage path"""
+        if path.startswith('http'):
+            return path
+        return f"{self.supabase_url}/{api}/v1/{path.lstrip('/')}"
+
+    def request(self, method: str, path: str, json: Any = None,
+                data: Optional[Union[str, bytes]] = None, headers: Optional[Dict[str, str]] = None,
+                api: str = 'rest', **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session and record it
+
+        json is serialised here (data is sent as it is); REST bodies are gzipped when
+        gzip_requests is on. api='storage' addresses the Storage API, whose object
+        requests are recorded per bucket. Other keyword arguments (params, timeout, ...)
+        go to requests.
+        """
+        headers = dict(headers or {})
+        if json is not None:
+            data = dumps(json)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if data is not None and api == 'rest' and self.gzip_requests and len(data) >= GZIP_MIN_BYTES:
+            data = gzip.compress(data, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+
+        kwargs.setdefault('timeout', self.timeout)
+        endpoint = path.split('?', 1)[0].lstrip('/')
+        if api != 'rest':
+            endpoint = f"{api}/{'/'.join(endpoint.split('/')[:2])}"
+        endpoint = f"{method.upper()} {endpoint}"
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.url(path, api), data=data, headers=headers, **kwargs)
+        except Exception:
+            self._record(endpoint, time.perf_counter() - start, len(data or b''), error=True)
+            raise
+
+        self._record(endpoint, time.perf_counter() - start, len(data or b''),
+                     error=response.status_code >= 400)
+        return response
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path: str, json: Any = None, **kwargs) -> requests.Response:
+        return self.request('POST', path, json=json, **kwargs)
+
+    def patch(self, path: str, json: Any = None, **kwargs) -> requests.Response:
+        return self.request('PATCH', path, json=json, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request('DELETE', path, **kwargs)
+
+    def storage(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Call the Storage API ('object/<bucket>/<key>', 'bucket', ...)"""
+        return self.request(method, path, api='storage', **kwargs)
+
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        """Call a database function"""
+        return self.post(f"rpc/{function}", params or {}, **kwargs)
+
+    def _record(self, endpoint: str, seconds: float, sent_bytes: int, error: bool):
+        """Add one request to the per-endpoint statistics"""
+        with self.lock:
+            stats = self.stats.setdefault(endpoint, {
+                'requests': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'sent_bytes': 0})
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['sent_bytes'] += sent_bytes
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Request count, errors, latency (total/average/max seconds) and bytes sent per endpoint"""
+        with self.lock:
+            return {endpoint: {**stats, 'avg_seconds': stats['total_seconds'] / stats['requests']}
+                    for endpoint, stats in self.stats.items()}
+
+    def print_stats(self):
+        """Print the per-endpoint request statistics"""
+        stats = self.get_stats()
+        if not stats:
+            return
+
+        print(f"🌐 REST Requests:")
+        for endpoint, endpoint_stats in sorted(stats.items(), key=lambda item: -item[1]['total_seconds']):
+            errors = f", {endpoint_stats['errors']} failed" if endpoint_stats['errors'] else ""
+            print(f"   {endpoint}: {endpoint_stats['requests']} requests{errors}, "
+                  f"avg {endpoint_stats['avg_seconds'] * 1000:.0f} ms, "
+                  f"max {endpoint_stats['max_seconds'] * 1000:.0f} ms, "
+                  f"{endpoint_stats['sent_bytes'] / (1024 * 1024):.1f} MB sent")
+
+
+def get_client(supabase_url: Optional[str] = None, supabase_key: Optional[str] = None) -> FlexLinkRestClient:
+    """Shared client of a project, so every caller in the process reuses one connection pool"""
+    load_dotenv()
+    key = ((supabase_url or os.getenv('SUPABASE_URL') or '').rstrip('/'),
+           supabase_key or os.getenv('SUPABASE_ANON_KEY') or '')
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = FlexLinkRestClient(*key)
+        return _clients[key]
@@ -6,9 +6,9 @@ Bypasses Python client dependency issues
 
 import os
 import json
-import requests
 from typing import Dict, List, Any
 from dotenv import load_dotenv
+from rest_client import get_client
 
 # Load environment variables
 load_dotenv()
@@ -24,12 +24,9 @@ class SimpleFlexLinkExtractor:
             print("❌ Missing Supabase credentials in .env file")
             return
 
-        self.headers = {
-            'apikey': self.supabase_key,
-            'Authorization': f'Bearer {self.supabase_key}',
-            'Content-Type': 'application/json',
-            'Prefer': 'return=minimal'
-        }
+        # Pooled session shared with every other REST caller in the process
+        self.client = get_client(self.supabase_url, self.supabase_key)
+        self.headers = {'Prefer': 'return=minimal'}
 
         # Test connection
         self.test_connection()
@@ -37,8 +34,7 @@ class SimpleFlexLinkExtractor:
     def test_connection(self):
         """Test the REST API connection"""
         try:
-            url = f"{self.supabase_url}/rest/v1/conveyor_systems?select=count"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get("conveyor_systems?select=count", headers=self.headers)
 
             if response.status_code == 200:
                 print("✅ Connected to Supabase REST API")
@@ -54,7 +50,6 @@ class SimpleFlexLinkExtractor:
     def insert_components_batch(self, components: List[Dict]) -> bool:
         """Insert components using REST API"""
         try:
-            url = f"{self.supabase_url}/rest/v1/components"
 
             # Insert in smaller batches to avoid API limits
             batch_size = 5
@@ -63,7 +58,7 @@ class SimpleFlexLinkExtractor:
             for i in range(0, len(components), batch_size):
                 batch = components[i:i + batch_size]
 
-                response = requests.post(url, headers=self.headers, json=batch)
+                response = self.client.post("components", headers=self.headers, json=batch)
 
                 if response.status_code in [201, 200]:
                     total_inserted += len(batch)
@@ -303,8 +298,7 @@ class SimpleFlexLinkExtractor:
         """Check what's currently in the database"""
         try:
             # Check systems
-            systems_url = f"{self.supabase_url}/rest/v1/conveyor_systems?select=code,name"
-            systems_response = requests.get(systems_url, headers=self.headers)
+            systems_response = self.client.get("conveyor_systems?select=code,name", headers=self.headers)
 
             if systems_response.status_code == 200:
                 systems = systems_response.json()
@@ -313,9 +307,8 @@ class SimpleFlexLinkExtractor:
                     print(f"   • {system['code']}: {system['name']}")
 
             # Check components
-            components_url = f"{self.supabase_url}/rest/v1/components?select=system_code,component_type&limit=10"
-            components_response = requests.get(
-                components_url, headers=self.headers)
+            components_response = self.client.get(
+                "components?select=system_code,component_type&limit=10", headers=self.headers)
 
             if components_response.status_code == 200:
                 components = components_response.json()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+FlexLink Page Span Index
+Uniform grid over the text spans of a page, so image caption lookups don't rescan the page
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+
+class SpanIndex:
+    def __init__(self, page: fitz.Page, cell_size: float = 64.0):
+        """
+        Index the text spans of a page
+
+        Args:
+            page: Page whose get_text("dict") is extracted once
+            cell_size: Grid cell size in points
+        """
+        self.cell_size = cell_size
+        self.spans: List[Tuple[fitz.Rect, str]] = []
+        self.grid: Dict[Tuple[int, int], List[int]] = {}
+
+        for block in page.get_text("dict")["blocks"]:
+            if "lines" in block:
+                for line in block["lines"]:
+                    for span in line["spans"]:
+                        self._add(fitz.Rect(span["bbox"]), span["text"])
+
+        if self.grid:
+            columns = [column for column, _row in self.grid]
+            rows = [row for _column, row in self.grid]
+            self.bounds = (min(columns), min(rows), max(columns), max(rows))
+
+    def _add(self, rect: fitz.Rect, text: str):
+        """Register a span in every cell its bbox touches"""
+        index = len(self.spans)
+        self.spans.append((rect, text))
+
+        if rect.is_empty or rect.is_infinite:
+            return
+
+        x0, y0, x1, y1 = self._cells(rect)
+        for column in range(x0, x1 + 1):
+            for row in range(y0, y1 + 1):
+                self.grid.setdefault((column, row), []).append(index)
+
+    def _cells(self, rect: fitz.Rect) -> Tuple[int, int, int, int]:
+        """Grid cells covered by a rect"""
+        return (math.floor(rect.x0 / self.cell_size), math.floor(rect.y0 / self.cell_size),
+                math.floor(rect.x1 / self.cell_size), math.floor(rect.y1 / self.cell_size))
+
+    def query(self, rect: fitz.Rect) -> List[str]:
+        """Texts of the spans intersecting rect, in page order"""
+        if not self.grid or rect.is_empty:
+            return []
+
+        # Only visit cells that exist on this page
+        x0, y0, x1, y1 = self._cells(rect)
+        min_column, min_row, max_column, max_row = self.bounds
+        candidates = set()
+        for column in range(max(x0, min_column), min(x1, max_column) + 1):
+            for row in range(max(y0, min_row), min(y1, max_row) + 1):
+                candidates.update(self.grid.get((column, row), ()))
+
+        return [self.spans[index][1] for index in sorted(candidates)
+                if self.spans[index][0].intersects(rect)]
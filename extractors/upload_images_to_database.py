@@ -6,10 +6,37 @@ Uploads extracted images and blueprint drawings to the database
 
 import os
 import json
-import requests
-from typing import Dict, List, Any, Optional
+import base64
+import threading
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 from image_extractor import FlexLinkImageExtractor, ExtractedImage
+from rest_client import get_client
+from async_uploader import FlexLinkAsyncUploader, DEFAULT_MAX_IN_FLIGHT, DEFAULT_MAX_RETRIES
+from object_storage import (CONTENT_TYPES, get_storage_backend, image_object_key, stored_object_fields,
+                            thumbnail_object_key)
+
+# Unique key each table is upserted on: re-uploading an image updates its rows in place
+UPSERT_KEYS = {
+    'product_images': 'image_hash',
+    'product_image_placements': 'image_hash,page_number,x_coord,y_coord',
+    'product_image_thumbnails': 'image_hash,size'
+}
+
+
+
+def placement_coordinate(value: float) -> float:
+    """
+    A placement coordinate or size as the DECIMAL(10,2) columns store it: the decimal text
+    rounded half away from zero, like Postgres. Rows are uploaded with these values and
+    placements are matched on them, so both sides agree on ties such as 72.125 -> 72.13.
+    """
+    return float(Decimal(str(value)).quantize(Decimal('0.01'), ROUND_HALF_UP))
+
+
+# Budget of one bulk batch (image file bytes, or JSON bytes of one POST); a single larger item goes on its own
+DEFAULT_BATCH_BYTES = 4 * 1024 * 1024
 
 
 class FlexLinkImageUploader:
@@ -22,21 +49,38 @@ class FlexLinkImageUploader:
         if not self.supabase_url or not self.supabase_key:
             raise ValueError("❌ Missing Supabase credentials in .env file")
 
-        self.headers = {
-            'apikey': self.supabase_key,
-            'Authorization': f'Bearer {self.supabase_key}',
-            'Content-Type': 'application/json',
-            'Prefer': 'return=minimal'
-        }
+        # Pooled session shared with every other REST caller in the process
+        self.client = get_client(self.supabase_url, self.supabase_key)
+        self.headers = {'Prefer': 'return=minimal'}
+        self.upsert_headers = {'Prefer': 'resolution=merge-duplicates,return=minimal'}
+        # Image files go to object storage; rows only keep their key
+        self.storage = get_storage_backend(client=self.client)
 
         self.image_extractor = FlexLinkImageExtractor()
-
-    def upload_images_to_database(self, images: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Upload a list of images to the database"""
+        self.max_batch_bytes = DEFAULT_BATCH_BYTES
+        self.max_in_flight = DEFAULT_MAX_IN_FLIGHT
+        self.requests_per_second = None  # No rate limit
+        self.max_retries = DEFAULT_MAX_RETRIES
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    def upload_images_to_database(self, images: List[Dict[str, Any]], bulk: bool = True) -> Dict[str, Any]:
+        """
+        Upload a list of images to the database
+
+        Image files are stored in object storage first, then their rows are upserted.
+        With bulk=True (default) images are uploaded in batches of up to max_batch_bytes of
+        files, whose rows (then placements and thumbnails) go in array-body POSTs, with
+        max_in_flight batches sent concurrently; bulk=False uploads each image with its
+        own requests.
+        """
         if not images:
             print("❌ No images to upload")
             return {'success': False, 'message': 'No images provided'}
 
+        if bulk:
+            return self._upload_images_bulk(images)
+
         print(f"🔄 Uploading {len(images)} images to database...")
 
         success_count = 0
@@ -72,42 +116,235 @@ class FlexLinkImageUploader:
             'errors': errors
         }
 
+        self._print_summary(summary)
+        return summary
+
+    def _upload_images_bulk(self, images: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Upload images in byte-budgeted batches; each batch's placements and thumbnails follow it"""
+        print(f"🔄 Uploading {len(images)} images to database in batches of up to "
+              f"{self.max_batch_bytes / (1024 * 1024):.1f} MB ({self.max_in_flight} in flight)...")
+        requests_before = self.request_count
+
+        errors: Dict[str, str] = {}
+
+        def batches():
+            """Group images into batches of up to max_batch_bytes of image files"""
+            batch: List[Dict[str, Any]] = []
+            batch_bytes = 0
+            for image_data in images:
+                file_bytes = len(image_data['image_data']) * 3 // 4  # Base64: 4 characters per 3 bytes
+                if batch and batch_bytes + file_bytes > self.max_batch_bytes:
+                    yield batch
+                    batch, batch_bytes = [], 0
+                batch.append(image_data)
+                batch_bytes += file_bytes
+            if batch:
+                yield batch
+
+        def upload(batch: List[Dict[str, Any]]) -> bool:
+            return self._upload_image_batch(batch, errors)
+
+        uploader = FlexLinkAsyncUploader(
+            max_in_flight=self.max_in_flight,
+            requests_per_second=self.requests_per_second,
+            max_retries=self.max_retries)
+        uploader.upload_batches(batches(), upload, lambda *_result: None)
+
+        summary = {
+            'success': not errors,
+            'total_images': len(images),
+            'success_count': len(images) - len(errors),
+            'error_count': len(errors),
+            'errors': [f"Image {image_hash}: {message}" for image_hash, message in errors.items()],
+            'requests': self.request_count - requests_before
+        }
+
+        self._print_summary(summary)
+        print(f"   Requests: {summary['requests']}")
+        return summary
+
+    def _upload_image_batch(self, batch: List[Dict[str, Any]], errors: Dict[str, str]) -> bool:
+        """
+        Store one batch of image and thumbnail files, upsert the rows of the images that
+        were stored, then the placements and thumbnails of those that went in
+
+        Every step is an upsert, so sending an image again is safe: images with a step that
+        failed on a transient error (connection, timeout, HTTP 5xx/429) are left in batch
+        and False is returned, so the batch is retried with just them; other failures are
+        final and only recorded in errors.
+        """
+        for image_data in batch:
+            errors.pop(image_data['image_hash'], None)
+
+        failed: Dict[int, str] = {}
+        stored: List[int] = []
+        rows: List[str] = []
+        thumbnail_rows: Dict[str, List[Dict[str, Any]]] = {}
+        for index, image_data in enumerate(batch):
+            try:
+                image_row = self._image_row(image_data, self._store_image(image_data))
+                thumbnail_rows[image_data['image_hash']] = self._store_thumbnails(image_data)
+                rows.append(json.dumps(image_row))
+                stored.append(index)
+            except Exception as e:
+                failed[index] = f"storage: {e}"
+
+        for row_index, message in self._post_rows('product_images', rows).items():
+            failed[stored[row_index]] = message
+        for index, message in failed.items():
+            errors[batch[index]['image_hash']] = message
+
+        uploaded = [image_data for index, image_data in enumerate(batch) if index not in failed]
+        transient = {batch[index]['image_hash'] for index, message in failed.items()
+                     if self._is_transient(message.replace('storage: ', '', 1))}
+        for table, row_builder in (('product_image_placements', self._placement_rows),
+                                   ('product_image_thumbnails',
+                                    lambda image_data: thumbnail_rows[image_data['image_hash']])):
+            owners = []
+            rows = []
+            for image_data in uploaded:
+                for row in row_builder(image_data):
+                    owners.append(image_data['image_hash'])
+                    rows.append(json.dumps(row))
+            for index, message in self._post_rows(table, rows).items():
+                errors.setdefault(owners[index], f"{table}: {message}")
+                if self._is_transient(message):
+                    transient.add(owners[index])
+
+        batch_bytes = sum(len(image_data['image_data']) * 3 // 4 for image_data in batch)
+        print(f"✅ Uploaded batch: {len(uploaded)}/{len(batch)} images "
+              f"({batch_bytes / (1024 * 1024):.1f} MB)")
+
+        retry = [image_data for image_data in batch if image_data['image_hash'] in transient]
+        batch[:] = retry
+        return not retry
+
+    def _store_image(self, image_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Put the image file in object storage; returns the columns describing it"""
+        data = base64.b64decode(image_data['image_data'])
+        key = image_object_key(image_data['image_hash'], image_data['image_format'])
+        self.storage.put(key, data, CONTENT_TYPES.get(image_data['image_format'], 'application/octet-stream'))
+        return stored_object_fields(key, data)
+
+    def _store_thumbnails(self, image_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Put the thumbnail files in object storage; returns their product_image_thumbnails rows"""
+        rows = []
+        for thumbnail in image_data.get('thumbnails') or []:
+            key = thumbnail_object_key(image_data['image_hash'], thumbnail['size'], thumbnail['image_format'])
+            self.storage.put(key, base64.b64decode(thumbnail['image_data']),
+                             CONTENT_TYPES.get(thumbnail['image_format'], 'application/octet-stream'))
+            rows.append({
+                'image_hash': image_data['image_hash'],
+                'size': thumbnail['size'],
+                'width': thumbnail['width'],
+                'height': thumbnail['height'],
+                'image_format': thumbnail['image_format'],
+                'storage_key': key
+            })
+        return rows
+
+    def _post_rows(self, table: str, rows: List[str]) -> Dict[int, str]:
+        """
+        Upsert JSON-encoded rows as array bodies of up to max_batch_bytes
+
+        A batch that is rejected is split in halves and retried, down to single rows,
+        so one bad row doesn't fail its neighbours. Returns {row index: error} of the
+        rows that failed on their own.
+        """
+        failed: Dict[int, str] = {}
+        start = 0
+        while start < len(rows):
+            end = start
+            size = 2
+            while end < len(rows) and (end == start or size + len(rows[end]) + 1 <= self.max_batch_bytes):
+                size += len(rows[end]) + 1
+                end += 1
+            self._post_batch(table, rows, start, end, failed)
+            start = end
+        return failed
+
+    def _post_batch(self, table: str, rows: List[str], start: int, end: int, failed: Dict[int, str]):
+        """POST rows[start:end] as one array, splitting it when the server rejects it"""
+        try:
+            with self.lock:
+                self.request_count += 1
+            response = self.client.post(
+                self._upsert_path(table),
+                headers=self.upsert_headers,
+                data=f"[{','.join(rows[start:end])}]".encode('utf-8')
+            )
+            if response.status_code in (200, 201):
+                return
+            message = f"HTTP {response.status_code}: {response.text}"
+        except Exception as e:
+            message = str(e)
+
+        # Splitting doesn't help when the server or the connection is the problem
+        if end - start == 1 or self._is_transient(message):
+            for index in range(start, end):
+                failed[index] = message
+            return
+
+        middle = (start + end) // 2
+        print(f"⚠️ Batch of {end - start} rows to {table} failed ({message[:120]}); retrying in halves")
+        self._post_batch(table, rows, start, middle, failed)
+        self._post_batch(table, rows, middle, end, failed)
+
+    @staticmethod
+    def _upsert_path(table: str) -> str:
+        """Insert path of a table that updates rows whose unique key exists already"""
+        return f"{table}?on_conflict={UPSERT_KEYS[table]}"
+
+    @staticmethod
+    def _is_transient(message: str) -> bool:
+        """Whether a failure may succeed on retry (no HTTP status, 5xx or 429)"""
+        return not message.startswith('HTTP ') or message.startswith(('HTTP 5', 'HTTP 429'))
+
+    def _print_summary(self, summary: Dict[str, Any]):
+        """Print the upload summary"""
         print(f"📊 Upload Summary:")
         print(f"   Total images: {summary['total_images']}")
         print(f"   Successfully uploaded: {summary['success_count']}")
         print(f"   Failed uploads: {summary['error_count']}")
 
-        return summary
+    def _image_row(self, image_data: Dict[str, Any], stored: Dict[str, Any]) -> Dict[str, Any]:
+        """product_images row of a prepared image whose file is stored (see _store_image)"""
+        return {
+            'image_hash': image_data['image_hash'],
+            'page_number': image_data['page_number'],
+            'x_coord': image_data['x_coord'],
+            'y_coord': image_data['y_coord'],
+            'width': image_data['width'],
+            'height': image_data['height'],
+            'image_format': image_data['image_format'],
+            'associated_text': image_data.get('associated_text', ''),
+            'product_code': image_data.get('product_code', ''),
+            'component_type': image_data.get('component_type', ''),
+            'is_blueprint': image_data.get('is_blueprint', True),
+            'image_quality_score': image_data.get('image_quality_score', 0.8),
+            'original_size_bytes': image_data.get('original_size_bytes'),
+            'image_source': image_data.get('image_source', 'raster'),
+            **stored  # storage_key, encoded_size_bytes, pixel_width/height, content_sha256
+        }
 
     def _upload_single_image(self, image_data: Dict[str, Any]) -> Dict[str, Any]:
         """Upload a single image to the database"""
         try:
-            # Prepare the data for upload
-            upload_data = {
-                'image_hash': image_data['image_hash'],
-                'page_number': image_data['page_number'],
-                'x_coord': image_data['x_coord'],
-                'y_coord': image_data['y_coord'],
-                'width': image_data['width'],
-                'height': image_data['height'],
-                'image_format': image_data['image_format'],
-                'image_data': image_data['image_data'],  # Base64 encoded
-                'associated_text': image_data.get('associated_text', ''),
-                'product_code': image_data.get('product_code', ''),
-                'component_type': image_data.get('component_type', ''),
-                'is_blueprint': image_data.get('is_blueprint', True),
-                'image_quality_score': image_data.get('image_quality_score', 0.8)
-            }
-
-            # Make the API call
-            response = requests.post(
-                f"{self.supabase_url}/rest/v1/product_images",
-                headers=self.headers,
-                json=upload_data
+            # Store the file, then make the API call
+            stored = self._store_image(image_data)
+            with self.lock:
+                self.request_count += 1
+            response = self.client.post(
+                self._upsert_path("product_images"),
+                headers=self.upsert_headers,
+                json=self._image_row(image_data, stored)
             )
 
-            if response.status_code == 201:
-                return {'success': True, 'message': 'Image uploaded successfully'}
+            if response.status_code in (200, 201):
+                result = self.upload_image_placements(image_data)
+                if result['success']:
+                    result = self.upload_image_thumbnails(image_data)
+                return result
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
                 return {'success': False, 'message': error_msg}
@@ -115,6 +352,84 @@ class FlexLinkImageUploader:
         except Exception as e:
             return {'success': False, 'message': str(e)}
 
+    def upload_image_placements(self, image_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Record every page/bbox an uploaded image is drawn at"""
+        placement_rows = self._placement_rows(image_data)
+        if not placement_rows:
+            return {'success': True, 'message': 'Image uploaded successfully'}
+
+        # One request for all placements of the image
+        with self.lock:
+            self.request_count += 1
+        response = self.client.post(
+            self._upsert_path("product_image_placements"),
+            headers=self.upsert_headers,
+            json=placement_rows
+        )
+
+        if response.status_code in (200, 201):
+            return {'success': True, 'message': f'Image uploaded with {len(placement_rows)} placements'}
+        else:
+            error_msg = f"Placements HTTP {response.status_code}: {response.text}"
+            return {'success': False, 'message': error_msg}
+
+    def upload_image_thumbnails(self, image_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Store the thumbnail pyramid of an uploaded image (files in object storage, rows in the table)"""
+        thumbnail_rows = self._store_thumbnails(image_data)
+        if not thumbnail_rows:
+            return {'success': True, 'message': 'Image uploaded successfully'}
+
+        with self.lock:
+            self.request_count += 1
+        response = self.client.post(
+            self._upsert_path("product_image_thumbnails"),
+            headers=self.upsert_headers,
+            json=thumbnail_rows
+        )
+
+        if response.status_code in (200, 201):
+            return {'success': True, 'message': f'Image uploaded with {len(thumbnail_rows)} thumbnails'}
+        else:
+            error_msg = f"Thumbnails HTTP {response.status_code}: {response.text}"
+            return {'success': False, 'message': error_msg}
+
+    def upload_placements(self, placements: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Upsert placements (each with its image_hash) of images that are already uploaded,
+        in array-body POSTs
+        """
+        rows = [json.dumps(self._placement_row(placement['image_hash'], placement))
+                for placement in placements]
+        failed = self._post_rows('product_image_placements', rows)
+        for message in sorted(set(failed.values())):
+            print(f"❌ Error uploading placements: {message}")
+
+        return {
+            'success': not failed,
+            'success_count': len(rows) - len(failed),
+            'error_count': len(failed)
+        }
+
+    def _placement_rows(self, image_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """product_image_placements rows of a prepared image"""
+        return [self._placement_row(image_data['image_hash'], placement)
+                for placement in image_data.get('placements') or []]
+
+    @staticmethod
+    def _placement_row(image_hash: str, placement: Dict[str, Any]) -> Dict[str, Any]:
+        """product_image_placements row of one page/bbox an image is drawn at"""
+        return {
+            'image_hash': image_hash,
+            'page_number': placement['page_number'],
+            'x_coord': placement_coordinate(placement['x_coord']),
+            'y_coord': placement_coordinate(placement['y_coord']),
+            'width': placement_coordinate(placement['width']),
+            'height': placement_coordinate(placement['height']),
+            'associated_text': placement.get('associated_text', ''),
+            'product_code': placement.get('product_code', ''),
+            'component_type': placement.get('component_type', '')
+        }
+
     def process_and_upload_pdf(self, pdf_path: str, save_local: bool = True) -> Dict[str, Any]:
         """Process PDF and upload extracted images to database"""
         print(f"🔄 Processing PDF: {pdf_path}")
@@ -145,8 +460,8 @@ class FlexLinkImageUploader:
     def get_image_statistics(self) -> Dict[str, Any]:
         """Get statistics about images in the database"""
         try:
-            response = requests.get(
-                f"{self.supabase_url}/rest/v1/rpc/get_image_stats",
+            response = self.client.get(
+                "rpc/get_image_stats",
                 headers=self.headers
             )
 
@@ -176,8 +491,8 @@ class FlexLinkImageUploader:
             if is_blueprint is not None:
                 params['p_is_blueprint'] = is_blueprint
 
-            response = requests.get(
-                f"{self.supabase_url}/rest/v1/rpc/search_product_images",
+            response = self.client.get(
+                "rpc/search_product_images",
                 headers=self.headers,
                 params=params
             )
@@ -195,8 +510,8 @@ class FlexLinkImageUploader:
     def get_product_images(self, product_code: str) -> List[Dict[str, Any]]:
         """Get all images for a specific product"""
         try:
-            response = requests.get(
-                f"{self.supabase_url}/rest/v1/rpc/get_product_images",
+            response = self.client.get(
+                "rpc/get_product_images",
                 headers=self.headers,
                 params={'p_product_code': product_code}
             )
@@ -215,8 +530,8 @@ class FlexLinkImageUploader:
     def get_blueprint_images(self, component_type: str) -> List[Dict[str, Any]]:
         """Get blueprint images for a specific component type"""
         try:
-            response = requests.get(
-                f"{self.supabase_url}/rest/v1/rpc/get_blueprint_images",
+            response = self.client.get(
+                "rpc/get_blueprint_images",
                 headers=self.headers,
                 params={'p_component_type': component_type}
             )
@@ -233,14 +548,20 @@ class FlexLinkImageUploader:
             return []
 
     def delete_image(self, image_hash: str) -> bool:
-        """Delete an image from the database"""
+        """Delete an image from the database (its placements cascade) and its stored files"""
         try:
-            response = requests.delete(
-                f"{self.supabase_url}/rest/v1/product_images?image_hash=eq.{image_hash}",
-                headers=self.headers
+            # Thumbnail rows first, while they still name their files
+            thumbnails = self._delete_thumbnail_rows(image_hash)
+            if thumbnails is None:
+                return False
+
+            response = self.client.delete(
+                f"product_images?image_hash=eq.{image_hash}&select=storage_key",
+                headers={'Prefer': 'return=representation'}
             )
 
-            if response.status_code == 204:
+            if response.status_code == 200:
+                self._delete_stored_files(response.json() + thumbnails)
                 print(f"✅ Deleted image with hash: {image_hash}")
                 return True
             else:
@@ -251,15 +572,71 @@ class FlexLinkImageUploader:
             print(f"❌ Error deleting image: {e}")
             return False
 
+    def delete_placements(self, placements: List[Dict[str, Any]]) -> bool:
+        """
+        Delete single placements (the images stay)
+
+        The rows of each image and page are looked up, matched on their rounded
+        coordinates (see placement_coordinate) and deleted by id, so no float is compared
+        in SQL. Placements without a row are gone already. Fails if a delete removes
+        fewer rows than it was given.
+        """
+        try:
+            wanted: Dict[Tuple[str, int], set] = {}
+            for placement in placements:
+                wanted.setdefault((placement['image_hash'], placement['page_number']), set()).add(
+                    (placement_coordinate(placement['x_coord']), placement_coordinate(placement['y_coord'])))
+
+            ids = []
+            pages = sorted(wanted)
+            for start in range(0, len(pages), 50):
+                conditions = ','.join(f"and(image_hash.eq.{image_hash},page_number.eq.{page_number})"
+                                      for image_hash, page_number in pages[start:start + 50])
+                response = self.client.get(
+                    f"product_image_placements?select=id,image_hash,page_number,x_coord,y_coord&or=({conditions})")
+                if response.status_code != 200:
+                    print(f"❌ Error looking up placements: HTTP {response.status_code}")
+                    return False
+                ids.extend(row['id'] for row in response.json()
+                           if (placement_coordinate(row['x_coord']), placement_coordinate(row['y_coord']))
+                           in wanted.get((row['image_hash'], row['page_number']), ()))
+
+            for start in range(0, len(ids), 200):
+                chunk = ids[start:start + 200]
+                response = self.client.delete(
+                    f"product_image_placements?id=in.({','.join(map(str, chunk))})&select=id",
+                    headers={'Prefer': 'return=representation'}
+                )
+                if response.status_code != 200:
+                    print(f"❌ Error deleting placements: HTTP {response.status_code}")
+                    return False
+                deleted = len(response.json())
+                if deleted != len(chunk):
+                    print(f"❌ Deleted {deleted} of {len(chunk)} placements")
+                    return False
+
+            if len(ids) < len(placements):
+                print(f"⚠️  {len(placements) - len(ids)} placements to delete had no row (deleted already)")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error deleting placements: {e}")
+            return False
+
     def clear_all_images(self) -> bool:
         """Clear all images from the database (use with caution!)"""
         try:
-            response = requests.delete(
-                f"{self.supabase_url}/rest/v1/product_images",
-                headers=self.headers
+            thumbnails = self._delete_thumbnail_rows()
+            if thumbnails is None:
+                return False
+
+            response = self.client.delete(
+                "product_images?select=storage_key",
+                headers={'Prefer': 'return=representation'}
             )
 
-            if response.status_code == 204:
+            if response.status_code == 200:
+                self._delete_stored_files(response.json() + thumbnails)
                 print("✅ Cleared all images from database")
                 return True
             else:
@@ -270,6 +647,30 @@ class FlexLinkImageUploader:
             print(f"❌ Error clearing images: {e}")
             return False
 
+    def _delete_thumbnail_rows(self, image_hash: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Delete the thumbnail rows of an image (of all images without one); returns their
+        storage_keys, or None if the delete failed
+        """
+        filters = f"image_hash=eq.{image_hash}&" if image_hash else ""
+        response = self.client.delete(
+            f"product_image_thumbnails?{filters}select=storage_key",
+            headers={'Prefer': 'return=representation'}
+        )
+        if response.status_code != 200:
+            print(f"❌ Error deleting thumbnails: HTTP {response.status_code}")
+            return None
+        return response.json()
+
+    def _delete_stored_files(self, rows: List[Dict[str, Any]]):
+        """Remove the stored image and thumbnail files of deleted rows (a failure leaves orphans, not broken rows)"""
+        keys = [row['storage_key'] for row in rows if row.get('storage_key')]
+        try:
+            for start in range(0, len(keys), 1000):
+                self.storage.delete(keys[start:start + 1000])
+        except Exception as e:
+            print(f"⚠️ Could not delete stored image files: {e}")
+
 
 def main():
     """Main function for testing the image uploader"""
@@ -14,6 +14,7 @@ from dotenv import load_dotenv
 
 # Import our component extractor
 from component_extractor import ComponentSpecificationExtractor, ComponentSpecification
+from async_uploader import FlexLinkAsyncUploader, DEFAULT_MAX_IN_FLIGHT
 
 
 class ResilientDatabaseUploader:
@@ -25,6 +26,8 @@ class ResilientDatabaseUploader:
         self.failed_components = 0
         self.retry_count = 0
         self.max_retries = 3
+        self.max_in_flight = DEFAULT_MAX_IN_FLIGHT
+        self.requests_per_second = None  # No rate limit
 
     def upload_from_extraction(self, extraction_dir: str = "data/large_catalog_extraction",
                                batch_size: int = 20, resume: bool = True) -> Dict[str, Any]:
@@ -118,7 +121,7 @@ class ResilientDatabaseUploader:
     def _upload_batches(self, components: List[ComponentSpecification],
                         batch_size: int, extraction_path: Path,
                         progress_file: Path, uploaded_ids: set) -> Dict[str, Any]:
-        """Upload components in batches with retry logic"""
+        """Upload components in concurrent batches with retry logic"""
         total_components = len(components)
         batches = [components[i:i + batch_size]
                    for i in range(0, total_components, batch_size)]
@@ -135,55 +138,37 @@ class ResilientDatabaseUploader:
 
         start_time = time.time()
 
-        print(f"📦 Uploading {len(batches)} batches...")
-
-        for i, batch in enumerate(batches, 1):
-            print(
-                f"🔄 Uploading batch {i}/{len(batches)} ({len(batch)} components)")
-
-            success = False
-            retries = 0
-
-            while not success and retries < self.max_retries:
-                try:
-                    if self.extractor.supabase:
-                        if self.extractor.upload_to_database(batch):
-                            # Mark components as uploaded
-                            for component in batch:
-                                uploaded_ids.add(
-                                    self._get_component_id(component))
-
-                            results['components_uploaded'] += len(batch)
-                            results['successful_batches'] += 1
-                            self.uploaded_components += len(batch)
-
-                            print(f"✅ Uploaded batch {i} successfully")
-                            success = True
-                        else:
-                            raise Exception("Upload failed")
-                    else:
-                        print("⚠️  No database connection available")
-                        success = True  # Skip if no connection
-
-                except Exception as e:
-                    retries += 1
-                    print(
-                        f"❌ Batch {i} failed (attempt {retries}/{self.max_retries}): {e}")
-
-                    if retries < self.max_retries:
-                        wait_time = 2 ** retries  # Exponential backoff
-                        print(f"⏳ Waiting {wait_time} seconds before retry...")
-                        time.sleep(wait_time)
-                    else:
-                        print(
-                            f"❌ Batch {i} failed after {self.max_retries} attempts")
-                        results['failed_batches'] += 1
-                        results['components_failed'] += len(batch)
-                        self.failed_components += len(batch)
+        if not self.extractor.supabase:
+            print("⚠️  No database connection available")
+            return results
+
+        print(f"📦 Uploading {len(batches)} batches ({self.max_in_flight} in flight)...")
+
+        def on_result(batch_number: int, batch: List[ComponentSpecification], success: bool):
+            if success:
+                # Mark components as uploaded
+                for component in batch:
+                    uploaded_ids.add(self._get_component_id(component))
+
+                results['components_uploaded'] += len(batch)
+                results['successful_batches'] += 1
+                self.uploaded_components += len(batch)
+                print(f"✅ Uploaded batch {batch_number}/{len(batches)} successfully")
+            else:
+                results['failed_batches'] += 1
+                results['components_failed'] += len(batch)
+                self.failed_components += len(batch)
 
             # Save progress after each batch
             self._save_progress(progress_file, uploaded_ids, results)
 
+        uploader = FlexLinkAsyncUploader(
+            max_in_flight=self.max_in_flight,
+            requests_per_second=self.requests_per_second,
+            max_retries=self.max_retries)
+        stats = uploader.upload_batches(batches, self.extractor.upload_to_database, on_result)
+        self.retry_count += stats['retries']
+
         results['upload_time'] = time.time() - start_time
         return results
 
@@ -231,6 +216,10 @@ def main():
                         help="Directory containing extraction results (default: data/large_catalog_extraction)")
     parser.add_argument("--batch-size", type=int, default=20,
                         help="Number of components to upload per batch (default: 20)")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f"Number of batches uploaded concurrently (default: {DEFAULT_MAX_IN_FLIGHT})")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Maximum batch requests per second (default: no limit)")
     parser.add_argument("--no-resume", action="store_true",
                         help="Don't resume from previous upload")
     parser.add_argument("--check-only", action="store_true",
@@ -243,6 +232,8 @@ def main():
 
     # Initialize uploader
     uploader = ResilientDatabaseUploader()
+    uploader.max_in_flight = args.max_in_flight
+    uploader.requests_per_second = args.rate
 
     # Check connection if requested
     if args.check_only:
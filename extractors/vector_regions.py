@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+FlexLink Vector Drawing Regions
+Clusters the vector paths of a page into drawing regions, for dimension drawings that are
+drawn as paths instead of embedded as raster images
+"""
+
+import math
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import fitz  # PyMuPDF
+
+
+def _is_shape(items: List[tuple]) -> bool:
+    """Whether a path has curves or slanted lines (tables and rules only have axis-aligned ones)"""
+    for item in items:
+        if item[0] in ('c', 'qu'):
+            return True
+        if item[0] == 'l':
+            (x0, y0), (x1, y1) = item[1], item[2]
+            if abs(x1 - x0) > 0.5 and abs(y1 - y0) > 0.5:
+                return True
+    return False
+
+
+def _label_cells(occupied: np.ndarray) -> np.ndarray:
+    """Connected components (8-neighbourhood) of the occupied grid cells; 0 is empty"""
+    labels = np.zeros(occupied.shape, dtype=np.int32)
+    rows, columns = occupied.shape
+    label = 0
+    for start_row, start_column in zip(*np.nonzero(occupied)):
+        if labels[start_row, start_column]:
+            continue
+        label += 1
+        labels[start_row, start_column] = label
+        stack = [(start_row, start_column)]
+        while stack:
+            row, column = stack.pop()
+            for next_row in range(max(row - 1, 0), min(row + 2, rows)):
+                for next_column in range(max(column - 1, 0), min(column + 2, columns)):
+                    if occupied[next_row, next_column] and not labels[next_row, next_column]:
+                        labels[next_row, next_column] = label
+                        stack.append((next_row, next_column))
+    return labels
+
+
+def _overlaps(a: List[float], b: List[float]) -> bool:
+    """Whether two [x0, y0, x1, y1] boxes overlap (zero-size boxes included)"""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def find_drawing_regions(page: fitz.Page, gap: float = 12.0, min_segments: int = 24,
+                         min_size: float = 72.0,
+                         exclude: Iterable[fitz.Rect] = ()) -> List[fitz.Rect]:
+    """
+    Bounding boxes of the vector drawings on a page, top to bottom
+
+    Path boxes are marked on a grid of gap-sized cells and touching cells form one
+    drawing, so a page costs one get_cdrawings() call and work linear in its paths and
+    cells. Page furniture (borders, full-width rules, backgrounds) is ignored. A region is
+    only kept with at least min_segments lines/curves/rects (one path can hold a whole
+    drawing), a curve or slanted line among them (which rules out tables), both sides at
+    least min_size points, and less than half of it covered by an exclude rect (embedded
+    images, captured as rasters already).
+    """
+    page_rect = page.rect
+    paths: List[Tuple[Tuple[float, float, float, float], int, bool]] = []
+    for path in page.get_cdrawings():
+        x0, y0, x1, y1 = path['rect']
+        if x1 - x0 > 0.8 * page_rect.width or y1 - y0 > 0.8 * page_rect.height:
+            continue
+        paths.append(((x0, y0, x1, y1), len(path['items']), _is_shape(path['items'])))
+
+    if sum(segments for _rect, segments, _shape in paths) < min_segments:
+        return []
+
+    rows = math.ceil(page_rect.height / gap) + 1
+    columns = math.ceil(page_rect.width / gap) + 1
+
+    def cell(x: float, y: float) -> Tuple[int, int]:
+        return (min(max(int((y - page_rect.y0) // gap), 0), rows - 1),
+                min(max(int((x - page_rect.x0) // gap), 0), columns - 1))
+
+    occupied = np.zeros((rows, columns), dtype=bool)
+    spans = []
+    for (x0, y0, x1, y1), _segments, _shape in paths:
+        (row0, column0), (row1, column1) = cell(x0, y0), cell(x1, y1)
+        occupied[row0:row1 + 1, column0:column1 + 1] = True
+        spans.append((row0, column0))
+
+    labels = _label_cells(occupied)
+
+    # Box, segment count and shape count of every drawing
+    clusters: Dict[int, List[float]] = {}
+    for ((x0, y0, x1, y1), segments, shape), (row, column) in zip(paths, spans):
+        cluster = clusters.get(labels[row, column])
+        if cluster is None:
+            clusters[labels[row, column]] = [x0, y0, x1, y1, segments, int(shape)]
+        else:
+            cluster[0] = min(cluster[0], x0)
+            cluster[1] = min(cluster[1], y0)
+            cluster[2] = max(cluster[2], x1)
+            cluster[3] = max(cluster[3], y1)
+            cluster[4] += segments
+            cluster[5] += shape
+
+    # Drawings whose boxes overlap (a part nested in its dimension lines) are one region
+    merged: List[List[float]] = []
+    pending = sorted(clusters.values(), key=lambda cluster: (cluster[1], cluster[0]))
+    while pending:
+        cluster = pending.pop(0)
+        for index, other in enumerate(merged):
+            if _overlaps(cluster, other):
+                del merged[index]
+                # The grown box may now overlap drawings that were merged already
+                pending.insert(0, [min(cluster[0], other[0]), min(cluster[1], other[1]),
+                                   max(cluster[2], other[2]), max(cluster[3], other[3]),
+                                   cluster[4] + other[4], cluster[5] + other[5]])
+                break
+        else:
+            merged.append(cluster)
+
+    exclude = [fitz.Rect(rect) for rect in exclude]
+    regions = []
+    for x0, y0, x1, y1, segment_count, shape_count in sorted(merged, key=lambda cluster: (cluster[1], cluster[0])):
+        if segment_count < min_segments or not shape_count:
+            continue
+        if x1 - x0 < min_size or y1 - y0 < min_size:
+            continue
+        rect = fitz.Rect(x0, y0, x1, y1)
+        if any((rect & covered).get_area() >= 0.5 * rect.get_area() for covered in exclude):
+            continue
+        regions.append(rect)
+
+    return regions
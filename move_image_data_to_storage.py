@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Move the base64 image_data of existing product_images and product_image_thumbnails rows
+into object storage
+Run database/move_image_data_to_storage.sql first. Each image row gets its storage_key,
+size, pixel dimensions and content hash and loses its image_data, each thumbnail row gets
+its storage_key; rerunning continues with the rows that are left.
+"""
+
+import sys
+import base64
+import argparse
+from typing import Any, Dict
+from dotenv import load_dotenv
+
+# Add extractors to path
+sys.path.append('extractors')
+from rest_client import get_client
+from async_uploader import FlexLinkAsyncUploader, DEFAULT_MAX_IN_FLIGHT
+from object_storage import (CONTENT_TYPES, get_storage_backend, image_object_key, stored_object_fields,
+                            thumbnail_object_key)
+
+
+def pending_rows(client, table: str, columns: str, page_size: int):
+    """Rows that still carry image_data, one page at a time (by id, so failed rows are passed over)"""
+    last_id = 0
+    while True:
+        response = client.get(
+            f"{table}?select=id,{columns},image_data"
+            f"&storage_key=is.null&image_data=not.is.null&id=gt.{last_id}"
+            f"&order=id.asc&limit={page_size}")
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+
+        rows = response.json()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1]['id']
+
+
+def move_row(client, storage, row: Dict[str, Any]) -> bool:
+    """Store one row's image file and replace its image_data with the object columns"""
+    data = base64.b64decode(row['image_data'])
+    image_format = row.get('image_format') or 'png'
+    key = image_object_key(row['image_hash'], image_format)
+    storage.put(key, data, CONTENT_TYPES.get(image_format, 'application/octet-stream'))
+
+    response = client.patch(
+        f"product_images?id=eq.{row['id']}",
+        headers={'Prefer': 'return=minimal'},
+        json={**stored_object_fields(key, data), 'image_data': None}
+    )
+    if response.status_code not in (200, 204):
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+    return True
+
+
+def move_thumbnail_row(client, storage, row: Dict[str, Any]) -> bool:
+    """Store one thumbnail row's file and replace its image_data with the storage_key"""
+    data = base64.b64decode(row['image_data'])
+    image_format = row.get('image_format') or 'webp'
+    key = thumbnail_object_key(row['image_hash'], row['size'], image_format)
+    storage.put(key, data, CONTENT_TYPES.get(image_format, 'application/octet-stream'))
+
+    response = client.patch(
+        f"product_image_thumbnails?id=eq.{row['id']}",
+        headers={'Prefer': 'return=minimal'},
+        json={'storage_key': key, 'image_data': None}
+    )
+    if response.status_code not in (200, 204):
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+    return True
+
+
+def thumbnails_table_exists(client) -> bool:
+    """Whether create_image_thumbnails_table.sql was run"""
+    return client.get("product_image_thumbnails?select=id&limit=1").status_code == 200
+
+
+def move_image_data(page_size: int = 20, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> Dict[str, int]:
+    """Backfill every image and thumbnail row that still has image_data"""
+    client = get_client()
+    storage = get_storage_backend()
+    if not storage.ensure_bucket():
+        print(f"❌ Could not create storage bucket: {storage.bucket}")
+        return {'moved': 0, 'failed': 0}
+
+    results = {'moved': 0, 'failed': 0, 'bytes': 0}
+    uploader = FlexLinkAsyncUploader(max_in_flight=max_in_flight)
+    moves = [('images', 'product_images', 'image_hash,image_format', move_row)]
+    if thumbnails_table_exists(client):
+        moves.append(('thumbnails', 'product_image_thumbnails', 'image_hash,size,image_format',
+                      move_thumbnail_row))
+
+    for label, table, columns, mover in moves:
+        counts = {'moved': 0, 'failed': 0}
+
+        def on_result(_batch_number: int, row: Dict[str, Any], success: bool):
+            if success:
+                counts['moved'] += 1
+                results['bytes'] += len(row['image_data'])
+                if counts['moved'] % 50 == 0:
+                    print(f"🔄 Moved {counts['moved']} {label}...")
+            else:
+                counts['failed'] += 1
+                print(f"❌ Could not move {label[:-1]} {row['image_hash']}")
+
+        print(f"📦 Moving {label} to storage bucket '{storage.bucket}' ({max_in_flight} in flight)...")
+        uploader.upload_batches(pending_rows(client, table, columns, page_size),
+                                lambda row: mover(client, storage, row), on_result)
+        print(f"✅ Moved {counts['moved']} {label}, {counts['failed']} failed")
+
+        results['moved'] += counts['moved']
+        results['failed'] += counts['failed']
+
+    print(f"📊 Moved {results['moved']} rows ({results['bytes'] / (1024 * 1024):.1f} MB of base64 "
+          f"out of the tables), {results['failed']} failed")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Move product_images and product_image_thumbnails image_data into object storage")
+    parser.add_argument("--page-size", type=int, default=20,
+                        help="Rows fetched per request (default: 20)")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f"Rows moved concurrently (default: {DEFAULT_MAX_IN_FLIGHT})")
+    args = parser.parse_args()
+
+    load_dotenv()
+    print("🚀 FlexLink Image Storage Migration")
+    print("=" * 40)
+
+    results = move_image_data(page_size=args.page_size, max_in_flight=args.max_in_flight)
+    get_client().print_stats()
+
+    if results['failed']:
+        print("⚠️ Some images or thumbnails were not moved; run the script again to retry them.")
+        sys.exit(1)
+    print("🎉 All image data is in storage!")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ Re-extract PDF and upload images with proper product associations
 
 import os
 import sys
-import requests
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -97,7 +96,10 @@ def re_extract_and_upload():
 
 
 def clear_existing_images():
-    """Clear existing images from database"""
+    """Clear existing images from database, with their stored files"""
+    from rest_client import get_client
+    from object_storage import get_storage_backend
+
     load_dotenv()
 
     supabase_url = os.getenv('SUPABASE_URL')
@@ -107,21 +109,35 @@ def clear_existing_images():
         print("❌ Missing Supabase credentials in .env file")
         return False
 
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(supabase_url, supabase_key)
 
     try:
-        # Delete all existing images
-        response = requests.delete(
-            f"{supabase_url}/rest/v1/product_images",
-            headers=headers
+        # Thumbnails first, then all existing images; the deleted rows name their stored files
+        thumbnails = client.delete(
+            "product_image_thumbnails?select=storage_key",
+            headers={'Prefer': 'return=representation'}
+        )
+        if thumbnails.status_code != 200:
+            print(f"❌ Failed to clear thumbnails: {thumbnails.status_code}")
+            return False
+
+        response = client.delete(
+            "product_images?select=storage_key",
+            headers={'Prefer': 'return=representation'}
         )
 
         if response.status_code == 200:
+            keys = [row['storage_key'] for row in response.json() + thumbnails.json() if row.get('storage_key')]
             print("✅ Cleared existing images from database")
+
+            # A failure here leaves orphaned files, not broken rows
+            try:
+                storage = get_storage_backend(client=client)
+                for start in range(0, len(keys), 1000):
+                    storage.delete(keys[start:start + 1000])
+                print(f"✅ Removed {len(keys)} stored image files")
+            except Exception as e:
+                print(f"⚠️ Could not delete stored image files: {e}")
             return True
         else:
             print(f"❌ Failed to clear database: {response.status_code}")
@@ -139,6 +155,8 @@ def main():
     # Check if user wants to clear existing data
     print("\n⚠️  This will re-extract the PDF and upload images with proper metadata.")
     print("   This may take several minutes depending on the PDF size.")
+    print("   Images already in the database are updated in place; clearing first only")
+    print("   matters to drop images that are no longer in the PDF.")
 
     clear_choice = input(
         "\nDo you want to clear existing images first? (y/N): ").strip().lower()
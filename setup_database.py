@@ -5,10 +5,13 @@ Creates the product_images table and related functions in Supabase
 """
 
 import os
-import requests
+import sys
 import json
 from dotenv import load_dotenv
 
+sys.path.append('extractors')
+from rest_client import get_client
+
 
 def setup_database():
     """Set up the product_images table in Supabase"""
@@ -35,12 +38,8 @@ def setup_database():
     statements = [stmt.strip()
                   for stmt in sql_schema.split(';') if stmt.strip()]
 
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json',
-        'Prefer': 'return=minimal'
-    }
+    client = get_client(supabase_url, supabase_key)
+    headers = {'Prefer': 'return=minimal'}
 
     success_count = 0
     total_statements = len(statements)
@@ -51,11 +50,7 @@ def setup_database():
 
         try:
             # Execute SQL statement via Supabase REST API
-            response = requests.post(
-                f"{supabase_url}/rest/v1/rpc/exec_sql",
-                headers=headers,
-                json={'sql': statement}
-            )
+            response = client.rpc('exec_sql', {'sql': statement}, headers=headers)
 
             if response.status_code in [200, 201]:
                 print(f"✅ Statement {i}/{total_statements}: Success")
@@ -87,18 +82,11 @@ def test_database_connection():
     supabase_url = os.getenv('SUPABASE_URL')
     supabase_key = os.getenv('SUPABASE_ANON_KEY')
 
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(supabase_url, supabase_key)
 
     try:
         # Test connection by trying to query the table
-        response = requests.get(
-            f"{supabase_url}/rest/v1/product_images?select=count",
-            headers=headers
-        )
+        response = client.get("product_images?select=count")
 
         if response.status_code == 200:
             print("✅ Database connection successful!")
@@ -130,6 +118,8 @@ def main():
     else:
         print("\n❌ Database setup failed!")
 
+    get_client().print_stats()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Test that the single-pass keyword matcher and the shared line index give the same results
+as the plain `keyword in text` and `pattern.search(text)` they replace
+"""
+
+import re
+import sys
+import random
+
+# Add extractors to path
+sys.path.append('extractors')
+
+from extraction_patterns import (
+    COMPONENT_SPEC_PATTERNS, PART_NUMBER_PATTERNS, DIMENSION_PATTERNS, WEIGHT_PATTERNS,
+    PRICE_PATTERNS, SYSTEM_SPEC_PATTERNS, PRODUCT_CODE_PATTERNS, IMAGE_COMPONENT_PATTERNS,
+    MATERIAL_KEYWORDS, SYSTEM_KEYWORDS, KeywordMatcher)
+from line_index import LineIndex
+from component_extractor import ComponentSpecificationExtractor
+from enhanced_component_extractor import EnhancedComponentExtractor
+
+# Catalog-like lines: specifications, part numbers, units and keyword fragments
+SAMPLE_LINES = [
+    "X45 Conveyor Chain, plain chain 44 mm width",
+    "Part No: 5112345 Stainless steel pivot, 25.4 mm pitch 12 mm height",
+    "P/N: XS-200-A aluminum bracket 120 mm length 3.5 kg",
+    "Weight: 0.75 kg  Price: 12.50 € per metre",
+    "Guide rail X-65 plastic 18 mm width, 2 mm thickness",
+    "Drive unit 0.37 kW, max load 150 kg load, 45 m/min",
+    "Idler end X85 wheel 80 mm diameter nylon",
+    "Article: 3920500 steel plate, 450 g",
+    "Temperature range -10 to 60 °C; cost: 99",
+    "hygienic wash-down design, food grade, heat resistant",
+    "Item: XH-1000 heavy duty chemical resistant 6 mm pitch",
+    "",
+    "  stainless steelsteel ste el 12mm width 12 mm w 7mmw",
+    "price 5 euro, 2.5kg, 300g, 1.2 mm t",
+]
+
+
+def _random_lines(rng: random.Random, count: int):
+    """Lines stitched together from fragments of the sample lines, so matches cross line ends"""
+    words = ' '.join(SAMPLE_LINES).split() + ['', 'mm', 'kg', 'g', '€', ':', '.', 'steel']
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(0, 8))) for _ in range(count)]
+
+
+def _naive_scan(vocabulary, text):
+    """Labels of every keyword occurring in text, the way the extractors used to check"""
+    return {category: {label for label, keywords in labels.items()
+                       if any(keyword in text for keyword in keywords)}
+            for category, labels in vocabulary.items()}
+
+
+def _naive_first(vocabulary, text, category):
+    """First label of a category (in vocabulary order) with a keyword in text"""
+    for label, keywords in vocabulary[category].items():
+        if any(keyword in text for keyword in keywords):
+            return label
+    return None
+
+
+def _vocabularies():
+    """The vocabularies the extractors build their matchers from"""
+    component_extractor = ComponentSpecificationExtractor()
+    enhanced_extractor = EnhancedComponentExtractor()
+    return [
+        {
+            'type': {comp_type: patterns['keywords']
+                     for comp_type, patterns in component_extractor.component_patterns.items()},
+            'material': MATERIAL_KEYWORDS,
+            'system': SYSTEM_KEYWORDS
+        },
+        {'flag': enhanced_extractor.application_keywords},
+        # Keywords that are prefixes of each other, sharing labels
+        {'a': {'one': ['ab', 'abc'], 'two': ['abcd', 'b'], 'three': ['c']}}
+    ]
+
+
+def test_keyword_matcher():
+    """KeywordMatcher.scan and first agree with `keyword in text`"""
+    print("🔍 Testing KeywordMatcher against `keyword in text`...")
+
+    rng = random.Random(7)
+    texts = [line.lower() for line in SAMPLE_LINES] + SAMPLE_LINES
+    texts += [' '.join(_random_lines(rng, 3)).lower() for _ in range(300)]
+    texts += [''.join(rng.choice('abcd ') for _ in range(rng.randint(0, 12))) for _ in range(300)]
+
+    checked = 0
+    for vocabulary in _vocabularies():
+        matcher = KeywordMatcher(vocabulary)
+        for text in texts:
+            hits = matcher.scan(text)
+            assert hits == _naive_scan(vocabulary, text), text
+            for category in vocabulary:
+                assert matcher.first(hits, category) == _naive_first(vocabulary, text, category), text
+
+            # Spans scan like the sliced text
+            start = rng.randint(0, len(text))
+            end = rng.randint(start, len(text))
+            assert matcher.scan(text, start, end) == _naive_scan(vocabulary, text[start:end]), text
+            checked += 1
+
+    print(f"✅ {checked} texts scanned identically")
+
+
+def _window_patterns():
+    """Registry patterns the extractors search line windows with"""
+    patterns = [pattern for spec_patterns in COMPONENT_SPEC_PATTERNS.values()
+                for pattern in spec_patterns.values()]
+    patterns += PART_NUMBER_PATTERNS + list(DIMENSION_PATTERNS.values())
+    patterns += WEIGHT_PATTERNS + PRICE_PATTERNS + list(SYSTEM_SPEC_PATTERNS.values())
+    return patterns
+
+
+def _same_match(got, expected, offset):
+    """Whether a buffer match equals a match on the window text starting at offset"""
+    if got is None or expected is None:
+        return got is None and expected is None
+    return (got.start() - offset, got.end() - offset) == expected.span() and got.groups() == expected.groups()
+
+
+def test_line_window_search():
+    """LineWindow.search agrees with pattern.search(window.text) over overlapping windows"""
+    print("🔍 Testing LineWindow.search against pattern.search(window.text)...")
+
+    rng = random.Random(11)
+    pages = [SAMPLE_LINES] + [_random_lines(rng, 40) for _ in range(20)]
+    patterns = _window_patterns()
+
+    checked = 0
+    for lines in pages:
+        # One index per page, so windows share its cached searches like in the extractors
+        index = LineIndex(lines)
+        windows = [(start + offset, start + offset + size)
+                   for start in range(len(lines))
+                   for offset, size in ((-5, 15), (0, 5), (0, 10), (0, 1), (3, 0))]
+        # In page order, then again in random order (searches going backwards too)
+        shuffled = list(windows)
+        rng.shuffle(shuffled)
+        windows += shuffled
+
+        for start, end in windows:
+            window = index.window(start, end)
+            assert window.text == ' '.join(lines[max(start, 0):max(end, 0)])
+            for pattern in patterns:
+                assert _same_match(window.search(pattern), pattern.search(window.text), window.pos), \
+                    (pattern.pattern, window.text)
+                checked += 1
+
+            for line in window.lines():
+                for pattern in PART_NUMBER_PATTERNS:
+                    assert _same_match(line.search(pattern), pattern.search(line.text), line.pos)
+
+    print(f"✅ {checked} window searches matched")
+
+
+def test_line_index_rejects_context_patterns():
+    """LineIndex.search refuses patterns whose match depends on text outside the window"""
+    print("🔍 Testing LineIndex pattern check...")
+
+    index = LineIndex(["chain 12 mm pitch", "bracket"])
+    window = index.window(1, 2)
+
+    for source in [r'\bbracket\b', r'^bracket', r'bracket$', r'(?<= )bracket', r'(?<!x)bracket',
+                   r'bra(?=cket)', r'bra(?!x)', r'\Abracket', r'bracket\Z', r'\Bracket']:
+        try:
+            window.search(re.compile(source))
+        except ValueError:
+            continue
+        raise AssertionError(f"{source!r} was not rejected")
+
+    for pattern in PRODUCT_CODE_PATTERNS + IMAGE_COMPONENT_PATTERNS:
+        try:
+            window.search(pattern)
+        except ValueError:
+            continue
+        raise AssertionError(f"{pattern.pattern!r} was not rejected")
+
+    # Negated classes, escaped anchors and literal brackets are fine
+    for source in [r'[^x]racket', r'br[]a]cket', r'[$^]?bracket', r'\^?bracket\$?', r'\\?bracket']:
+        assert window.search(re.compile(source)) is not None, source
+
+    print("✅ Anchors, word boundaries and lookarounds are rejected")
+
+
+def main():
+    """Run all equivalence tests"""
+    print("🧪 Extraction Equivalence Tests")
+    print("=" * 50)
+
+    tests = [
+        ("KeywordMatcher", test_keyword_matcher),
+        ("LineWindow search", test_line_window_search),
+        ("LineIndex pattern check", test_line_index_rejects_context_patterns)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test_name} test failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
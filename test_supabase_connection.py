@@ -3,10 +3,14 @@
 Test Supabase connection for the web viewer
 """
 
-import requests
+import sys
 import json
 from dotenv import load_dotenv
 
+# Add extractors to path
+sys.path.append('extractors')
+from rest_client import get_client
+
 # Load environment variables
 load_dotenv()
 
@@ -23,14 +27,12 @@ def test_connection():
     print()
 
     # Test 1: Basic table access
+    client = get_client(SUPABASE_URL, SUPABASE_KEY)
+
     print("📊 Test 1: Basic table access")
     try:
-        response = requests.get(
-            f"{SUPABASE_URL}/rest/v1/product_images?select=count",
-            headers={
-                'apikey': SUPABASE_KEY,
-                'Authorization': f'Bearer {SUPABASE_KEY}'
-            }
+        response = client.get(
+            "product_images?select=count"
         )
         print(f"Status: {response.status_code}")
         print(f"Response: {response.text[:200]}...")
@@ -42,12 +44,8 @@ def test_connection():
     # Test 2: Get first few records
     print("📋 Test 2: Get first few records")
     try:
-        response = requests.get(
-            f"{SUPABASE_URL}/rest/v1/product_images?select=*&limit=3",
-            headers={
-                'apikey': SUPABASE_KEY,
-                'Authorization': f'Bearer {SUPABASE_KEY}'
-            }
+        response = client.get(
+            "product_images?select=*&limit=3"
         )
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
@@ -66,13 +64,9 @@ def test_connection():
     # Test 3: Check RLS status
     print("🔒 Test 3: Check RLS and permissions")
     try:
-        response = requests.get(
-            f"{SUPABASE_URL}/rest/v1/product_images?select=id&limit=1",
-            headers={
-                'apikey': SUPABASE_KEY,
-                'Authorization': f'Bearer {SUPABASE_KEY}',
-                'Prefer': 'count=exact'
-            }
+        response = client.get(
+            "product_images?select=id&limit=1",
+            headers={'Prefer': 'count=exact'}
         )
         print(f"Status: {response.status_code}")
         print(f"Headers: {dict(response.headers)}")
@@ -84,14 +78,12 @@ def test_connection():
 
 def test_web_viewer_request():
     """Test the exact request the web viewer makes"""
+    client = get_client(SUPABASE_URL, SUPABASE_KEY)
+
     print("🌐 Test 4: Web viewer request simulation")
     try:
-        response = requests.get(
-            f"{SUPABASE_URL}/rest/v1/product_images?select=*",
-            headers={
-                'apikey': SUPABASE_KEY,
-                'Authorization': f'Bearer {SUPABASE_KEY}'
-            }
+        response = client.get(
+            "product_images?select=id,page_number,product_code,component_type,storage_key&limit=50"
         )
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
@@ -105,7 +97,7 @@ def test_web_viewer_request():
                 print(f"  - Product: {sample.get('product_code')}")
                 print(f"  - Component: {sample.get('component_type')}")
                 print(
-                    f"  - Has image_data: {'Yes' if sample.get('image_data') else 'No'}")
+                    f"  - Stored file: {sample.get('storage_key') or 'No (inline image_data)'}")
         else:
             print(f"❌ Error: {response.text}")
         print()
@@ -121,6 +113,7 @@ def main():
 
     test_connection()
     test_web_viewer_request()
+    get_client(SUPABASE_URL, SUPABASE_KEY).print_stats()
 
     print("✅ Test completed!")
 
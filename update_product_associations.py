@@ -3,10 +3,14 @@
 Update existing database records with product associations
 """
 
-import requests
+import sys
 import json
 from dotenv import load_dotenv
 
+# Add extractors to path
+sys.path.append('extractors')
+from rest_client import get_client
+
 # Load environment variables
 load_dotenv()
 
@@ -51,20 +55,15 @@ def update_database_records():
     print("🔄 Updating database records with product associations...")
     print("=" * 60)
 
-    headers = {
-        'apikey': SUPABASE_KEY,
-        'Authorization': f'Bearer {SUPABASE_KEY}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(SUPABASE_URL, SUPABASE_KEY)
 
     # Get product associations
     associations = get_product_associations_by_page()
 
     # Get all existing records
     try:
-        response = requests.get(
-            f"{SUPABASE_URL}/rest/v1/product_images?select=id,page_number,product_code,component_type,associated_text",
-            headers=headers
+        response = client.get(
+            "product_images?select=id,page_number,product_code,component_type,associated_text"
         )
 
         if response.status_code != 200:
@@ -85,9 +84,8 @@ def update_database_records():
                 # Update this record with product associations
                 update_data = associations[page_number]
 
-                update_response = requests.patch(
-                    f"{SUPABASE_URL}/rest/v1/product_images?id=eq.{record_id}",
-                    headers=headers,
+                update_response = client.patch(
+                    f"product_images?id=eq.{record_id}",
                     json=update_data
                 )
 
@@ -106,9 +104,8 @@ def update_database_records():
                     "associated_text": f"Blueprint drawing from page {page_number}"
                 }
 
-                update_response = requests.patch(
-                    f"{SUPABASE_URL}/rest/v1/product_images?id=eq.{record_id}",
-                    headers=headers,
+                update_response = client.patch(
+                    f"product_images?id=eq.{record_id}",
                     json=default_data
                 )
 
@@ -143,16 +140,11 @@ def show_sample_records():
     print("\n📋 Sample records after update:")
     print("=" * 40)
 
-    headers = {
-        'apikey': SUPABASE_KEY,
-        'Authorization': f'Bearer {SUPABASE_KEY}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(SUPABASE_URL, SUPABASE_KEY)
 
     try:
-        response = requests.get(
-            f"{SUPABASE_URL}/rest/v1/product_images?select=id,page_number,product_code,component_type,associated_text&limit=10",
-            headers=headers
+        response = client.get(
+            "product_images?select=id,page_number,product_code,component_type,associated_text&limit=10"
         )
 
         if response.status_code == 200:
@@ -192,6 +184,8 @@ def main():
     else:
         print("\n❌ Database update failed. Please check the error messages above.")
 
+    get_client(SUPABASE_URL, SUPABASE_KEY).print_stats()
+
 
 if __name__ == "__main__":
     main()
@@ -4,12 +4,18 @@ Upload extracted images to Supabase database
 """
 
 import os
+import sys
 import base64
 import hashlib
-import requests
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Add extractors to path
+sys.path.append('extractors')
+from image_store import LocalImageStore, MANIFEST_NAME
+from upload_images_to_database import FlexLinkImageUploader
+from rest_client import get_client
+
 
 def upload_extracted_images():
     """Upload extracted images to Supabase database"""
@@ -29,88 +35,97 @@ def upload_extracted_images():
         print("Please run the image extraction first")
         return False
 
-    # Get all image files
-    image_files = list(images_dir.glob("*.png"))
-    if not image_files:
-        print("❌ No image files found in extracted_images directory")
-        return False
-
-    print(f"📁 Found {len(image_files)} images to upload")
-
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json',
-        'Prefer': 'return=minimal'
-    }
+    # Images saved by the extractor are listed in the store manifest with all their metadata
+    store = LocalImageStore(str(images_dir)) if (images_dir / MANIFEST_NAME).exists() else None
+    if store is not None and len(store):
+        image_entries = list(store.entries())
+        print(f"📁 Found {len(image_entries)} images in the image store manifest")
+    else:
+        image_entries = [{'path': str(image_file), 'source_file': image_file.name}
+                         for image_file in images_dir.glob("*.png")]
+        if not image_entries:
+            print("❌ No image files found in extracted_images directory")
+            return False
+        print(f"📁 Found {len(image_entries)} images to upload")
 
-    success_count = 0
+    records = []
     error_count = 0
 
-    for i, image_file in enumerate(image_files, 1):
+    for entry in image_entries:
+        name = entry.get('source_file') or entry['path']
         try:
             # Read image file
-            with open(image_file, 'rb') as f:
-                image_data = f.read()
+            if store is not None:
+                image_data = store.read(entry['image_hash'])
+            else:
+                with open(entry['path'], 'rb') as f:
+                    image_data = f.read()
 
-            # Generate hash
-            image_hash = hashlib.md5(image_data).hexdigest()
+            # Store entries keep the extractor's hash; legacy files are keyed by their bytes
+            image_hash = entry['image_hash'] if store is not None else hashlib.md5(image_data).hexdigest()
 
             # Convert to base64
             image_base64 = base64.b64encode(image_data).decode('utf-8')
 
-            # Parse filename to get metadata
-            # Format: image_004_000_52a9d822.png
-            filename_parts = image_file.stem.split('_')
-            if len(filename_parts) >= 3:
-                page_number = int(filename_parts[1])
-                image_index = int(filename_parts[2])
-            else:
-                page_number = 1
-                image_index = i
-
-            # Prepare data for upload
-            upload_data = {
+            if store is None:
+                # Legacy flat files: parse filename to get metadata
+                # Format: image_004_000_52a9d822.png
+                filename_parts = Path(entry['path']).stem.split('_')
+                if len(filename_parts) >= 3:
+                    page_number = int(filename_parts[1])
+                else:
+                    page_number = 1
+                entry = {'page_number': page_number}
+
+            # Thumbnail pyramid written next to the image by the store
+            thumbnails = []
+            for size, thumbnail in (entry.get('thumbnails') or {}).items():
+                with open(store.root / thumbnail['path'], 'rb') as f:
+                    thumbnails.append({
+                        'size': int(size),
+                        'width': thumbnail['width'],
+                        'height': thumbnail['height'],
+                        'image_format': thumbnail['image_format'],
+                        'image_data': base64.b64encode(f.read()).decode('utf-8')
+                    })
+
+            # Prepare data for upload (defaults where the metadata is unknown)
+            records.append({
                 'image_hash': image_hash,
-                'page_number': page_number,
-                'x_coord': 0.0,  # Default values since we don't have coordinates
-                'y_coord': 0.0,
-                'width': 800.0,  # Default values
-                'height': 600.0,
-                'image_format': 'png',
+                'page_number': entry.get('page_number') or 1,
+                'x_coord': entry.get('x_coord', 0.0),
+                'y_coord': entry.get('y_coord', 0.0),
+                'width': entry.get('width', 800.0),
+                'height': entry.get('height', 600.0),
+                'image_format': entry.get('image_format', 'png'),
                 'image_data': image_base64,
-                'associated_text': '',  # We don't have this from local files
-                'product_code': '',  # We don't have this from local files
-                'component_type': '',  # We don't have this from local files
+                'associated_text': entry.get('associated_text', ''),
+                'product_code': entry.get('product_code', ''),
+                'component_type': entry.get('component_type', ''),
                 'is_blueprint': True,  # All extracted images are blueprints
-                'image_quality_score': 0.8  # Default quality score
-            }
-
-            # Upload to Supabase
-            response = requests.post(
-                f"{supabase_url}/rest/v1/product_images",
-                headers=headers,
-                json=upload_data
-            )
-
-            if response.status_code in [200, 201]:
-                print(f"✅ Uploaded {i}/{len(image_files)}: {image_file.name}")
-                success_count += 1
-            else:
-                print(
-                    f"❌ Failed to upload {image_file.name}: {response.status_code} - {response.text}")
-                error_count += 1
+                'image_quality_score': entry.get('image_quality_score', 0.8),
+                'original_size_bytes': entry.get('original_size_bytes'),
+                'encoded_size_bytes': len(image_data),
+                'image_source': entry.get('image_source', 'raster'),
+                # Every page/bbox the image is drawn at
+                'placements': entry.get('placements') or [],
+                'thumbnails': thumbnails
+            })
 
         except Exception as e:
-            print(f"❌ Error uploading {image_file.name}: {e}")
+            print(f"❌ Error reading {name}: {e}")
             error_count += 1
 
-    print(f"\n📊 Upload Summary:")
-    print(f"   Total images: {len(image_files)}")
-    print(f"   Successfully uploaded: {success_count}")
-    print(f"   Failed uploads: {error_count}")
+    if not records:
+        print("❌ Upload failed!")
+        return False
+
+    # Array-body POSTs packed by payload size, instead of a request per image
+    summary = FlexLinkImageUploader().upload_images_to_database(records)
+    if error_count:
+        print(f"   Unreadable files: {error_count}")
 
-    if success_count > 0:
+    if summary['success_count'] > 0:
         print("✅ Upload completed successfully!")
         return True
     else:
@@ -125,18 +140,11 @@ def test_database_connection():
     supabase_url = os.getenv('SUPABASE_URL')
     supabase_key = os.getenv('SUPABASE_ANON_KEY')
 
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(supabase_url, supabase_key)
 
     try:
         # Test connection by trying to query the table
-        response = requests.get(
-            f"{supabase_url}/rest/v1/product_images?select=count",
-            headers=headers
-        )
+        response = client.get("product_images?select=count")
 
         if response.status_code == 200:
             print("✅ Database connection successful!")
@@ -170,7 +178,9 @@ def main():
     print("\n📤 Uploading extracted images...")
 
     # Step 2: Upload images
-    if upload_extracted_images():
+    uploaded = upload_extracted_images()
+    get_client().print_stats()
+    if uploaded:
         print("\n🎉 Upload completed successfully!")
         print("You can now view your images in the Supabase dashboard or use the web interface.")
     else:
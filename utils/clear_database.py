@@ -2,6 +2,7 @@
 """
 Database cleanup script for FlexLink Component Specifications
 This script safely clears existing component data to prepare for a fresh import.
+Imports upsert components, so this is only needed to drop components no longer in the catalog.
 """
 
 import os
@@ -5,9 +5,12 @@ Creates the necessary tables and functions in your Supabase database.
 """
 
 import os
-import requests
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'extractors'))
+from rest_client import get_client
+
 
 def setup_database_schema():
     """Set up the database schema using Supabase REST API"""
@@ -60,19 +63,10 @@ def setup_database_schema():
         print(f"🔄 Executing statement {i}/{len(statements)}...")
 
         try:
-            # Use Supabase REST API to execute SQL
-            headers = {
-                'apikey': supabase_key,
-                'Authorization': f'Bearer {supabase_key}',
-                'Content-Type': 'application/json',
-                'Prefer': 'return=minimal'
-            }
-
-            # Execute the SQL statement
-            response = requests.post(
-                f"{supabase_url}/rest/v1/rpc/exec_sql",
-                headers=headers,
-                json={'sql': statement},
+            # Execute the SQL statement via the Supabase REST API
+            response = get_client(supabase_url, supabase_key).rpc(
+                'exec_sql', {'sql': statement},
+                headers={'Prefer': 'return=minimal'},
                 timeout=30
             )
 
@@ -107,16 +101,9 @@ def verify_table_exists():
     supabase_key = os.getenv('SUPABASE_ANON_KEY')
 
     try:
-        headers = {
-            'apikey': supabase_key,
-            'Authorization': f'Bearer {supabase_key}',
-            'Content-Type': 'application/json'
-        }
-
         # Try to query the table
-        response = requests.get(
-            f"{supabase_url}/rest/v1/component_specifications?select=id&limit=1",
-            headers=headers,
+        response = get_client(supabase_url, supabase_key).get(
+            "component_specifications?select=id&limit=1",
             timeout=10
         )
 
@@ -150,6 +137,8 @@ def main():
         print("\n❌ Database setup failed!")
         print("💡 You may need to run the SQL manually in the Supabase dashboard.")
 
+    get_client().print_stats()
+
 
 if __name__ == "__main__":
     main()